@@ -3,20 +3,24 @@ from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager
 from flask_cors import CORS
 import os
+from app.sharding import ShardedSession
 
-db = SQLAlchemy()
+# 샤딩을 켜면 로그인한 요청의 쿼리가 사용자 샤드로 가도록 세션 바인딩을 고른다
+db = SQLAlchemy(session_options={'class_': ShardedSession})
 login_manager = LoginManager()
 
-def create_app():
+# React 프론트엔드 (ASGI 경로에서도 같은 목록으로 CORS 헤더를 붙임)
+CORS_ORIGINS = ['http://localhost:3000']
+
+def create_app(test_config=None):
     app = Flask(__name__)
     
-    # Configuration
-    app.config['SECRET_KEY'] = 'your-secret-key-here'
-    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///todolist.db'
-    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    # Configuration (환경변수 기반, test_config로 덮어쓸 수 있음)
+    from app.config import build_config, register_sqlite_pragmas
+    app.config.from_mapping(build_config(test_config))
     
     # Enable CORS for React frontend
-    CORS(app, origins=['http://localhost:3000'], supports_credentials=True)
+    CORS(app, origins=CORS_ORIGINS, supports_credentials=True)
     
     # Initialize extensions
     db.init_app(app)
@@ -25,7 +29,7 @@ def create_app():
     login_manager.login_message = '로그인이 필요합니다.'
     
     # Import models
-    from app.models import User, Task
+    from app.models import User, Task, DailyCompletion, DeletedTask
     
     # Register blueprints
     from app.api import api
@@ -33,11 +37,55 @@ def create_app():
     app.register_blueprint(api, url_prefix='/api')
     
     with app.app_context():
-        db.create_all()
+        # WAL, busy timeout 등 SQLite 연결 설정은 첫 연결 전에 등록해야 함
+        register_sqlite_pragmas(db.engine, app.config)
+        # 새 데이터베이스는 테이블을 만들고, 기존 데이터베이스도 인덱스 등 최신 스키마로 업그레이드
+        # (여러 워커가 동시에 시작해도 스키마 잠금을 잡은 한 곳에서만 실행됨)
+        from app.migrations import upgrade
+        upgrade(db.engine, db.metadata)
+        # 사용자별 샤드 DB (SHARD_DATABASE_URLS가 없으면 기본 DB만 사용)
+        from app.sharding import configure_shards
+        configure_shards(app, db)
+    
+    from app.user_cache import configure_user_cache
+    configure_user_cache(app)
+    
+    from app.events import configure_event_bus
+    configure_event_bus(app)
+    
+    from app.passwords import configure_password_hasher
+    from app.ratelimit import configure_login_limiters
+    configure_password_hasher(app)
+    configure_login_limiters(app)
+    
+    from app.metrics import init_metrics, instrument_engine
+    from app.sharding import shard_router
+    init_metrics(app)
+    with app.app_context():
+        for engine in [db.engine] + shard_router.engines:
+            instrument_engine(engine)
+    
+    # after_request는 등록 역순으로 실행되므로 계측보다 나중에 등록해 압축된 크기가 기록되게 함
+    from app.compression import init_compression
+    from app.response_cache import configure_response_cache
+    from app.singleflight import configure_single_flight
+    init_compression(app)
+    configure_response_cache(app)
+    configure_single_flight(app)
+    
+    from app.commands import register_commands
+    register_commands(app)
     
     return app
 
 @login_manager.user_loader
 def load_user(user_id):
-    from app.models import User
-    return User.query.get(int(user_id))
+    from app.sharding import bind_user_shard, copy_user_to_shard, shard_router
+    from app.user_cache import user_cache
+    user_id = int(user_id)
+    bind_user_shard(user_id)
+    user = user_cache.load(user_id)
+    # 샤드에 아직 사용자 행 사본이 없으면 (회원가입 후 첫 요청) 디렉터리에서 복사
+    if user is None and shard_router.enabled and copy_user_to_shard(db.engine, user_id):
+        user = user_cache.load(user_id)
+    return user
@@ -0,0 +1,202 @@
+import statistics
+import threading
+from collections import OrderedDict
+from datetime import date, timedelta
+from itertools import chain
+from sqlalchemy import Date, Integer, cast, func, select, union_all
+from app import db
+from app.models import ArchivedTask, DailyCompletion, Task
+
+try:
+    import numpy as np
+except ImportError:  # numpy가 없으면 표준 statistics 모듈로 계산
+    np = None
+
+PERIODS = {'week': 12, 'month': 12}
+MAX_PERIODS = 52
+MAX_CACHE_ENTRIES = 1024
+
+
+def parse_period(args):
+    """period(week/month)와 periods(개수) 파라미터 검증 (잘못된 값이면 ValueError)"""
+    period = args.get('period') or 'week'
+    if period not in PERIODS:
+        raise ValueError('period는 week 또는 month여야 합니다.')
+    try:
+        count = int(args.get('periods') or PERIODS[period])
+    except ValueError:
+        raise ValueError('periods는 숫자여야 합니다.')
+    return period, max(1, min(count, MAX_PERIODS))
+
+
+def period_start(day, period):
+    if period == 'week':
+        return day - timedelta(days=day.weekday())
+    return day.replace(day=1)
+
+
+def _shift_months(day, months):
+    month = day.year * 12 + day.month - 1 + months
+    return date(month // 12, month % 12 + 1, 1)
+
+
+def period_starts(today, period, count):
+    """오늘이 속한 기간까지 count개의 기간 시작일 (오래된 순)"""
+    current = period_start(today, period)
+    if period == 'week':
+        return [current - timedelta(weeks=offset) for offset in range(count - 1, -1, -1)]
+    return [_shift_months(current, -offset) for offset in range(count - 1, -1, -1)]
+
+
+def completion_trend(user_id, today, period, count):
+    """기간별/카테고리별 완료 개수 (DailyCompletion 집계에서 계산)"""
+    starts = period_starts(today, period, count)
+    buckets = {start: {'period_start': start.isoformat(), 'total': 0, 'categories': {}} for start in starts}
+    rows = db.session.execute(
+        select(DailyCompletion.day, DailyCompletion.category, DailyCompletion.count)
+        .where(DailyCompletion.user_id == user_id, DailyCompletion.day >= starts[0],
+               DailyCompletion.day <= today, DailyCompletion.count > 0)
+    ).all()
+    for day, category, value in rows:
+        bucket = buckets[period_start(day, period)]
+        bucket['total'] += value
+        bucket['categories'][category] = bucket['categories'].get(category, 0) + value
+    return [buckets[start] for start in starts]
+
+
+def _day_columns(dialect, table):
+    """(생성→완료 소요 일수, 마감일 준수 여부) SQL 식
+
+    둘 다 DB에서 숫자로 계산한다. 준수 여부는 1(마감일 이내), 0(지연), -1(마감일 없음).
+    """
+    columns = table.c
+    if dialect == 'postgresql':
+        lead = func.extract('epoch', columns.completed_at - columns.created_at) / 86400.0
+        on_time = cast(columns.completed_at, Date) <= columns.due_date
+    else:
+        lead = func.julianday(columns.completed_at) - func.julianday(columns.created_at)
+        on_time = func.date(columns.completed_at) <= columns.due_date
+    return lead, func.coalesce(cast(on_time, Integer), -1)
+
+
+def completed_statement(dialect, table, user_id):
+    """완료된 작업의 (소요 일수, 마감일 준수 여부) 조회문 (완료 커버링 인덱스만 읽음)"""
+    lead, on_time = _day_columns(dialect, table)
+    statement = select(lead, on_time).where(
+        table.c.user_id == user_id, table.c.completed_at.is_not(None), table.c.created_at.is_not(None))
+    # 보관 테이블에는 완료된 작업만 있다
+    return statement.where(table.c.status == 'completed') if table is Task.__table__ else statement
+
+
+def _completed_columns(user_id):
+    """완료된 작업(보관 작업 포함)의 소요 일수와 마감일 준수 여부를 열 단위 배열로 읽는다
+
+    두 테이블의 커버링 인덱스만 읽고, 행은 ORM 객체 대신 숫자 튜플로 받아 numpy 배열 하나로 옮긴다.
+    """
+    dialect = db.session.get_bind().dialect.name
+    rows = db.session.execute(union_all(
+        completed_statement(dialect, Task.__table__, user_id),
+        completed_statement(dialect, ArchivedTask.__table__, user_id),
+    )).all()
+    if np is not None:
+        table = np.fromiter(chain.from_iterable(rows), dtype=float, count=2 * len(rows)).reshape(-1, 2)
+        return table[:, 0], table[:, 1]
+    return [row[0] for row in rows], [row[1] for row in rows]
+
+
+def _lead_time_summary(values):
+    if len(values) == 0:
+        return {'count': 0, 'mean_days': None, 'median_days': None, 'p90_days': None}
+    if np is not None:
+        mean, median, p90 = float(np.mean(values)), float(np.median(values)), float(np.percentile(values, 90))
+    else:
+        ordered = sorted(values)
+        mean, median = statistics.fmean(ordered), statistics.median(ordered)
+        p90 = statistics.quantiles(ordered, n=10, method='inclusive')[-1] if len(ordered) > 1 else ordered[0]
+    return {'count': len(values), 'mean_days': round(mean, 2),
+            'median_days': round(median, 2), 'p90_days': round(p90, 2)}
+
+
+def _due_summary(user_id, on_time_flags, today):
+    if np is not None:
+        total = int(np.count_nonzero(on_time_flags >= 0))
+        on_time = int(np.count_nonzero(on_time_flags == 1))
+    else:
+        total = sum(1 for flag in on_time_flags if flag >= 0)
+        on_time = sum(1 for flag in on_time_flags if flag == 1)
+    open_overdue = db.session.execute(
+        select(func.count(Task.id))
+        .where(Task.user_id == user_id, Task.status != 'completed', Task.due_date < today)
+    ).scalar()
+    return {
+        'completed_with_due_date': total,
+        'on_time': on_time,
+        'late': total - on_time,
+        'on_time_rate': round(on_time / total, 4) if total else None,
+        'open_overdue': open_overdue,
+    }
+
+
+def completion_streaks(user_id, today):
+    """완료한 날이 이어진 일수 (current는 오늘 또는 어제까지 이어진 연속 일수)"""
+    days = db.session.execute(
+        select(DailyCompletion.day)
+        .where(DailyCompletion.user_id == user_id, DailyCompletion.count > 0)
+        .group_by(DailyCompletion.day)
+        .order_by(DailyCompletion.day)
+    ).scalars().all()
+    longest = run = 0
+    previous = None
+    for day in days:
+        run = run + 1 if previous is not None and (day - previous).days == 1 else 1
+        longest = max(longest, run)
+        previous = day
+    current = run if previous is not None and (today - previous).days <= 1 else 0
+    return {'current_days': current, 'longest_days': longest}
+
+
+def compute_analytics(user_id, period, count, today=None):
+    today = today or date.today()
+    lead_days, on_time_flags = _completed_columns(user_id)
+    return {
+        'period': period,
+        'trend': completion_trend(user_id, today, period, count),
+        'lead_time': _lead_time_summary(lead_days),
+        'due_dates': _due_summary(user_id, on_time_flags, today),
+        'streak': completion_streaks(user_id, today),
+    }
+
+
+class AnalyticsCache:
+    """(사용자, data_version, 날짜, 파라미터)별 분석 결과 LRU 캐시
+
+    작업이 바뀌면 data_version이 올라가므로 별도 무효화 없이 다음 조회 때 다시 계산한다.
+    """
+
+    def __init__(self, max_entries=MAX_CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def get(self, user_id, data_version, period, count):
+        today = date.today()
+        key = (user_id, period, count)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == (data_version, today):
+                self._entries.move_to_end(key)
+                return entry[1]
+        result = compute_analytics(user_id, period, count, today)
+        with self._lock:
+            self._entries[key] = ((data_version, today), result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return result
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+analytics_cache = AnalyticsCache()
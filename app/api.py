@@ -1,13 +1,40 @@
-from flask import Blueprint, request, jsonify, session
+from flask import Blueprint, Response, request, jsonify, session, stream_with_context
 from flask_login import login_user, logout_user, current_user, login_required
 from datetime import datetime, date, timedelta
 from sqlalchemy import and_, func, extract
 from app import db
 from app.models import User, Task
+from app.batch import BatchValidationError, apply_operations, prepare_operations
+from app.etag import conditional
+from app.passwords import PasswordHasherBusy
+from app.response_cache import cached_response
+from app.singleflight import coalesced
+from app.ratelimit import check_login_rate
+from app.events import event_bus, event_stream, publish_task_event
+from app.serializers import (
+    STREAM_CHUNK_SIZE, serialize_event, serialize_recent_task, serialize_task, stream_json
+)
+from app.search import DEFAULT_LIMIT as SEARCH_DEFAULT_LIMIT, MAX_LIMIT as SEARCH_MAX_LIMIT, search_tasks
+from app.analytics import analytics_cache, parse_period
+from app.stats import statistics_cache
+from app.sync import InvalidSyncToken, parse_sync_token, task_changes
+from app.transfer import (
+    FORMATS as TRANSFER_FORMATS, ImportAborted,
+    export_request, generate_csv, generate_ndjson, import_tasks, read_records
+)
+from app.user_cache import user_cache
+from app.pagination import fetch_page, parse_limit
+from app.queries import (
+    calendar_request, calendar_statement, heatmap_statement, month_range, page_cursor,
+    recent_tasks_statement, task_list_request
+)
 import json
 
 api = Blueprint('api', __name__)
 
+# /dashboard/bootstrap의 include로 고를 수 있는 섹션
+DASHBOARD_SECTIONS = ('user', 'statistics', 'recent_tasks', 'calendar')
+
 # Authentication routes
 @api.route('/auth/login', methods=['POST'])
 def login():
@@ -19,8 +46,17 @@ def login():
         if not username or not password:
             return jsonify({'error': '사용자명과 비밀번호를 입력해주세요.'}), 400
         
+        # 비밀번호 해시 계산 전에 사용자명/IP별 시도 횟수를 제한
+        retry_after = check_login_rate(username, request.remote_addr)
+        if retry_after:
+            return jsonify({'error': '로그인 시도가 너무 많습니다. 잠시 후 다시 시도해주세요.'}), 429, {
+                'Retry-After': str(retry_after)
+            }
+        
         user = User.query.filter_by(username=username).first()
         if user and user.check_password(password):
+            if db.session.is_modified(user):
+                db.session.commit()  # 새 해시 설정으로 다시 해시한 비밀번호 저장
             login_user(user)
             return jsonify({
                 'message': '로그인 성공',
@@ -32,6 +68,8 @@ def login():
             }), 200
         else:
             return jsonify({'error': '사용자명 또는 비밀번호가 잘못되었습니다.'}), 401
+    except PasswordHasherBusy as e:
+        return jsonify({'error': str(e)}), 503, {'Retry-After': str(e.retry_after)}
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -60,6 +98,8 @@ def register():
         db.session.commit()
         
         return jsonify({'message': '회원가입이 완료되었습니다!'}), 201
+    except PasswordHasherBusy as e:
+        return jsonify({'error': str(e)}), 503, {'Retry-After': str(e.retry_after)}
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -80,40 +120,68 @@ def get_current_user():
         }
     }), 200
 
+@api.route('/system/user-cache', methods=['GET'])
+@login_required
+def get_user_cache_stats():
+    return jsonify(user_cache.stats()), 200
+
 # Task routes
 @api.route('/tasks', methods=['GET'])
 @login_required
+@conditional
+@coalesced
+@cached_response
 def get_tasks():
     try:
-        category = request.args.get('category', 'all')
-        status = request.args.get('status', 'all')
-        
-        query = Task.query.filter_by(user_id=current_user.id)
-        
-        if category != 'all':
-            query = query.filter_by(category=category)
-        
-        if status != 'all':
-            query = query.filter_by(status=status)
-        
-        tasks = query.order_by(Task.created_at.desc()).all()
-        
-        tasks_data = []
-        for task in tasks:
-            tasks_data.append({
-                'id': task.id,
-                'title': task.title,
-                'description': task.description,
-                'category': task.category,
-                'priority': task.priority,
-                'status': task.status,
-                'created_at': task.created_at.isoformat(),
-                'updated_at': task.updated_at.isoformat(),
-                'completed_at': task.completed_at.isoformat() if task.completed_at else None,
-                'due_date': task.due_date.isoformat() if task.due_date else None
-            })
-        
-        return jsonify({'tasks': tasks_data}), 200
+        try:
+            limit, filters, statements, serialize = task_list_request(current_user.id, request.args)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        rows, has_more = fetch_page(db.session.execute, statements, limit)
+        
+        return stream_json('tasks', rows, serialize,
+                           extra={'next_cursor': page_cursor(rows, has_more, filters)})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@api.route('/tasks/search', methods=['GET'])
+@login_required
+@conditional
+@coalesced
+def search():
+    try:
+        query = request.args.get('q', '').strip()
+        if not query:
+            return jsonify({'error': '검색어를 입력해주세요.'}), 400
+        
+        limit = parse_limit(request.args.get('limit'), default=SEARCH_DEFAULT_LIMIT, maximum=SEARCH_MAX_LIMIT)
+        try:
+            offset = max(int(request.args.get('offset', 0)), 0)
+        except ValueError:
+            offset = 0
+        
+        results, next_offset = search_tasks(current_user.id, query, limit, offset)
+        return jsonify({'tasks': results, 'next_offset': next_offset}), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@api.route('/tasks/changes', methods=['GET'])
+@login_required
+@conditional
+def get_task_changes():
+    try:
+        try:
+            since = parse_sync_token(request.args.get('since'))
+        except InvalidSyncToken:
+            return jsonify({'error': '잘못된 동기화 토큰입니다.'}), 400
+        
+        # since 이후 변경/삭제만 전송 (삭제 목록을 먼저 적용한 뒤 tasks를 반영)
+        rows, deleted, token, reset = task_changes(current_user.id, since)
+        return stream_json('tasks', rows, serialize_task, extra={
+            'deleted': deleted,
+            'sync_token': str(token),
+            'reset': reset
+        })
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -134,25 +202,104 @@ def create_task():
         
         db.session.add(task)
         db.session.commit()
+        delta = statistics_cache.task_created(current_user.id, task)
+        publish_task_event(current_user.id, 'task.created', serialize_task(task), delta)
         
         return jsonify({
             'message': '작업이 추가되었습니다!',
-            'task': {
-                'id': task.id,
-                'title': task.title,
-                'description': task.description,
-                'category': task.category,
-                'priority': task.priority,
-                'status': task.status,
-                'created_at': task.created_at.isoformat(),
-                'updated_at': task.updated_at.isoformat(),
-                'completed_at': task.completed_at.isoformat() if task.completed_at else None,
-                'due_date': task.due_date.isoformat() if task.due_date else None
-            }
+            'task': serialize_task(task)
         }), 201
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@api.route('/tasks/batch', methods=['POST'])
+@login_required
+def batch_tasks():
+    try:
+        data = request.get_json(silent=True) or {}
+        try:
+            prepared = prepare_operations(current_user.id, data.get('operations'))
+        except BatchValidationError as e:
+            return jsonify({'error': str(e), 'errors': e.errors}), 400
+        
+        results = apply_operations(current_user.id, prepared)
+        db.session.commit()
+        statistics_cache.invalidate(current_user.id)
+        # 일괄 변경은 개별 이벤트 대신 한 번에 다시 불러오도록 알림
+        event_bus.publish(current_user.id, 'tasks.batch', {'results': results})
+        
+        return jsonify({
+            'message': f'{len(results)}개의 작업이 처리되었습니다.',
+            'results': results
+        }), 200
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+@api.route('/tasks/export', methods=['GET'])
+@login_required
+def export_tasks():
+    try:
+        fmt, statement, mimetype, headers = export_request(current_user.id, request.args)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    # 서버 측 커서로 조금씩 읽어 보내므로 작업 수와 관계없이 메모리 사용량이 일정
+    rows = db.session.execute(statement)
+    body = generate_csv(rows) if fmt == 'csv' else generate_ndjson(rows)
+    return Response(stream_with_context(body), mimetype=mimetype, headers=headers)
+
+@api.route('/tasks/import', methods=['POST'])
+@login_required
+def import_tasks_route():
+    try:
+        upload = request.files.get('file')
+        fmt = request.args.get('format')
+        if fmt is None:
+            name = upload.filename if upload is not None else ''
+            mimetype = upload.mimetype if upload is not None else request.mimetype
+            fmt = 'csv' if name.endswith('.csv') or mimetype == 'text/csv' else 'ndjson'
+        if fmt not in TRANSFER_FORMATS:
+            return jsonify({'error': 'format은 ndjson 또는 csv여야 합니다.'}), 400
+        skip_invalid = request.args.get('on_error') == 'skip'
+        try:
+            after_line = int(request.args.get('after_line', 0))
+        except ValueError:
+            return jsonify({'error': 'after_line은 정수여야 합니다.'}), 400
+        
+        # multipart 업로드 파일이나 요청 본문을 한 줄씩 읽으며 청크마다 커밋
+        # (실패하면 응답의 resume_after를 after_line으로 주고 같은 파일을 다시 올리면 이어서 가져옴)
+        stream = upload.stream if upload is not None else request.stream
+        try:
+            imported, skipped, errors, resume_after = import_tasks(
+                current_user.id, read_records(stream, fmt), skip_invalid=skip_invalid,
+                after_line=after_line
+            )
+        except ImportAborted as e:
+            _imported(e.imported)
+            return jsonify({'error': str(e), 'line': e.line, 'imported': e.imported,
+                            'resume_after': e.resume_after}), 400
+        except UnicodeDecodeError:
+            return jsonify({'error': 'UTF-8 텍스트 파일이어야 합니다.'}), 400
+        
+        _imported(imported)
+        return jsonify({
+            'message': f'{imported}개의 작업을 가져왔습니다.',
+            'imported': imported,
+            'skipped': skipped,
+            'errors': errors,
+            'resume_after': resume_after
+        }), 200
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+def _imported(count):
+    """가져오기로 커밋된 작업이 있으면 통계 캐시를 비우고 목록을 다시 불러오도록 알림"""
+    if count:
+        statistics_cache.invalidate(current_user.id)
+        event_bus.publish(current_user.id, 'tasks.batch', {'imported': count})
+
 @api.route('/tasks/<int:task_id>', methods=['PUT'])
 @login_required
 def update_task(task_id):
@@ -171,21 +318,11 @@ def update_task(task_id):
         task.updated_at = datetime.utcnow()
         
         db.session.commit()
+        publish_task_event(current_user.id, 'task.updated', serialize_task(task))
         
         return jsonify({
             'message': '작업이 수정되었습니다!',
-            'task': {
-                'id': task.id,
-                'title': task.title,
-                'description': task.description,
-                'category': task.category,
-                'priority': task.priority,
-                'status': task.status,
-                'created_at': task.created_at.isoformat(),
-                'updated_at': task.updated_at.isoformat(),
-                'completed_at': task.completed_at.isoformat() if task.completed_at else None,
-                'due_date': task.due_date.isoformat() if task.due_date else None
-            }
+            'task': serialize_task(task)
         }), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -198,12 +335,15 @@ def toggle_task(task_id):
         if not task:
             return jsonify({'error': '작업을 찾을 수 없습니다.'}), 404
         
+        old_status, old_completed_at = task.status, task.completed_at
         if task.status == 'completed':
             task.mark_pending()
         else:
             task.mark_completed()
         
         db.session.commit()
+        delta = statistics_cache.task_status_changed(current_user.id, old_status, old_completed_at, task)
+        publish_task_event(current_user.id, 'task.toggled', serialize_task(task), delta)
         
         return jsonify({
             'message': '작업 상태가 변경되었습니다.',
@@ -224,8 +364,11 @@ def delete_task(task_id):
         if not task:
             return jsonify({'error': '작업을 찾을 수 없습니다.'}), 404
         
+        status, completed_at = task.status, task.completed_at
         db.session.delete(task)
         db.session.commit()
+        delta = statistics_cache.task_deleted(current_user.id, status, completed_at)
+        publish_task_event(current_user.id, 'task.deleted', {'id': task_id}, delta)
         
         return jsonify({'message': '작업이 삭제되었습니다!'}), 200
     except Exception as e:
@@ -234,94 +377,143 @@ def delete_task(task_id):
 # Dashboard routes
 @api.route('/dashboard/statistics', methods=['GET'])
 @login_required
+@conditional
+@coalesced
 def get_statistics():
     try:
-        total_tasks = Task.query.filter_by(user_id=current_user.id).count()
-        completed_tasks = Task.query.filter_by(user_id=current_user.id, status='completed').count()
-        pending_tasks = total_tasks - completed_tasks
-        
-        # Get today's completed tasks
-        today = date.today()
-        today_completed = Task.query.filter_by(
-            user_id=current_user.id, 
-            status='completed'
-        ).filter(
-            func.date(Task.completed_at) == today
-        ).count()
-        
-        return jsonify({
-            'total_tasks': total_tasks,
-            'completed_tasks': completed_tasks,
-            'pending_tasks': pending_tasks,
-            'today_completed': today_completed
-        }), 200
+        return jsonify(statistics_cache.get(current_user.id, current_user.data_version)), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @api.route('/dashboard/recent-tasks', methods=['GET'])
 @login_required
+@conditional
+@coalesced
 def get_recent_tasks():
     try:
-        recent_tasks = Task.query.filter_by(user_id=current_user.id)\
-                               .order_by(Task.created_at.desc())\
-                               .limit(5).all()
-        
-        tasks_data = []
-        for task in recent_tasks:
-            tasks_data.append({
-                'id': task.id,
-                'title': task.title,
-                'category': task.category,
-                'status': task.status,
-                'created_at': task.created_at.strftime('%m/%d %H:%M')
-            })
+        recent_tasks = db.session.execute(recent_tasks_statement(current_user.id)).all()
         
-        return jsonify({'tasks': tasks_data}), 200
+        return jsonify({'tasks': [serialize_recent_task(task) for task in recent_tasks]}), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-@api.route('/calendar/events', methods=['GET'])
+@api.route('/dashboard/bootstrap', methods=['GET'])
 @login_required
-def get_calendar_events():
+@conditional
+@coalesced
+def get_dashboard_bootstrap():
+    """대시보드 첫 화면에 필요한 사용자, 통계, 최근 작업, 이번 달 캘린더 이벤트를 한 번에 반환
+
+    include로 일부 섹션만 고를 수 있다. 사용자와 통계는 캐시에서 읽으므로 SQL은 최근 작업과
+    캘린더 이벤트 조회 두 번이며, 같은 세션 트랜잭션 안에서 실행된다.
+    """
     try:
-        start_date = request.args.get('start')
-        end_date = request.args.get('end')
-        
-        query = Task.query.filter_by(user_id=current_user.id)
-        
-        # 날짜 범위 필터링 (선택사항)
-        if start_date and end_date:
+        include = request.args.get('include')
+        sections = DASHBOARD_SECTIONS
+        if include:
+            sections = [name.strip() for name in include.split(',') if name.strip()]
+            unknown = [name for name in sections if name not in DASHBOARD_SECTIONS]
+            if unknown:
+                return jsonify({'error': f'알 수 없는 섹션입니다: {", ".join(unknown)}'}), 400
+        
+        data = {}
+        if 'user' in sections:
+            data['user'] = {
+                'id': current_user.id,
+                'username': current_user.username,
+                'email': current_user.email
+            }
+        if 'statistics' in sections:
+            data['statistics'] = statistics_cache.get(current_user.id, current_user.data_version)
+        if 'recent_tasks' in sections:
+            recent_tasks = db.session.execute(recent_tasks_statement(current_user.id)).all()
+            data['recent_tasks'] = [serialize_recent_task(task) for task in recent_tasks]
+        if 'calendar' in sections:
             try:
-                start = datetime.strptime(start_date, '%Y-%m-%d').date()
-                end = datetime.strptime(end_date, '%Y-%m-%d').date()
-                
-                # 마감일이 있는 작업들 또는 생성일이 범위 내인 작업들
-                query = query.filter(
-                    (Task.due_date.between(start, end)) |
-                    (func.date(Task.created_at).between(start, end))
-                )
+                start, end = month_range()
+                if request.args.get('start') and request.args.get('end'):
+                    start = datetime.strptime(request.args['start'], '%Y-%m-%d').date()
+                    end = datetime.strptime(request.args['end'], '%Y-%m-%d').date()
             except ValueError:
-                pass  # 날짜 파싱 실패 시 필터링 없이 진행
+                return jsonify({'error': '날짜 형식이 올바르지 않습니다. (YYYY-MM-DD)'}), 400
+            statement = calendar_statement(current_user.id, start.isoformat(), end.isoformat(), True)
+            data['calendar'] = {
+                'start': start.isoformat(),
+                'end': end.isoformat(),
+                'events': [serialize_event(row, True) for row in db.session.execute(statement)]
+            }
+        return jsonify(data), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@api.route('/dashboard/heatmap', methods=['GET'])
+@login_required
+@conditional
+@coalesced
+def get_heatmap():
+    try:
+        try:
+            end = datetime.strptime(request.args['to'], '%Y-%m-%d').date() if request.args.get('to') else date.today()
+            start = datetime.strptime(request.args['from'], '%Y-%m-%d').date() if request.args.get('from') else end - timedelta(days=364)
+        except ValueError:
+            return jsonify({'error': '날짜 형식이 올바르지 않습니다. (YYYY-MM-DD)'}), 400
         
-        tasks = query.all()
+        if start > end or (end - start).days > 365:
+            return jsonify({'error': '조회 기간은 1년 이내여야 합니다.'}), 400
         
-        events = []
-        for task in tasks:
-            # 마감일이 있으면 마감일을, 없으면 생성일을 사용
-            event_date = task.due_date.strftime('%Y-%m-%d') if task.due_date else task.created_at.strftime('%Y-%m-%d')
-            
-            events.append({
-                'id': task.id,
-                'title': task.title,
-                'start': event_date,
-                'due_date': task.due_date.strftime('%Y-%m-%d') if task.due_date else None,
-                'created_at': task.created_at.strftime('%Y-%m-%d'),
-                'category': task.category,
-                'status': task.status,
-                'priority': task.priority,
-                'description': task.description
-            })
+        rows = db.session.execute(heatmap_statement(current_user.id, start, end)).all()
+        
+        days = {}
+        for day, category, count in rows:
+            entry = days.setdefault(day, {'date': day.isoformat(), 'count': 0, 'categories': {}})
+            entry['count'] += count
+            entry['categories'][category] = count
+        
+        return jsonify({
+            'from': start.isoformat(),
+            'to': end.isoformat(),
+            'days': list(days.values())
+        }), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@api.route('/analytics', methods=['GET'])
+@login_required
+@conditional
+@coalesced
+def get_analytics():
+    try:
+        try:
+            period, count = parse_period(request.args)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         
-        return jsonify({'events': events}), 200
+        # 작업이 바뀌지 않았으면 (data_version이 같으면) 계산된 결과를 그대로 사용
+        return jsonify(analytics_cache.get(current_user.id, current_user.data_version, period, count)), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
+
+@api.route('/calendar/events', methods=['GET'])
+@login_required
+@conditional
+@coalesced
+@cached_response
+def get_calendar_events():
+    try:
+        # compact=1 이면 설명을 제외한 가벼운 이벤트만 반환
+        statement, serialize = calendar_request(current_user.id, request.args)
+        
+        # 큰 결과도 메모리에 모두 올리지 않도록 나눠서 읽으며 스트리밍
+        tasks = db.session.execute(statement.execution_options(yield_per=STREAM_CHUNK_SIZE))
+        return stream_json('events', tasks, serialize)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@api.route('/stream', methods=['GET'])
+@login_required
+def stream_events():
+    # 제너레이터는 요청 컨텍스트 없이 동작하므로 사용자 id만 미리 꺼내 둔다
+    return Response(event_stream(current_user.id), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
@@ -0,0 +1,81 @@
+"""완료 후 오래 지난 작업을 보관 테이블(archived_task)로 옮기는 작업
+
+작업 테이블과 그 인덱스가 활동 중인 작업 위주로 작게 유지되도록 archive-tasks 명령을
+cron 등으로 주기적으로 실행한다. 사용자별로 batch_size개씩 짧은 트랜잭션으로 옮기고
+배치 사이에 잠시 쉬어, 요청 처리 중인 쓰기가 오래 기다리지 않게 한다.
+
+옮긴 개수는 사용자 행의 archived_task_count에 더해 통계가 그대로 유지되고, 일별 완료 집계
+(DailyCompletion)는 건드리지 않는다. 보관된 작업은 include_archived=1 조회에서만 보이며
+수정/삭제/검색과 증분 동기화 대상이 아니다. 옮긴 작업은 삭제 기록(DeletedTask)을 남기므로
+증분 동기화 클라이언트의 로컬 목록에서도 빠진다. 작업 id는 AUTOINCREMENT라 재사용되지 않는다.
+"""
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import select, update
+from app.models import ArchivedTask, Task, User, record_tombstones
+
+DEFAULT_AFTER_DAYS = 180
+DEFAULT_BATCH_SIZE = 500  # 삭제할 id를 IN (...)으로 넘기므로 SQLite 바인드 변수 한도 이내
+
+
+def candidates_statement(user_id, cutoff, limit, columns=(Task.id,)):
+    """보관할 작업 조회문 (완료 시각 순, 완료 인덱스 범위 검색)"""
+    return (
+        select(*columns)
+        .where(Task.user_id == user_id, Task.status == 'completed', Task.completed_at < cutoff)
+        .order_by(Task.completed_at).limit(limit)
+    )
+
+
+def _archive_batch(engine, user_id, cutoff, batch_size, now):
+    """한 트랜잭션에서 사용자의 작업을 batch_size개까지 옮기고 옮긴 개수를 반환"""
+    tasks, archived = Task.__table__, ArchivedTask.__table__
+    columns = [column for column in tasks.columns if column.computed is None]
+    with engine.connect() as conn:
+        # 사용자 행을 먼저 갱신해 쓰기 잠금을 잡는다 (SQLite에서 읽기 트랜잭션을 쓰기로 올리다
+        # 다른 커밋과 충돌하지 않도록). 다른 프로세스가 같은 작업을 옮겼으면 0개가 된다.
+        revision = conn.execute(update(User).where(User.id == user_id)
+                                .values(data_version=User.data_version + 1)
+                                .returning(User.data_version)).scalar()
+        rows = conn.execute(candidates_statement(user_id, cutoff, batch_size, columns)).mappings().all()
+        if not rows:
+            conn.rollback()
+            return 0
+        conn.execute(archived.insert(), [dict(row, archived_at=now) for row in rows])
+        task_ids = [row['id'] for row in rows]
+        conn.execute(tasks.delete().where(tasks.c.id.in_(task_ids)))
+        # 증분 동기화 클라이언트가 옮긴 작업을 로컬에서 지우도록 같은 revision으로 삭제 기록
+        record_tombstones(conn, user_id, task_ids, revision)
+        conn.execute(update(User).where(User.id == user_id)
+                     .values(archived_task_count=User.archived_task_count + len(rows)))
+        conn.commit()
+    return len(rows)
+
+
+def archive_completed_tasks(engine, after_days=DEFAULT_AFTER_DAYS, batch_size=DEFAULT_BATCH_SIZE,
+                            pause=0.05, now=None):
+    """완료된 지 after_days일이 지난 작업을 보관 테이블로 옮긴다 ({user_id: 옮긴 개수} 반환)
+
+    옮긴 사용자는 배치마다 data_version이 올라가므로 ETag와 응답 캐시가 바뀐다.
+    호출한 쪽에서 반환된 사용자의 캐시를 무효화해야 한다.
+    """
+    now = now or datetime.utcnow()
+    cutoff = now - timedelta(days=after_days)
+    with engine.connect() as conn:
+        user_ids = conn.execute(select(User.id).order_by(User.id)).scalars().all()
+
+    moved = {}
+    for user_id in user_ids:
+        # 옮길 작업이 없는 사용자는 인덱스 확인 한 번으로 건너뛴다
+        with engine.connect() as conn:
+            candidate = conn.execute(candidates_statement(user_id, cutoff, 1)).first()
+        if candidate is None:
+            continue
+        while True:
+            count = _archive_batch(engine, user_id, cutoff, batch_size, now)
+            if count:
+                moved[user_id] = moved.get(user_id, 0) + count
+            if count < batch_size:
+                break
+            time.sleep(pause)
+    return moved
@@ -0,0 +1,510 @@
+"""ASGI 서빙 모드
+
+읽기 비중이 큰 라우트(작업 목록, 캘린더 이벤트, 내보내기)는 SQLAlchemy 비동기 엔진
+(aiosqlite/asyncpg)으로 이벤트 루프에서 직접 처리하고, 나머지 라우트(쓰기, 인증 등)는
+스레드 풀에서 기존 Flask 앱으로 넘긴다. 느린 클라이언트에게 긴 내보내기를 보내는 동안에도
+OS 스레드를 점유하지 않는다. SSE(/api/stream)도 이벤트 루프에서 asyncio 큐로 기다리므로
+열린 연결이 ASGI_WSGI_THREADS 스레드 풀을 차지하지 않는다.
+
+세션 쿠키, ETag/304, 응답 캐시, 압축, 계측은 Flask 경로와 같은 함수를 사용하므로 두 경로의
+응답은 같다. 세션에 로그인 정보가 없거나(remember 쿠키만 있는 경우 포함) 캐시된 사용자가
+없어진 요청은 Flask 경로로 넘겨 login_required 동작을 그대로 따른다. 샤딩을 쓰면 샤드마다
+비동기 엔진을 만들고 Flask 경로와 같은 샤드로 보낸다.
+
+워커 프로세스를 여러 개 띄우면(--workers N) 사용자/응답/통계 캐시와 single-flight 테이블은
+워커마다 따로 있다. 이 캐시들은 요청마다 확인한 사용자의 data_version으로 검증되므로,
+USER_CACHE_REDIS_URL(공유 사용자 캐시)이 없으면 사용자 캐시가 적중해도 data_version은
+DB에서 다시 읽는다. SSE 이벤트가 다른 워커의 연결에도 전달되려면 EVENT_BROKER_URL이 필요하다.
+"""
+import asyncio
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from tempfile import SpooledTemporaryFile
+from asgiref.sync import AsyncToSync, sync_to_async
+from itsdangerous import BadSignature
+from sqlalchemy.ext.asyncio import create_async_engine
+from werkzeug.datastructures import Headers
+from werkzeug.http import quote_etag
+from werkzeug.sansio.request import Request
+from werkzeug.utils import get_content_type
+from app import CORS_ORIGINS, create_app, db
+from app.compression import COMPRESSIBLE_MIMETYPES, choose_encoding, make_encoder
+from app.config import engine_options, is_memory_sqlite, register_sqlite_pragmas
+from app.etag import etag_for
+from app.events import async_event_stream
+from app.metrics import metrics
+from app.pagination import split_page
+from app.passwords import password_hasher
+from app.queries import calendar_request, page_cursor, task_list_request
+from app.response_cache import CachedBody, cache_key, response_cache
+from app.sharding import shard_router
+from app.serializers import STREAM_CHUNK_SIZE, dumps, json_close, json_items, json_open
+from app.transfer import EXPORT_CHUNK_SIZE, export_request, generate_csv, generate_ndjson
+from app.user_cache import user_cache, user_statement, version_statement
+
+ASYNC_DRIVERS = {'sqlite': 'sqlite+aiosqlite', 'postgresql': 'postgresql+asyncpg'}
+
+
+def async_database_url(url):
+    """동기 엔진 URL을 같은 DB를 가리키는 비동기 드라이버 URL로 변환"""
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise RuntimeError(f'ASGI 모드는 {backend} 데이터베이스를 지원하지 않습니다.')
+    if is_memory_sqlite(url):
+        raise RuntimeError('ASGI 모드에서는 메모리 SQLite를 사용할 수 없습니다. (연결마다 다른 DB가 됨)')
+    return url.set(drivername=ASYNC_DRIVERS[backend])
+
+
+# 요청 본문이 이보다 크면 디스크 임시 파일로 넘긴다 (asgiref WsgiToAsgi와 같은 값)
+WSGI_BODY_SPOOL_SIZE = 65536
+
+
+def _wsgi_environ(scope, body):
+    """ASGI HTTP scope를 WSGI environ으로 변환 (PEP 3333)"""
+    server = scope.get('server') or ('localhost', 80)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', '').encode('utf-8').decode('latin-1'),
+        'PATH_INFO': scope['path'].encode('utf-8').decode('latin-1'),
+        'QUERY_STRING': scope.get('query_string', b'').decode('ascii'),
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'SERVER_NAME': server[0],
+        'SERVER_PORT': str(server[1] or 80),
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': body,
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False,
+    }
+    client = scope.get('client')
+    if client:
+        environ['REMOTE_ADDR'], environ['REMOTE_PORT'] = client[0], str(client[1])
+    for name, value in scope.get('headers', ()):
+        name = name.decode('latin-1')
+        if name in ('content-type', 'content-length'):
+            key = name.upper().replace('-', '_')
+        else:
+            key = 'HTTP_' + name.upper().replace('-', '_')
+        value = value.decode('latin-1')
+        if key in environ:
+            # 같은 헤더가 여러 번 오면 합친다 (HTTP/2의 쿠키는 '; '로)
+            value = environ[key] + ('; ' if key == 'HTTP_COOKIE' else ',') + value
+        environ[key] = value
+    return environ
+
+
+class _WsgiBridge:
+    """Flask 앱을 전용 스레드 풀에서 실행하는 ASGI 어댑터
+
+    asgiref.wsgi.WsgiToAsgi는 모든 요청을 한 스레드에서 차례로 실행(thread_sensitive)하고
+    WSGI 본문의 close()를 부르지 않아 Response.call_on_close 정리(single-flight 해제 등)가
+    실행되지 않는다. 여기서는 sync_to_async의 executor로 요청마다 풀 스레드를 쓰고,
+    클라이언트가 끊으면 본문 읽기를 멈추며, 어떤 경우에도 본문을 닫는다.
+    """
+
+    def __init__(self, wsgi_app, executor):
+        self.wsgi_app = wsgi_app
+        self.executor = executor
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            raise ValueError(f"WSGI 앱은 {scope['type']} 연결을 처리할 수 없습니다.")
+        body = SpooledTemporaryFile(max_size=WSGI_BODY_SPOOL_SIZE)
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                body.close()
+                return
+            body.write(message.get('body', b''))
+            if not message.get('more_body'):
+                break
+        body.seek(0)
+
+        disconnected = threading.Event()
+        watcher = asyncio.ensure_future(_wait_disconnect(receive, disconnected))
+        run = sync_to_async(self._run, thread_sensitive=False, executor=self.executor)
+        try:
+            await run(_wsgi_environ(scope, body), AsyncToSync(send), disconnected)
+        finally:
+            watcher.cancel()
+            body.close()
+
+    def _run(self, environ, send, disconnected):
+        response = {}
+
+        def start_response(status, headers, exc_info=None):
+            if exc_info and response.get('sent'):
+                raise exc_info[1].with_traceback(exc_info[2])
+            response['start'] = {'type': 'http.response.start', 'status': int(status.split(' ', 1)[0]),
+                                 'headers': _encode(headers)}
+
+        def start():
+            # 헤더는 첫 청크와 함께 보낸다 (본문을 만들다 실패하면 오류 응답으로 바꿀 수 있도록)
+            if not response.get('sent'):
+                send(response['start'])
+                response['sent'] = True
+
+        iterable = self.wsgi_app(environ, start_response)
+        try:
+            for chunk in iterable:
+                if disconnected.is_set():
+                    break
+                if chunk:
+                    start()
+                    send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+            else:
+                start()
+                send({'type': 'http.response.body', 'body': b''})
+        finally:
+            if hasattr(iterable, 'close'):
+                iterable.close()
+
+
+class _RequestTiming:
+    """Flask 경로의 계측(init_metrics)과 같은 값을 기록하기 위한 요청별 시간/쿼리 수"""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.sql_count = 0
+        self.sql_time = 0.0
+
+    async def execute(self, connection, statement, stream=False):
+        started = time.perf_counter()
+        try:
+            if stream:
+                return await connection.stream(statement)
+            return await connection.execute(statement)
+        finally:
+            self.sql_count += 1
+            self.sql_time += time.perf_counter() - started
+
+    def header(self):
+        duration = time.perf_counter() - self.start
+        return (f'app;dur={duration * 1000:.1f}, '
+                f'sql;dur={self.sql_time * 1000:.1f};desc="{self.sql_count} queries"')
+
+
+class _Context:
+    __slots__ = ('request', 'user', 'connection', 'timing')
+
+    def __init__(self, request, user, connection, timing):
+        self.request = request
+        self.user = user
+        self.connection = connection
+        self.timing = timing
+
+
+def _json_error(status, message):
+    return status, dumps({'error': message}), 'application/json', []
+
+
+async def _compress(chunks, encoder):
+    async for chunk in chunks:
+        data = encoder.process(chunk)
+        if data:
+            yield data
+    yield encoder.finish()
+
+
+async def _capture(key, chunks, mimetype, encoding):
+    # ResponseCache.capture의 비동기 버전: 끝까지 전송된 본문만 저장
+    limit = response_cache.max_entry_bytes
+    parts = []
+    size = 0
+    async for chunk in chunks:
+        if parts is not None:
+            size += len(chunk)
+            if size > limit:
+                parts = None
+            else:
+                parts.append(chunk)
+        yield chunk
+    if parts is not None:
+        response_cache.set(key, CachedBody(b''.join(parts), mimetype, encoding))
+
+
+class AsyncAPI:
+    """ASGI 애플리케이션: 비동기 읽기 라우트 + Flask 앱 폴백"""
+
+    def __init__(self, flask_app, engine, shard_engines=()):
+        self.flask_app = flask_app
+        self.config = flask_app.config
+        self.engine = engine
+        self.shard_engines = list(shard_engines)
+        self.executor = ThreadPoolExecutor(self.config.get('ASGI_WSGI_THREADS', 16),
+                                           thread_name_prefix='wsgi')
+        self._session_cookie = self.config['SESSION_COOKIE_NAME']
+        self._session_serializer = flask_app.session_interface.get_signing_serializer(flask_app)
+        self._session_max_age = int(flask_app.permanent_session_lifetime.total_seconds())
+        # 경로 -> (처리 함수, ETag/응답 캐시 적용 여부)
+        self.routes = {
+            '/api/tasks': (self.get_tasks, True),
+            '/api/calendar/events': (self.get_calendar_events, True),
+            '/api/tasks/export': (self.export_tasks, False),
+        }
+        # DB 연결 없이 열려 있는 스트리밍 라우트 (스레드 풀로 넘기면 연결마다 스레드를 점유)
+        self.streams = {'/api/stream': self.stream_events}
+        # 계측 라벨은 Flask 경로(init_metrics)와 같은 라우트 규칙으로 기록한다
+        adapter = flask_app.url_map.bind('localhost')
+        self.route_labels = {path: adapter.match(path, method='GET', return_rule=True)[0].rule
+                             for path in list(self.routes) + list(self.streams)}
+        self.wsgi = _WsgiBridge(flask_app, self.executor)
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            return await self._lifespan(receive, send)
+        path = scope.get('path')
+        native = path in self.routes or path in self.streams
+        if scope['type'] == 'http' and scope['method'] == 'GET' and native:
+            request = self._make_request(scope)
+            user_id = self._session_user_id(request)
+            if user_id is not None:
+                timing = _RequestTiming()
+                user = await self._load_user(user_id, timing)
+                if user is not None:
+                    if path in self.streams:
+                        return await self.streams[path](request, user, timing, receive, send)
+                    return await self._dispatch(path, request, user, timing, receive, send)
+        await self.wsgi(scope, receive, send)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                for engine in [self.engine] + self.shard_engines:
+                    await engine.dispose()
+                self.executor.shutdown(wait=False)
+                password_hasher.shutdown()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    def engine_for(self, user_id):
+        """사용자의 데이터가 있는 DB의 비동기 엔진 (sharding.ShardRouter와 같은 매핑)"""
+        if self.shard_engines:
+            return self.shard_engines[shard_router.shard_for(user_id)]
+        return self.engine
+
+    @staticmethod
+    def _make_request(scope):
+        headers = Headers([(name.decode('latin-1'), value.decode('latin-1'))
+                           for name, value in scope['headers']])
+        client = scope.get('client')
+        return Request(scope['method'], scope.get('scheme', 'http'), scope.get('server'),
+                       scope.get('root_path', ''), scope['path'], scope.get('query_string', b''),
+                       headers, client[0] if client else None)
+
+    def _session_user_id(self, request):
+        """Flask 세션 쿠키를 검증해 Flask-Login의 사용자 id를 꺼낸다 (없으면 None)"""
+        cookie = request.cookies.get(self._session_cookie)
+        if not cookie:
+            return None
+        try:
+            data = self._session_serializer.loads(cookie, max_age=self._session_max_age)
+        except BadSignature:
+            return None
+        try:
+            return int(data.get('_user_id'))
+        except (TypeError, ValueError):
+            return None
+
+    async def _load_user(self, user_id, timing):
+        user, token = user_cache.lookup(user_id)
+        if user is None:
+            async with self.engine_for(user_id).connect() as connection:
+                result = await timing.execute(connection, user_statement(user_id))
+                user = user_cache.store(result.first(), token)
+        elif user_cache.verify_version:
+            async with self.engine_for(user_id).connect() as connection:
+                result = await timing.execute(connection, version_statement(user_id))
+                user = user_cache.refresh(user, result.scalar())
+        return user
+
+    async def _dispatch(self, path, request, user, timing, receive, send):
+        handler, cacheable = self.routes[path]
+        headers = self._cors_headers(request)
+        etag = key = None
+        encoding = choose_encoding(request.accept_encodings, self.config)
+        if cacheable:
+            etag = etag_for(user.id, user.data_version, path, request.args)
+            if request.if_none_match.contains_weak(etag):
+                headers += [('ETag', quote_etag(etag, weak=True)), ('Cache-Control', 'private, no-cache')]
+                return await self._send(path, timing, send, receive, 304, headers, b'', None)
+            if response_cache.enabled:
+                key = cache_key(user.id, user.data_version, path, request.args, encoding)
+                entry = response_cache.get(key)
+                if entry is not None:
+                    headers += self._body_headers(entry.mimetype, entry.encoding, etag)
+                    return await self._send(path, timing, send, receive, 200, headers, entry.body,
+                                            entry.mimetype)
+
+        # 스트리밍 본문을 다 보낼 때까지 연결을 유지
+        async with self.engine_for(user.id).connect() as connection:
+            try:
+                status, body, mimetype, extra_headers = await handler(
+                    _Context(request, user, connection, timing))
+            except Exception as e:
+                status, body, mimetype, extra_headers = _json_error(500, str(e))
+            headers += extra_headers
+            if status != 200:
+                headers.append(('Content-Type', get_content_type(mimetype, 'utf-8')))
+                return await self._send(path, timing, send, receive, status, headers, body, mimetype)
+            if mimetype not in COMPRESSIBLE_MIMETYPES:
+                encoding = None
+
+            if isinstance(body, bytes):
+                if encoding and len(body) >= self.config.get('COMPRESS_MIN_SIZE', 1024):
+                    encoder = make_encoder(encoding, self.config)
+                    body = encoder.process(body) + encoder.finish()
+                else:
+                    encoding = None
+                if key is not None:
+                    response_cache.set(key, CachedBody(body, mimetype, encoding))
+            else:
+                if encoding:
+                    body = _compress(body, make_encoder(encoding, self.config))
+                if key is not None:
+                    body = _capture(key, body, mimetype, encoding)
+            headers += self._body_headers(mimetype, encoding, etag)
+            return await self._send(path, timing, send, receive, 200, headers, body, mimetype)
+
+    def _body_headers(self, mimetype, encoding, etag):
+        headers = [('Content-Type', get_content_type(mimetype, 'utf-8')), ('Vary', 'Accept-Encoding')]
+        if encoding:
+            headers.append(('Content-Encoding', encoding))
+        if etag is not None:
+            headers += [('ETag', quote_etag(etag, weak=True)), ('Cache-Control', 'private, no-cache')]
+        return headers
+
+    @staticmethod
+    def _cors_headers(request):
+        headers = [('Vary', 'Cookie')]
+        origin = request.headers.get('Origin')
+        if origin in CORS_ORIGINS:
+            headers += [('Access-Control-Allow-Origin', origin),
+                        ('Access-Control-Allow-Credentials', 'true'), ('Vary', 'Origin')]
+        return headers
+
+    async def _send(self, path, timing, send, receive, status, headers, body, mimetype):
+        """body는 bytes 또는 bytes 비동기 이터레이터. 클라이언트가 끊으면 스트리밍을 멈춘다"""
+        route = self.route_labels[path]
+        if isinstance(body, bytes):
+            if status != 304:
+                headers = headers + [('Content-Length', str(len(body)))]
+            headers = headers + [('Server-Timing', timing.header())]
+            await send({'type': 'http.response.start', 'status': status, 'headers': _encode(headers)})
+            await send({'type': 'http.response.body', 'body': body})
+            metrics.record_request(route, 'GET', status, time.perf_counter() - timing.start,
+                                   timing.sql_count, timing.sql_time, len(body))
+            return
+
+        # 스트리밍 응답은 헤더를 먼저 보내므로 Server-Timing에는 첫 쿼리까지의 시간만 들어간다
+        headers = headers + [('Server-Timing', timing.header())]
+        await send({'type': 'http.response.start', 'status': status, 'headers': _encode(headers)})
+        disconnected = asyncio.Event()
+        watcher = asyncio.ensure_future(_wait_disconnect(receive, disconnected))
+        try:
+            async for chunk in body:
+                if disconnected.is_set():
+                    break
+                if chunk:
+                    await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+            else:
+                await send({'type': 'http.response.body', 'body': b''})
+        finally:
+            watcher.cancel()
+            await body.aclose()
+        metrics.record_request(route, 'GET', status, time.perf_counter() - timing.start,
+                               timing.sql_count, timing.sql_time, None)
+
+    # 비동기 라우트 (api.py의 같은 경로 뷰와 같은 응답)
+
+    async def get_tasks(self, ctx):
+        try:
+            limit, filters, statements, serialize = task_list_request(ctx.user.id, ctx.request.args)
+        except ValueError as e:
+            return _json_error(400, str(e))
+        # pagination.fetch_page와 같은 방식으로 조회문을 차례로 실행
+        rows = []
+        for statement in statements:
+            result = await ctx.timing.execute(ctx.connection, statement.limit(limit + 1 - len(rows)))
+            rows.extend(result.all())
+            if len(rows) > limit:
+                break
+        rows, has_more = split_page(rows, limit)
+
+        body = (json_open('tasks') + json_items(rows, serialize, True)
+                + json_close({'next_cursor': page_cursor(rows, has_more, filters)}))
+        return 200, body, 'application/json', []
+
+    async def get_calendar_events(self, ctx):
+        statement, serialize = calendar_request(ctx.user.id, ctx.request.args)
+        result = await ctx.timing.execute(ctx.connection, statement, stream=True)
+
+        async def generate():
+            yield json_open('events')
+            first = True
+            async for rows in result.partitions(STREAM_CHUNK_SIZE):
+                yield json_items(rows, serialize, first)
+                first = False
+            yield json_close()
+        return 200, generate(), 'application/json', []
+
+    async def export_tasks(self, ctx):
+        try:
+            fmt, statement, mimetype, headers = export_request(ctx.user.id, ctx.request.args)
+        except ValueError as e:
+            return _json_error(400, str(e))
+        result = await ctx.timing.execute(ctx.connection, statement, stream=True)
+
+        async def generate():
+            header = True
+            async for rows in result.partitions(EXPORT_CHUNK_SIZE):
+                chunks = generate_csv(rows, header) if fmt == 'csv' else generate_ndjson(rows)
+                yield b''.join(chunks)
+                header = False
+            if header and fmt == 'csv':
+                yield b''.join(generate_csv(()))
+        return 200, generate(), mimetype, list(headers.items())
+
+    async def stream_events(self, request, user, timing, receive, send):
+        """api.stream_events와 같은 SSE 응답 (로그인 세션이 없으면 Flask 경로에서 거부됨)"""
+        headers = self._cors_headers(request) + [
+            ('Content-Type', 'text/event-stream; charset=utf-8'),
+            ('Cache-Control', 'no-cache'), ('X-Accel-Buffering', 'no'),
+        ]
+        body = async_event_stream(user.id)
+        return await self._send('/api/stream', timing, send, receive, 200, headers, body,
+                                'text/event-stream')
+
+
+async def _wait_disconnect(receive, disconnected):
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            disconnected.set()
+            return
+
+
+def _encode(headers):
+    return [(name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in headers]
+
+
+def create_asgi_app(test_config=None):
+    """Flask 앱과 같은 DB를 쓰는 비동기 엔진으로 ASGI 애플리케이션을 만든다"""
+    flask_app = create_app(test_config)
+    with flask_app.app_context():
+        url = async_database_url(db.engine.url)
+    engine = create_async_engine(url, **flask_app.config.get('SQLALCHEMY_ENGINE_OPTIONS', {}))
+    register_sqlite_pragmas(engine.sync_engine, flask_app.config)
+    shard_engines = []
+    for shard in shard_router.engines:
+        shard_engine = create_async_engine(async_database_url(shard.url), **engine_options(shard.url))
+        register_sqlite_pragmas(shard_engine.sync_engine, flask_app.config)
+        shard_engines.append(shard_engine)
+    return AsyncAPI(flask_app, engine, shard_engines)
@@ -0,0 +1,151 @@
+from datetime import datetime
+from app import db
+from app.models import Task, apply_completion_deltas, bump_data_version, completion_key, record_tombstones
+from app.validation import validate_task_data
+
+MAX_OPERATIONS = 1000
+OPERATIONS = ('create', 'update', 'toggle', 'delete')
+
+
+class BatchValidationError(ValueError):
+    def __init__(self, errors):
+        super().__init__('일괄 작업 요청이 올바르지 않습니다.')
+        self.errors = errors
+
+
+def prepare_operations(user_id, operations):
+    """모든 작업을 적용 전에 검증하고, 대상 작업의 현재 상태를 한 번에 조회
+
+    하나라도 잘못되면 BatchValidationError를 발생시켜 아무것도 적용하지 않는다.
+    """
+    if not isinstance(operations, list) or not operations:
+        raise BatchValidationError([{'index': None, 'error': 'operations 목록이 필요합니다.'}])
+    if len(operations) > MAX_OPERATIONS:
+        raise BatchValidationError([{'index': None, 'error': f'한 번에 최대 {MAX_OPERATIONS}개까지 처리할 수 있습니다.'}])
+
+    errors = []
+    prepared = []
+    seen_ids = set()
+    for index, operation in enumerate(operations):
+        try:
+            if not isinstance(operation, dict) or operation.get('op') not in OPERATIONS:
+                raise ValueError(f'op는 {", ".join(OPERATIONS)} 중 하나여야 합니다.')
+            op = operation['op']
+            item = {'index': index, 'op': op, 'id': None, 'data': None}
+            if op != 'create':
+                task_id = operation.get('id')
+                if not isinstance(task_id, int) or isinstance(task_id, bool):
+                    raise ValueError('id가 필요합니다.')
+                # 같은 작업에 대한 여러 변경은 순서를 보장할 수 없으므로 거부
+                if task_id in seen_ids:
+                    raise ValueError('같은 작업을 한 번에 여러 번 변경할 수 없습니다.')
+                seen_ids.add(task_id)
+                item['id'] = task_id
+            if op in ('create', 'update'):
+                item['data'] = validate_task_data(operation.get('data') or {}, partial=(op == 'update'))
+            prepared.append(item)
+        except ValueError as e:
+            errors.append({'index': index, 'error': str(e)})
+
+    existing = {}
+    if seen_ids:
+        rows = db.session.query(
+            Task.id, Task.status, Task.completed_at, Task.category
+        ).filter(Task.user_id == user_id, Task.id.in_(seen_ids)).all()
+        existing = {row.id: row for row in rows}
+    for item in prepared:
+        if item['id'] is not None:
+            item['row'] = existing.get(item['id'])
+            if item['row'] is None:
+                errors.append({'index': item['index'], 'error': '작업을 찾을 수 없습니다.'})
+
+    if errors:
+        raise BatchValidationError(sorted(errors, key=lambda e: e['index']))
+    return prepared
+
+
+def apply_operations(user_id, prepared):
+    """검증된 작업을 현재 트랜잭션에서 벌크 INSERT와 집합 단위 UPDATE/DELETE로 적용
+
+    커밋은 호출한 쪽에서 한다. 작업별 결과 목록을 반환한다.
+    """
+    now = datetime.utcnow()
+    connection = db.session.connection()
+    table = Task.__table__
+    deltas = {}
+    revision = bump_data_version(db.session, {user_id})[user_id]
+
+    def add(key, delta):
+        if key is not None:
+            deltas[key] = deltas.get(key, 0) + delta
+
+    creates = [item for item in prepared if item['op'] == 'create']
+    if creates:
+        rows = [dict(item['data'], user_id=user_id, status='pending',
+                     created_at=now, updated_at=now, revision=revision) for item in creates]
+        ids = connection.execute(
+            table.insert().returning(table.c.id, sort_by_parameter_order=True), rows
+        ).scalars().all()
+        for item, task_id in zip(creates, ids):
+            item['id'] = task_id
+
+    # 같은 값으로 수정하는 작업끼리 묶어 UPDATE ... WHERE id IN (...) 한 번으로 처리
+    update_groups = {}
+    for item in prepared:
+        if item['op'] == 'update':
+            key = tuple(sorted(item['data'].items()))
+            update_groups.setdefault(key, []).append(item)
+            row = item['row']
+            new_category = item['data'].get('category', row.category)
+            if new_category != row.category:
+                add(completion_key(user_id, row.status, row.completed_at, row.category), -1)
+                add(completion_key(user_id, row.status, row.completed_at, new_category), 1)
+    for values, items in update_groups.items():
+        connection.execute(
+            table.update()
+            .where(table.c.user_id == user_id, table.c.id.in_([item['id'] for item in items]))
+            .values(dict(values, updated_at=now, revision=revision))
+        )
+
+    toggles = [item for item in prepared if item['op'] == 'toggle']
+    to_pending = [item['id'] for item in toggles if item['row'].status == 'completed']
+    to_completed = [item['id'] for item in toggles if item['row'].status != 'completed']
+    for item in toggles:
+        row = item['row']
+        add(completion_key(user_id, row.status, row.completed_at, row.category), -1)
+        if row.status != 'completed':
+            add(completion_key(user_id, 'completed', now, row.category), 1)
+    if to_pending:
+        connection.execute(
+            table.update()
+            .where(table.c.user_id == user_id, table.c.id.in_(to_pending))
+            .values(status='pending', completed_at=None, revision=revision)
+        )
+    if to_completed:
+        connection.execute(
+            table.update()
+            .where(table.c.user_id == user_id, table.c.id.in_(to_completed))
+            .values(status='completed', completed_at=now, revision=revision)
+        )
+
+    deletes = [item for item in prepared if item['op'] == 'delete']
+    for item in deletes:
+        row = item['row']
+        add(completion_key(user_id, row.status, row.completed_at, row.category), -1)
+    if deletes:
+        deleted_ids = [item['id'] for item in deletes]
+        connection.execute(
+            table.delete()
+            .where(table.c.user_id == user_id, table.c.id.in_(deleted_ids))
+        )
+        record_tombstones(connection, user_id, deleted_ids, revision)
+
+    apply_completion_deltas(connection, deltas)
+
+    results = []
+    for item in prepared:
+        result = {'index': item['index'], 'op': item['op'], 'id': item['id']}
+        if item['op'] == 'toggle':
+            result['status'] = 'pending' if item['row'].status == 'completed' else 'completed'
+        results.append(result)
+    return results
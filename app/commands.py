@@ -0,0 +1,118 @@
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from app import db
+from app.archive import archive_completed_tasks
+from app.migrations import check_query_plans, rebuild_daily_completions, upgrade
+from app.sharding import rebalance, shard_router, shard_summary
+from app.sync import compact_tombstones
+from app.user_cache import user_cache
+
+
+def database_engines():
+    """기본 DB와 샤드 DB 엔진 목록 (샤딩을 쓰지 않으면 기본 DB만)"""
+    return [db.engine] + shard_router.engines
+
+
+def _name(engine):
+    return f'[{engine.url.render_as_string(hide_password=True)}]'
+
+
+@click.command('db-upgrade')
+@with_appcontext
+def db_upgrade_command():
+    """적용되지 않은 스키마 마이그레이션을 실행"""
+    for engine in database_engines():
+        applied = upgrade(engine)
+        click.echo(f'{_name(engine)} 적용된 마이그레이션: {applied}' if applied
+                   else f'{_name(engine)} 이미 최신 스키마입니다.')
+
+
+@click.command('check-query-plans')
+@with_appcontext
+def check_query_plans_command():
+    """핫 쿼리가 인덱스를 사용하는지 확인하고, 아니면 실패 코드로 종료"""
+    if db.engine.dialect.name != 'sqlite':
+        click.echo('실행계획 검사는 SQLite에서만 지원합니다.')
+        return
+    failures = [failure for engine in database_engines() for failure in check_query_plans(engine)]
+    for name, plan in failures:
+        click.echo(f'[FAIL] {name}: {" / ".join(plan)}', err=True)
+    if failures:
+        raise SystemExit(1)
+    click.echo('모든 핫 쿼리가 인덱스를 사용합니다.')
+
+
+@click.command('backfill-daily-completions')
+@with_appcontext
+def backfill_daily_completions_command():
+    """완료된 작업(보관된 작업 포함)으로부터 잔디 캘린더 집계 테이블을 다시 생성"""
+    for engine in database_engines():
+        rebuild_daily_completions(engine)
+    click.echo('일별 완료 집계를 다시 생성했습니다.')
+
+
+@click.command('compact-tombstones')
+@click.option('--days', type=int, default=None, help='보관 기간(일), 기본값은 SYNC_TOMBSTONE_RETENTION_DAYS')
+@with_appcontext
+def compact_tombstones_command(days):
+    """보관 기간이 지난 증분 동기화 삭제 기록을 정리 (cron 등으로 주기적으로 실행)"""
+    if days is None:
+        days = current_app.config['SYNC_TOMBSTONE_RETENTION_DAYS']
+    removed = sum(compact_tombstones(engine, days) for engine in database_engines())
+    click.echo(f'삭제 기록 {removed}개를 정리했습니다.')
+
+
+@click.command('archive-tasks')
+@click.option('--days', type=int, default=None, help='완료 후 경과 일수, 기본값은 ARCHIVE_AFTER_DAYS')
+@with_appcontext
+def archive_tasks_command(days):
+    """완료 후 오래 지난 작업을 보관 테이블로 옮김 (cron 등으로 주기적으로 실행)"""
+    config = current_app.config
+    if days is None:
+        days = config['ARCHIVE_AFTER_DAYS']
+    if days < 1:
+        raise click.UsageError('--days는 1 이상이어야 합니다.')
+    total = 0
+    for engine in database_engines():
+        moved = archive_completed_tasks(engine, days, config['ARCHIVE_BATCH_SIZE'],
+                                        config['ARCHIVE_BATCH_PAUSE_MS'] / 1000)
+        user_cache.invalidate(list(moved))
+        total += sum(moved.values())
+    click.echo(f'작업 {total}개를 보관했습니다.')
+
+
+@click.command('shards-status')
+@with_appcontext
+def shards_status_command():
+    """샤드별 사용자/작업 수를 출력"""
+    if not shard_router.enabled:
+        click.echo('샤딩을 사용하지 않습니다. (SHARD_DATABASE_URLS)')
+        return
+    for index, url, users, tasks in shard_summary():
+        click.echo(f'[{index}] {url}: 사용자 {users}명, 작업 {tasks}개')
+
+
+@click.command('shards-rebalance')
+@click.option('--previous-count', type=int, required=True,
+              help='이전 샤드 수 (0이면 샤딩 전 기본 DB에서 각 샤드로 이동)')
+@with_appcontext
+def shards_rebalance_command(previous_count):
+    """샤드 수 변경 후 샤드가 바뀐 사용자의 데이터를 옮김 (쓰기를 멈춘 상태에서 실행)"""
+    if not shard_router.enabled:
+        raise click.UsageError('SHARD_DATABASE_URLS가 설정되어 있지 않습니다.')
+    if not 0 <= previous_count <= len(shard_router.engines):
+        raise click.UsageError('샤드 URL 목록은 뒤에 추가하는 방식으로만 늘릴 수 있습니다.')
+    moved = rebalance(db.engine, previous_count)
+    user_cache.invalidate(moved)
+    click.echo(f'사용자 {len(moved)}명의 데이터를 옮겼습니다.')
+
+
+def register_commands(app):
+    app.cli.add_command(db_upgrade_command)
+    app.cli.add_command(check_query_plans_command)
+    app.cli.add_command(backfill_daily_completions_command)
+    app.cli.add_command(compact_tombstones_command)
+    app.cli.add_command(archive_tasks_command)
+    app.cli.add_command(shards_status_command)
+    app.cli.add_command(shards_rebalance_command)
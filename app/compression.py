@@ -0,0 +1,113 @@
+import zlib
+from flask import current_app, request
+
+try:
+    import brotli
+except ImportError:  # brotli가 없으면 gzip만 사용
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = {
+    'application/json', 'application/x-ndjson', 'text/csv', 'text/plain', 'text/html',
+}
+
+
+def available_encodings(config):
+    configured = config.get('COMPRESS_ALGORITHMS', 'br,gzip') or ''
+    names = [name.strip() for name in configured.split(',') if name.strip()]
+    return [name for name in names if name == 'gzip' or (name == 'br' and brotli is not None)]
+
+
+def choose_encoding(accept_encodings, config):
+    """Accept-Encoding과 설정된 알고리즘 중 가장 알맞은 것 ('br', 'gzip' 또는 None)"""
+    encodings = available_encodings(config)
+    if not encodings:
+        return None
+    return accept_encodings.best_match(encodings)
+
+
+def negotiate_encoding():
+    return choose_encoding(request.accept_encodings, current_app.config)
+
+
+class _GzipEncoder:
+    def __init__(self, level):
+        # wbits 16 + MAX_WBITS: gzip 헤더/트레일러를 붙인 스트림
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def process(self, data):
+        return self._compressor.compress(data)
+
+    def finish(self):
+        return self._compressor.flush()
+
+
+class _BrotliEncoder:
+    def __init__(self, quality):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def process(self, data):
+        return self._compressor.process(data)
+
+    def finish(self):
+        return self._compressor.finish()
+
+
+def make_encoder(encoding, config):
+    if encoding == 'br':
+        return _BrotliEncoder(config.get('COMPRESS_BROTLI_QUALITY', 4))
+    return _GzipEncoder(config.get('COMPRESS_LEVEL', 6))
+
+
+def compress_bytes(data, encoding, config):
+    encoder = make_encoder(encoding, config)
+    return encoder.process(data) + encoder.finish()
+
+
+def compress_stream(chunks, encoder):
+    for chunk in chunks:
+        data = encoder.process(chunk)
+        if data:
+            yield data
+    yield encoder.finish()
+
+
+def is_compressible(response):
+    return (response.status_code == 200
+            and response.mimetype in COMPRESSIBLE_MIMETYPES
+            and 'Content-Encoding' not in response.headers
+            and not response.direct_passthrough)
+
+
+def compress_response(response, encoding):
+    """응답 본문을 encoding으로 압축 (스트리밍 응답은 청크 단위로 압축)
+
+    크기를 미리 아는 응답은 COMPRESS_MIN_SIZE보다 작으면 압축하지 않는다.
+    스트리밍 응답은 헤더를 먼저 보내야 하므로 크기와 관계없이 압축한다.
+    """
+    if not is_compressible(response):
+        return response
+    response.vary.add('Accept-Encoding')
+    if encoding is None or request.method == 'HEAD':
+        return response
+    if response.is_streamed:
+        response.response = compress_stream(response.iter_encoded(), make_encoder(encoding, current_app.config))
+        response.headers.pop('Content-Length', None)
+    else:
+        data = response.get_data()
+        if len(data) < current_app.config.get('COMPRESS_MIN_SIZE', 1024):
+            return response
+        response.set_data(compress_bytes(data, encoding, current_app.config))
+    response.headers['Content-Encoding'] = encoding
+    return response
+
+
+def _compress_after_request(response):
+    if is_compressible(response):
+        return compress_response(response, negotiate_encoding())
+    return response
+
+
+def init_compression(app):
+    """응답 압축 after_request 훅 등록 (COMPRESS_ALGORITHMS가 비어 있으면 끔)"""
+    if app.config.get('COMPRESS_ALGORITHMS'):
+        app.after_request(_compress_after_request)
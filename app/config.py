@@ -0,0 +1,150 @@
+import os
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+
+def _env_int(name, default):
+    value = os.environ.get(name)
+    return int(value) if value not in (None, '') else default
+
+
+def _env_bool(name, default):
+    value = os.environ.get(name)
+    if value in (None, ''):
+        return default
+    return value.lower() in ('1', 'true', 'yes', 'on')
+
+
+def database_url():
+    """DATABASE_URL 환경변수 (없으면 instance 폴더의 SQLite 파일)"""
+    url = os.environ.get('DATABASE_URL', 'sqlite:///todolist.db')
+    # Heroku 등에서 쓰는 postgres:// 스킴은 SQLAlchemy가 인식하지 못함
+    if url.startswith('postgres://'):
+        url = 'postgresql://' + url[len('postgres://'):]
+    return url
+
+
+def engine_options(url):
+    """DB 종류에 맞는 SQLAlchemy 엔진 옵션 (풀 크기, pre-ping 등)"""
+    options = {'pool_pre_ping': _env_bool('DB_POOL_PRE_PING', True)}
+    if _env_int('DB_POOL_RECYCLE', 0):
+        options['pool_recycle'] = _env_int('DB_POOL_RECYCLE', 0)
+    # 메모리 SQLite는 단일 연결(StaticPool)이라 풀 크기 옵션을 받지 않음
+    if not is_memory_sqlite(url):
+        options['pool_size'] = _env_int('DB_POOL_SIZE', 5)
+        options['max_overflow'] = _env_int('DB_MAX_OVERFLOW', 10)
+        options['pool_timeout'] = _env_int('DB_POOL_TIMEOUT', 30)
+    return options
+
+
+def _env_list(name):
+    return [item.strip() for item in os.environ.get(name, '').split(',') if item.strip()]
+
+
+def build_config(overrides=None):
+    """환경변수로부터 Flask/SQLAlchemy 설정 dict를 만든다 (overrides가 우선)"""
+    overrides = dict(overrides or {})
+    url = overrides.get('SQLALCHEMY_DATABASE_URI') or database_url()
+    config = {
+        'SECRET_KEY': os.environ.get('SECRET_KEY', 'your-secret-key-here'),
+        'SQLALCHEMY_DATABASE_URI': url,
+        'SQLALCHEMY_TRACK_MODIFICATIONS': False,
+        'SQLALCHEMY_ENGINE_OPTIONS': engine_options(url),
+        # SQLite 연결마다 적용할 PRAGMA (빈 값이면 적용하지 않음)
+        'SQLITE_JOURNAL_MODE': os.environ.get('SQLITE_JOURNAL_MODE', 'WAL'),
+        'SQLITE_SYNCHRONOUS': os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL'),
+        'SQLITE_BUSY_TIMEOUT_MS': _env_int('SQLITE_BUSY_TIMEOUT_MS', 5000),
+        'SQLITE_MMAP_SIZE': _env_int('SQLITE_MMAP_SIZE', 256 * 1024 * 1024),
+        'SQLITE_CACHE_SIZE': _env_int('SQLITE_CACHE_SIZE', -64000),  # 음수는 KiB 단위
+        # 로그인 사용자 캐시 (Redis URL이 없으면 워커별 캐시라 적중해도 data_version은 DB에서 확인)
+        'USER_CACHE_TTL': _env_int('USER_CACHE_TTL', 60),
+        'USER_CACHE_MAX_ENTRIES': _env_int('USER_CACHE_MAX_ENTRIES', 10000),
+        'USER_CACHE_REDIS_URL': os.environ.get('USER_CACHE_REDIS_URL'),
+        # 작업 변경 이벤트(SSE) 브로커 (없으면 프로세스 내 pub/sub)
+        'EVENT_BROKER_URL': os.environ.get('EVENT_BROKER_URL'),
+        # 계측: 느린 쿼리 로그 기준(ms, 0이면 끔), N+1 감지, /metrics 접근 토큰
+        # (토큰이 없으면 localhost에서만 볼 수 있고, METRICS_PUBLIC을 켜면 제한 없음)
+        'SLOW_QUERY_MS': _env_int('SLOW_QUERY_MS', 0),
+        'DETECT_N_PLUS_ONE': _env_bool('DETECT_N_PLUS_ONE', False),
+        'N_PLUS_ONE_THRESHOLD': _env_int('N_PLUS_ONE_THRESHOLD', 5),
+        'METRICS_TOKEN': os.environ.get('METRICS_TOKEN'),
+        'METRICS_PUBLIC': _env_bool('METRICS_PUBLIC', False),
+        # 비밀번호 해시: 방식(없으면 Werkzeug 기본값), 프로세스 풀 크기(0이면 요청 스레드에서 계산),
+        # 대기 한도와 제한 시간. 한도를 넘으면 503 + Retry-After
+        'PASSWORD_HASH_METHOD': os.environ.get('PASSWORD_HASH_METHOD') or None,
+        'PASSWORD_HASH_WORKERS': _env_int('PASSWORD_HASH_WORKERS', 2),
+        'PASSWORD_HASH_QUEUE': _env_int('PASSWORD_HASH_QUEUE', 16),
+        'PASSWORD_HASH_TIMEOUT': _env_int('PASSWORD_HASH_TIMEOUT', 10),
+        'PASSWORD_HASH_RETRY_AFTER': _env_int('PASSWORD_HASH_RETRY_AFTER', 1),
+        # 로그인 시도 제한 토큰 버킷 (버스트 크기, 토큰 하나가 채워지는 초; 버스트 0이면 끔)
+        'LOGIN_USER_BURST': _env_int('LOGIN_USER_BURST', 5),
+        'LOGIN_USER_REFILL_SECONDS': _env_int('LOGIN_USER_REFILL_SECONDS', 12),
+        'LOGIN_IP_BURST': _env_int('LOGIN_IP_BURST', 20),
+        'LOGIN_IP_REFILL_SECONDS': _env_int('LOGIN_IP_REFILL_SECONDS', 3),
+        # 응답 압축 (br은 brotli 패키지가 있을 때만; 빈 값이면 끔)과 압축 수준, 최소 크기(bytes)
+        'COMPRESS_ALGORITHMS': os.environ.get('COMPRESS_ALGORITHMS', 'br,gzip'),
+        'COMPRESS_LEVEL': _env_int('COMPRESS_LEVEL', 6),
+        'COMPRESS_BROTLI_QUALITY': _env_int('COMPRESS_BROTLI_QUALITY', 4),
+        'COMPRESS_MIN_SIZE': _env_int('COMPRESS_MIN_SIZE', 1024),
+        # 압축된 목록 응답 캐시의 전체/항목당 최대 크기 (bytes, 0이면 끔)
+        'RESPONSE_CACHE_MAX_BYTES': _env_int('RESPONSE_CACHE_MAX_BYTES', 64 * 1024 * 1024),
+        'RESPONSE_CACHE_MAX_ENTRY_BYTES': _env_int('RESPONSE_CACHE_MAX_ENTRY_BYTES', 4 * 1024 * 1024),
+        # 같은 (사용자, data_version, 경로, 쿼리)의 동시 읽기 요청을 한 번만 계산 (single-flight):
+        # 완료 후 결과 재사용 시간(ms), 테이블 최대 항목 수(0이면 끔), 공유할 본문 최대 크기, 대기 제한(초)
+        'SINGLE_FLIGHT_WINDOW_MS': _env_int('SINGLE_FLIGHT_WINDOW_MS', 500),
+        'SINGLE_FLIGHT_MAX_ENTRIES': _env_int('SINGLE_FLIGHT_MAX_ENTRIES', 512),
+        'SINGLE_FLIGHT_MAX_ENTRY_BYTES': _env_int('SINGLE_FLIGHT_MAX_ENTRY_BYTES', 512 * 1024),
+        'SINGLE_FLIGHT_TIMEOUT': _env_int('SINGLE_FLIGHT_TIMEOUT', 10),
+        # 사용자별 샤드 DB URL 목록 (쉼표 구분, 비어 있으면 샤딩하지 않음). 뒤에 추가하는 방식으로만
+        # 늘리고 shards-rebalance를 실행한다. PostgreSQL 스키마는 ?options=-csearch_path%3D<스키마>로 지정
+        'SHARD_DATABASE_URLS': _env_list('SHARD_DATABASE_URLS'),
+        # 증분 동기화 삭제 기록 보관 기간 (compact-tombstones 명령이 이보다 오래된 기록을 정리)
+        'SYNC_TOMBSTONE_RETENTION_DAYS': _env_int('SYNC_TOMBSTONE_RETENTION_DAYS', 30),
+        # 완료 후 이 일수가 지난 작업을 보관 테이블로 옮김 (archive-tasks 명령), 배치 크기와 배치 사이 대기(ms)
+        'ARCHIVE_AFTER_DAYS': _env_int('ARCHIVE_AFTER_DAYS', 180),
+        'ARCHIVE_BATCH_SIZE': _env_int('ARCHIVE_BATCH_SIZE', 500),
+        'ARCHIVE_BATCH_PAUSE_MS': _env_int('ARCHIVE_BATCH_PAUSE_MS', 50),
+        # ASGI 모드에서 비동기로 옮기지 않은 라우트(쓰기, SSE 등)를 실행할 스레드 수
+        'ASGI_WSGI_THREADS': _env_int('ASGI_WSGI_THREADS', 16),
+    }
+    config.update(overrides)
+    return config
+
+
+def is_memory_sqlite(url):
+    url = make_url(url)
+    return url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:')
+
+
+def sqlite_pragmas(config):
+    """설정값으로 연결 시 실행할 PRAGMA 문 목록을 만든다"""
+    pragmas = []
+    if config.get('SQLITE_BUSY_TIMEOUT_MS'):
+        pragmas.append(f"PRAGMA busy_timeout = {int(config['SQLITE_BUSY_TIMEOUT_MS'])}")
+    if config.get('SQLITE_JOURNAL_MODE'):
+        pragmas.append(f"PRAGMA journal_mode = {config['SQLITE_JOURNAL_MODE']}")
+    if config.get('SQLITE_SYNCHRONOUS'):
+        pragmas.append(f"PRAGMA synchronous = {config['SQLITE_SYNCHRONOUS']}")
+    if config.get('SQLITE_MMAP_SIZE'):
+        pragmas.append(f"PRAGMA mmap_size = {int(config['SQLITE_MMAP_SIZE'])}")
+    if config.get('SQLITE_CACHE_SIZE'):
+        pragmas.append(f"PRAGMA cache_size = {int(config['SQLITE_CACHE_SIZE'])}")
+    return pragmas
+
+
+def register_sqlite_pragmas(engine, config):
+    """SQLite 엔진이면 새 연결마다 PRAGMA를 적용하는 connect 이벤트를 등록"""
+    if engine.dialect.name != 'sqlite':
+        return
+    pragmas = sqlite_pragmas(config)
+    if not pragmas:
+        return
+
+    @event.listens_for(engine, 'connect')
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
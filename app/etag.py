@@ -0,0 +1,40 @@
+import hashlib
+from datetime import date
+from functools import wraps
+from flask import request, make_response
+from flask_login import current_user
+
+
+def etag_for(user_id, version, path, args):
+    """사용자 데이터 버전과 요청 경로/쿼리 파라미터로 약한 ETag 생성
+
+    오늘 완료 개수처럼 날짜에 따라 바뀌는 값이 있으므로 날짜도 포함한다.
+    """
+    params = '&'.join(f'{k}={v}' for k, v in sorted(args.items(multi=True)))
+    key = f'{date.today().isoformat()}:{path}?{params}'
+    digest = hashlib.sha1(key.encode()).hexdigest()[:16]
+    return f'{user_id}-{version}-{digest}'
+
+
+def compute_etag(user_id, version):
+    return etag_for(user_id, version, request.path, request.args)
+
+
+def conditional(view):
+    """If-None-Match가 현재 ETag와 같으면 DB 조회 없이 304를 반환하는 읽기 라우트용 데코레이터
+
+    login_required 아래에 적용해야 한다.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        etag = compute_etag(current_user.id, current_user.data_version)
+        if request.if_none_match.contains_weak(etag):
+            response = make_response('', 304)
+        else:
+            response = make_response(view(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+        response.set_etag(etag, weak=True)
+        response.headers['Cache-Control'] = 'private, no-cache'
+        return response
+    return wrapper
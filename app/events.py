@@ -0,0 +1,217 @@
+import asyncio
+import itertools
+import json
+import queue
+import threading
+
+from app.serializers import dumps
+
+SUBSCRIBER_QUEUE_SIZE = 100
+HEARTBEAT_SECONDS = 15
+RECONNECT_MS = 3000
+
+
+class Subscription:
+    """한 SSE 연결이 받는 이벤트 큐
+
+    큐가 가득 차면(느린 클라이언트) 이벤트를 버리고 resync 이벤트 하나만 남겨
+    클라이언트가 전체를 다시 불러오도록 한다. 큐는 gevent 몽키패치 환경에서도 협조적으로 동작한다.
+    """
+
+    def __init__(self, user_id, maxsize=SUBSCRIBER_QUEUE_SIZE):
+        self.user_id = user_id
+        self.queue = queue.Queue(maxsize=maxsize)
+
+    def put(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except queue.Full:
+            with self.queue.mutex:
+                self.queue.queue.clear()
+            self.queue.put_nowait({'event': 'resync', 'data': {}})
+
+    def get(self, timeout):
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+class AsyncSubscription:
+    """이벤트 루프에서 기다리는 SSE 연결의 큐 (ASGI 모드)
+
+    발행은 요청 스레드나 Redis 수신 스레드에서 일어나므로 put은 루프에 넘겨서 넣는다.
+    가득 찼을 때의 동작은 Subscription과 같다.
+    """
+
+    def __init__(self, user_id, loop, maxsize=SUBSCRIBER_QUEUE_SIZE):
+        self.user_id = user_id
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=maxsize)
+
+    def put(self, event):
+        try:
+            self.loop.call_soon_threadsafe(self._put, event)
+        except RuntimeError:
+            pass  # 루프가 이미 닫힘 (종료 중)
+
+    def _put(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait({'event': 'resync', 'data': {}})
+
+    async def get(self, timeout):
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class LocalBroker:
+    """프로세스 내 pub/sub (단일 프로세스 배포나 테스트용)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = {}
+
+    def subscribe(self, subscription):
+        with self._lock:
+            self._subscribers.setdefault(subscription.user_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.user_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.user_id]
+
+    def publish(self, user_id, event):
+        with self._lock:
+            subscribers = list(self._subscribers.get(user_id, ()))
+        for subscription in subscribers:
+            subscription.put(event)
+
+    def connection_count(self):
+        with self._lock:
+            return sum(len(subscribers) for subscribers in self._subscribers.values())
+
+
+class RedisBroker(LocalBroker):
+    """Redis pub/sub으로 워커 간 이벤트를 전달하는 브로커
+
+    발행은 Redis 채널로 보내고, 백그라운드 스레드 하나가 모든 사용자 채널을 구독해
+    이 프로세스의 연결들에 나눠 준다.
+    """
+
+    CHANNEL_PREFIX = 'todolist:events:'
+
+    def __init__(self, client):
+        super().__init__()
+        self.client = client
+        self._pubsub = client.pubsub(ignore_subscribe_messages=True)
+        self._pubsub.psubscribe(**{f'{self.CHANNEL_PREFIX}*': self._on_message})
+        self._thread = self._pubsub.run_in_thread(sleep_time=1, daemon=True)
+
+    @classmethod
+    def from_url(cls, url):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError('EVENT_BROKER_URL을 사용하려면 redis 패키지가 필요합니다.')
+        return cls(redis.Redis.from_url(url))
+
+    def _on_message(self, message):
+        channel = message['channel']
+        if isinstance(channel, bytes):
+            channel = channel.decode()
+        user_id = int(channel[len(self.CHANNEL_PREFIX):])
+        super().publish(user_id, json.loads(message['data']))
+
+    def publish(self, user_id, event):
+        self.client.publish(f'{self.CHANNEL_PREFIX}{user_id}', dumps(event))
+
+
+class EventBus:
+    def __init__(self, broker=None):
+        self.broker = broker or LocalBroker()
+        self._ids = itertools.count(1)
+
+    def configure(self, broker):
+        self.broker = broker
+
+    def publish(self, user_id, event, data):
+        self.broker.publish(user_id, {'id': next(self._ids), 'event': event, 'data': data})
+
+    def subscribe(self, user_id):
+        return self.broker.subscribe(Subscription(user_id))
+
+    def subscribe_async(self, user_id):
+        """현재 이벤트 루프에서 기다리는 구독 (ASGI 모드의 SSE)"""
+        return self.broker.subscribe(AsyncSubscription(user_id, asyncio.get_running_loop()))
+
+    def unsubscribe(self, subscription):
+        self.broker.unsubscribe(subscription)
+
+
+event_bus = EventBus()
+
+
+def configure_event_bus(app):
+    """EVENT_BROKER_URL이 있으면 Redis 브로커, 없으면 프로세스 내 브로커를 사용"""
+    if app.config.get('EVENT_BROKER_URL'):
+        event_bus.configure(RedisBroker.from_url(app.config['EVENT_BROKER_URL']))
+    app.extensions['event_bus'] = event_bus
+
+
+def publish_task_event(user_id, event, task=None, statistics_delta=None):
+    """작업 변경 이벤트 발행 (커밋 후 호출)"""
+    data = {}
+    if task is not None:
+        data['task'] = task
+    if statistics_delta is not None:
+        data['statistics_delta'] = statistics_delta
+    event_bus.publish(user_id, event, data)
+
+
+def format_sse(event):
+    """이벤트 dict를 text/event-stream 형식 bytes로 변환"""
+    lines = []
+    if event.get('id') is not None:
+        lines.append(f'id: {event["id"]}')
+    lines.append(f'event: {event["event"]}')
+    return ('\n'.join(lines) + '\ndata: ').encode() + dumps(event['data']) + b'\n\n'
+
+
+def event_stream(user_id, heartbeat=HEARTBEAT_SECONDS):
+    """사용자의 이벤트를 SSE로 내보내는 제너레이터 (연결이 끊기면 구독 해제)
+
+    구독은 서버가 본문을 읽기 시작할 때 만든다. 본문을 한 번도 읽지 않고 닫으면
+    제너레이터의 finally가 실행되지 않으므로, 미리 구독해 두면 그대로 남는다.
+    DB 세션이나 요청 컨텍스트를 잡고 있지 않으므로 연결 하나의 비용은 큐 하나와
+    (gevent 워커에서는) 그린렛 하나 정도이다.
+    """
+    subscription = event_bus.subscribe(user_id)
+    try:
+        yield f'retry: {RECONNECT_MS}\n\n'.encode()
+        while True:
+            event = subscription.get(timeout=heartbeat)
+            yield b': ping\n\n' if event is None else format_sse(event)
+    finally:
+        event_bus.unsubscribe(subscription)
+
+
+async def async_event_stream(user_id, heartbeat=HEARTBEAT_SECONDS):
+    """event_stream의 비동기 버전 (ASGI 모드에서 스레드 없이 이벤트 루프에서 대기)"""
+    subscription = event_bus.subscribe_async(user_id)
+    try:
+        yield f'retry: {RECONNECT_MS}\n\n'.encode()
+        while True:
+            event = await subscription.get(heartbeat)
+            yield b': ping\n\n' if event is None else format_sse(event)
+    finally:
+        event_bus.unsubscribe(subscription)
@@ -0,0 +1,250 @@
+import ipaddress
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from flask import Response, current_app, g, has_request_context, request
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+SQL_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+_NUMBER_PATTERN = re.compile(r'\b\d+\b')
+_PARAMS_PATTERN = re.compile(r'\((\?(, )?)+\)')
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    body = ','.join('{}="{}"'.format(name, str(value).replace('\\', '\\\\').replace('"', '\\"'))
+                    for name, value in labels)
+    return '{' + body + '}'
+
+
+class Histogram:
+    def __init__(self, name, help_text, buckets):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = buckets
+        self._series = {}
+
+    def observe(self, labels, value):
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = {'counts': [0] * len(self.buckets), 'sum': 0.0, 'count': 0}
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                series['counts'][index] += 1
+        series['sum'] += value
+        series['count'] += 1
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} histogram']
+        for labels, series in sorted(self._series.items()):
+            for bound, count in zip(self.buckets, series['counts']):
+                lines.append(f'{self.name}_bucket{_format_labels(labels + (("le", bound),))} {count}')
+            lines.append(f'{self.name}_bucket{_format_labels(labels + (("le", "+Inf"),))} {series["count"]}')
+            lines.append(f'{self.name}_sum{_format_labels(labels)} {series["sum"]}')
+            lines.append(f'{self.name}_count{_format_labels(labels)} {series["count"]}')
+        return lines
+
+
+class CounterMetric:
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help_text = help_text
+        self._values = {}
+
+    def inc(self, labels, amount=1):
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} counter']
+        for labels, value in sorted(self._values.items()):
+            lines.append(f'{self.name}{_format_labels(labels)} {value}')
+        return lines
+
+
+class MetricsRegistry:
+    """요청별 지연 시간, SQL 횟수/시간, 응답 크기를 모으는 프로세스 내 레지스트리"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.request_latency = Histogram(
+            'todolist_request_duration_seconds', '라우트별 요청 처리 시간', LATENCY_BUCKETS)
+        self.sql_count = Histogram(
+            'todolist_request_sql_statements', '요청당 실행한 SQL 문 수', SQL_COUNT_BUCKETS)
+        self.sql_time = Histogram(
+            'todolist_request_sql_duration_seconds', '요청당 SQL 실행 시간 합계', LATENCY_BUCKETS)
+        self.response_size = Histogram(
+            'todolist_response_size_bytes', '응답 본문 크기 (스트리밍 응답 제외)', SIZE_BUCKETS)
+        self.requests = CounterMetric('todolist_requests_total', '라우트/상태 코드별 요청 수')
+        self.slow_queries = CounterMetric('todolist_slow_queries_total', '느린 쿼리 수')
+        self.n_plus_one = CounterMetric('todolist_n_plus_one_total', 'N+1 의심 패턴이 감지된 요청 수')
+        self._callbacks = []
+
+    def add_gauge(self, name, help_text, getter):
+        """렌더링할 때 값을 읽는 게이지 (SSE 연결 수, 캐시 크기 등 오르내리는 값)"""
+        self._add_callback(name, help_text, 'gauge', getter)
+
+    def add_counter(self, name, help_text, getter):
+        """렌더링할 때 값을 읽는 누적 카운터 (캐시 적중 수 등 늘기만 하는 값, 이름은 _total로 끝남)"""
+        self._add_callback(name, help_text, 'counter', getter)
+
+    def _add_callback(self, name, help_text, kind, getter):
+        self._callbacks = [callback for callback in self._callbacks if callback[0] != name]
+        self._callbacks.append((name, help_text, kind, getter))
+
+    def record_request(self, route, method, status, duration, sql_count, sql_time, size):
+        with self._lock:
+            labels = (('method', method), ('route', route))
+            self.request_latency.observe(labels, duration)
+            self.sql_count.observe(labels, sql_count)
+            self.sql_time.observe(labels, sql_time)
+            if size is not None:
+                self.response_size.observe(labels, size)
+            self.requests.inc(labels + (('status', status),))
+
+    def inc(self, metric, labels):
+        with self._lock:
+            metric.inc(labels)
+
+    def render(self):
+        with self._lock:
+            lines = []
+            for metric in (self.requests, self.request_latency, self.sql_count, self.sql_time,
+                           self.response_size, self.slow_queries, self.n_plus_one):
+                lines.extend(metric.render())
+        for name, help_text, kind, getter in self._callbacks:
+            lines.extend([f'# HELP {name} {help_text}', f'# TYPE {name} {kind}', f'{name} {getter()}'])
+        return '\n'.join(lines) + '\n'
+
+
+metrics = MetricsRegistry()
+
+
+def normalize_statement(statement):
+    """N+1 감지용으로 리터럴과 IN 목록을 지운 SQL 형태"""
+    statement = _PARAMS_PATTERN.sub('(?)', statement)
+    return _NUMBER_PATTERN.sub('?', ' '.join(statement.split()))
+
+
+def _current_route():
+    rule = request.url_rule
+    return rule.rule if rule is not None else 'unmatched'
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._metrics_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start = getattr(context, '_metrics_start', None)
+    if start is None or not has_request_context():
+        return
+    elapsed = time.perf_counter() - start
+    stats = g.get('_request_metrics')
+    if stats is None:
+        return
+    stats['sql_count'] += 1
+    stats['sql_time'] += elapsed
+    if stats['detect_n_plus_one']:
+        stats['statements'][normalize_statement(statement)] += 1
+    slow_ms = stats['slow_query_ms']
+    if slow_ms and elapsed * 1000 >= slow_ms:
+        metrics.inc(metrics.slow_queries, (('route', _current_route()),))
+        logger.warning('느린 쿼리 %.1fms [%s] %s', elapsed * 1000, _current_route(), ' '.join(statement.split()))
+
+
+def _start_request():
+    g._request_metrics = {
+        'start': time.perf_counter(),
+        'sql_count': 0,
+        'sql_time': 0.0,
+        'slow_query_ms': current_app.config.get('SLOW_QUERY_MS', 0),
+        'detect_n_plus_one': current_app.config.get('DETECT_N_PLUS_ONE', False),
+        'statements': Counter(),
+    }
+
+
+def _finish_request(response):
+    stats = g.pop('_request_metrics', None)
+    if stats is None:
+        return response
+    duration = time.perf_counter() - stats['start']
+    route = _current_route()
+    size = None if response.is_streamed else response.calculate_content_length()
+    metrics.record_request(route, request.method, response.status_code, duration,
+                           stats['sql_count'], stats['sql_time'], size)
+    response.headers['Server-Timing'] = (
+        f'app;dur={duration * 1000:.1f}, sql;dur={stats["sql_time"] * 1000:.1f};desc="{stats["sql_count"]} queries"'
+    )
+    if stats['detect_n_plus_one']:
+        threshold = current_app.config.get('N_PLUS_ONE_THRESHOLD', 5)
+        repeated = [(statement, count) for statement, count in stats['statements'].items() if count >= threshold]
+        if repeated:
+            metrics.inc(metrics.n_plus_one, (('route', route),))
+            for statement, count in repeated:
+                logger.warning('N+1 의심 [%s] 같은 쿼리 %d회: %s', route, count, statement)
+    return response
+
+
+def _is_loopback(address):
+    try:
+        return ipaddress.ip_address(address or '').is_loopback
+    except ValueError:
+        return False
+
+
+def metrics_view():
+    # 토큰이 있으면 토큰으로, 없으면 같은 호스트(수집기 사이드카 등)에서 온 요청만 허용.
+    # METRICS_PUBLIC을 켜면 누구나 볼 수 있다
+    token = current_app.config.get('METRICS_TOKEN')
+    if token:
+        if request.headers.get('Authorization') != f'Bearer {token}':
+            return Response('unauthorized\n', status=401, mimetype='text/plain')
+    elif not current_app.config.get('METRICS_PUBLIC') and not _is_loopback(request.remote_addr):
+        return Response('forbidden\n', status=403, mimetype='text/plain')
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+
+def instrument_engine(engine):
+    """엔진의 쿼리 수/시간을 요청 계측에 더하는 SQLAlchemy 이벤트 등록 (엔진마다 한 번, 샤드 포함)"""
+    if not event.contains(engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+
+
+def init_metrics(app):
+    """요청 계측 훅과 /metrics 엔드포인트를 등록 (앱마다 한 번, 엔진은 instrument_engine으로)"""
+    app.before_request(_start_request)
+    app.after_request(_finish_request)
+    app.add_url_rule('/metrics', 'metrics', metrics_view)
+
+    from app.events import event_bus
+    from app.passwords import password_hasher
+    from app.response_cache import response_cache
+    from app.singleflight import single_flight
+    from app.user_cache import user_cache
+    metrics.add_counter('todolist_user_cache_hits_total', '사용자 캐시 적중 수', lambda: user_cache.hits)
+    metrics.add_counter('todolist_user_cache_misses_total', '사용자 캐시 미스 수', lambda: user_cache.misses)
+    metrics.add_gauge('todolist_sse_connections', '열린 SSE 연결 수',
+                      lambda: getattr(event_bus.broker, 'connection_count', lambda: 0)())
+    metrics.add_gauge('todolist_password_hash_in_flight', '처리 중이거나 대기 중인 비밀번호 해시 작업 수',
+                      lambda: password_hasher.in_flight)
+    metrics.add_gauge('todolist_response_cache_bytes', '응답 캐시에 저장된 압축 본문 크기',
+                      lambda: response_cache.size)
+    metrics.add_counter('todolist_response_cache_hits_total', '응답 캐시 적중 수', lambda: response_cache.hits)
+    metrics.add_counter('todolist_response_cache_misses_total', '응답 캐시 미스 수',
+                        lambda: response_cache.misses)
+    metrics.add_counter('todolist_single_flight_leaders_total', '직접 계산한 합치기 대상 읽기 요청 수',
+                        lambda: single_flight.leaders)
+    metrics.add_counter('todolist_single_flight_shared_total', '다른 요청의 결과를 기다려 받은 읽기 요청 수',
+                        lambda: single_flight.shared)
+    metrics.add_counter('todolist_single_flight_bypassed_total', '합치기 테이블이 가득 차 따로 계산한 요청 수',
+                        lambda: single_flight.bypassed)
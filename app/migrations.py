@@ -0,0 +1,325 @@
+from datetime import date, datetime
+from sqlalchemy import inspect, text
+from app.models import PRIORITY_RANK_SQL
+
+
+def add_column(table, column, ddl):
+    """컬럼이 없을 때만 추가하는 마이그레이션 단계 (create_all로 만든 새 DB 대비)"""
+    def step(conn):
+        if column not in {c['name'] for c in inspect(conn).get_columns(table)}:
+            conn.execute(text(f'ALTER TABLE "{table}" ADD COLUMN {column} {ddl}'))
+    return step
+
+
+def add_generated_column(table, column, type_, expression):
+    """계산 컬럼 추가 (SQLite는 ALTER TABLE로 VIRTUAL만, PostgreSQL은 STORED만 지원)"""
+    def step(conn):
+        storage = 'STORED' if conn.dialect.name == 'postgresql' else 'VIRTUAL'
+        add_column(table, column, f'{type_} GENERATED ALWAYS AS ({expression}) {storage}')(conn)
+    return step
+
+
+def sqlite_only(statements):
+    """SQLite에서만 실행하는 마이그레이션 단계 (FTS5 등 SQLite 전용 기능)"""
+    def step(conn):
+        if conn.dialect.name == 'sqlite':
+            for statement in statements:
+                conn.execute(text(statement))
+    return step
+
+
+def sqlite_autoincrement(table, id_columns=()):
+    """SQLite 테이블의 정수 기본 키를 AUTOINCREMENT로 바꾸는 단계 (테이블 재생성)
+
+    ALTER TABLE로는 바꿀 수 없으므로 모델 정의대로 새 테이블을 만들어 행을 옮기고, 기존 인덱스와
+    트리거는 sqlite_master에 저장된 SQL 그대로 다시 만든다. 이미 AUTOINCREMENT인 테이블
+    (create_all로 만든 새 DB)은 건너뛴다. 다음 id는 id_columns((테이블, 컬럼) 목록)에 남은 id까지
+    포함한 최댓값 다음부터다.
+    """
+    def step(conn):
+        if conn.dialect.name != 'sqlite':
+            return
+        from app import db
+        sql = conn.execute(text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                           {'name': table}).scalar()
+        if sql is None or 'AUTOINCREMENT' in sql.upper():
+            return
+        dependents = conn.execute(text(
+            "SELECT sql FROM sqlite_master WHERE tbl_name = :name AND type IN ('index', 'trigger') "
+            'AND sql IS NOT NULL'), {'name': table}).scalars().all()
+        model = db.metadata.tables[table]
+        existing = {c['name'] for c in inspect(conn).get_columns(table)}
+        columns = ', '.join(f'"{c.name}"' for c in model.columns
+                            if c.computed is None and c.name in existing)
+        # 기존 인덱스/트리거는 옛 테이블과 함께 지워진 뒤 새 테이블에 다시 만들어진다
+        conn.execute(text(f'ALTER TABLE "{table}" RENAME TO "{table}_old"'))
+        model.create(conn)
+        conn.execute(text(f'INSERT INTO "{table}" ({columns}) SELECT {columns} FROM "{table}_old"'))
+        conn.execute(text(f'DROP TABLE "{table}_old"'))
+        for statement in dependents:
+            conn.execute(text(statement))
+        names = inspect(conn).get_table_names()
+        newest = max(conn.execute(text(f'SELECT COALESCE(MAX("{column}"), 0) FROM "{name}"')).scalar()
+                     for name, column in ((table, 'id'), *id_columns) if name in names)
+        conn.execute(text('DELETE FROM sqlite_sequence WHERE name = :name'), {'name': table})
+        conn.execute(text('INSERT INTO sqlite_sequence (name, seq) VALUES (:name, :seq)'),
+                     {'name': table, 'seq': newest})
+    return step
+
+
+# 작업 전문 검색 색인. user_id는 색인하지 않고(UNINDEXED) 검색 결과를 사용자별로 거르는 데만 쓴다
+FTS_TABLE = (
+    'CREATE VIRTUAL TABLE IF NOT EXISTS task_fts USING fts5('
+    "title, description, user_id UNINDEXED, content='task', content_rowid='id', tokenize='trigram')"
+)
+FTS_INSERT_TRIGGER = (
+    'CREATE TRIGGER IF NOT EXISTS task_fts_ai AFTER INSERT ON task BEGIN '
+    'INSERT INTO task_fts (rowid, title, description, user_id) '
+    'VALUES (new.id, new.title, new.description, new.user_id); END'
+)
+FTS_TRIGGERS = [
+    FTS_INSERT_TRIGGER,
+    'CREATE TRIGGER IF NOT EXISTS task_fts_ad AFTER DELETE ON task BEGIN '
+    "INSERT INTO task_fts (task_fts, rowid, title, description, user_id) "
+    "VALUES ('delete', old.id, old.title, old.description, old.user_id); END",
+    'CREATE TRIGGER IF NOT EXISTS task_fts_au AFTER UPDATE OF title, description, user_id ON task BEGIN '
+    "INSERT INTO task_fts (task_fts, rowid, title, description, user_id) "
+    "VALUES ('delete', old.id, old.title, old.description, old.user_id); "
+    'INSERT INTO task_fts (rowid, title, description, user_id) '
+    'VALUES (new.id, new.title, new.description, new.user_id); END',
+]
+
+
+# 버전별 스키마 마이그레이션: (버전, 설명, SQL 또는 conn을 받는 함수 목록)
+# 새 마이그레이션은 항상 목록 끝에 더 큰 버전으로 추가한다.
+MIGRATIONS = [
+    (1, 'task access-pattern indexes', [
+        'CREATE INDEX IF NOT EXISTS ix_task_user_created ON task (user_id, created_at DESC, id DESC)',
+        'CREATE INDEX IF NOT EXISTS ix_task_user_status_completed ON task (user_id, status, completed_at)',
+        'CREATE INDEX IF NOT EXISTS ix_task_user_due ON task (user_id, due_date)',
+    ]),
+    (2, 'backfill daily completion rollup', [
+        'DELETE FROM daily_completion',
+        "INSERT INTO daily_completion (user_id, day, category, count) "
+        "SELECT user_id, date(completed_at), category, count(*) FROM task "
+        "WHERE status = 'completed' AND completed_at IS NOT NULL "
+        'GROUP BY user_id, date(completed_at), category',
+    ]),
+    (3, 'per-user data version', [
+        add_column('user', 'data_version', 'INTEGER NOT NULL DEFAULT 0'),
+    ]),
+    (4, 'task full-text search index', [
+        # trigram 토크나이저는 띄어쓰기와 무관하게 한국어 부분 문자열을 찾을 수 있다
+        sqlite_only([
+            "CREATE VIRTUAL TABLE IF NOT EXISTS task_fts USING fts5("
+            "title, description, content='task', content_rowid='id', tokenize='trigram')",
+            'CREATE TRIGGER IF NOT EXISTS task_fts_ai AFTER INSERT ON task BEGIN '
+            'INSERT INTO task_fts (rowid, title, description) VALUES (new.id, new.title, new.description); END',
+            'CREATE TRIGGER IF NOT EXISTS task_fts_ad AFTER DELETE ON task BEGIN '
+            "INSERT INTO task_fts (task_fts, rowid, title, description) "
+            "VALUES ('delete', old.id, old.title, old.description); END",
+            'CREATE TRIGGER IF NOT EXISTS task_fts_au AFTER UPDATE OF title, description ON task BEGIN '
+            "INSERT INTO task_fts (task_fts, rowid, title, description) "
+            "VALUES ('delete', old.id, old.title, old.description); "
+            'INSERT INTO task_fts (rowid, title, description) VALUES (new.id, new.title, new.description); END',
+            "INSERT INTO task_fts (task_fts) VALUES ('rebuild')",
+        ]),
+    ]),
+    (5, 'task list sort keys', [
+        # 우선순위 정렬을 CASE 식 대신 인덱스로 하기 위한 숫자 순위
+        add_generated_column('task', 'priority_rank', 'SMALLINT', PRIORITY_RANK_SQL),
+        'CREATE INDEX IF NOT EXISTS ix_task_user_priority ON task (user_id, priority_rank DESC, id DESC)',
+        'CREATE INDEX IF NOT EXISTS ix_task_user_updated ON task (user_id, updated_at DESC, id DESC)',
+        # SQLite 인덱스는 끝에 rowid(id)를 포함하지만 PostgreSQL에서도 (due_date, id) 순서가 되도록 교체
+        'CREATE INDEX IF NOT EXISTS ix_task_user_due_id ON task (user_id, due_date, id)',
+        'DROP INDEX IF EXISTS ix_task_user_due',
+    ]),
+    (6, 'task sync revisions', [
+        add_column('task', 'revision', 'INTEGER NOT NULL DEFAULT 0'),
+        'UPDATE task SET revision = (SELECT data_version FROM "user" WHERE "user".id = task.user_id)',
+        'CREATE INDEX IF NOT EXISTS ix_task_user_revision ON task (user_id, revision)',
+        add_column('user', 'sync_floor', 'INTEGER NOT NULL DEFAULT 0'),
+    ]),
+    (7, 'covering index for completion analytics', [
+        # 분석 쿼리가 테이블을 읽지 않도록 생성 시각과 마감일을 포함 (통계 쿼리는 앞부분만 사용)
+        'CREATE INDEX IF NOT EXISTS ix_task_user_status_completed_cover '
+        'ON task (user_id, status, completed_at, created_at, due_date)',
+        'DROP INDEX IF EXISTS ix_task_user_status_completed',
+    ]),
+    (8, 'archived task counts', [
+        # archived_task 테이블과 인덱스는 create_all이 만든다
+        add_column('user', 'archived_task_count', 'INTEGER NOT NULL DEFAULT 0'),
+    ]),
+    (9, 'never reuse task ids', [
+        # 보관된 작업과 삭제 기록의 id도 새 작업에 다시 주지 않도록 그 최댓값 다음부터 시작
+        sqlite_autoincrement('task', id_columns=(('archived_task', 'id'), ('deleted_task', 'task_id'))),
+    ]),
+    (10, 'per-user full-text search', [
+        # 색인을 user_id 컬럼과 함께 다시 만든다 (external content라 데이터는 task에서 다시 읽음)
+        sqlite_only([
+            'DROP TRIGGER IF EXISTS task_fts_ai',
+            'DROP TRIGGER IF EXISTS task_fts_ad',
+            'DROP TRIGGER IF EXISTS task_fts_au',
+            'DROP TABLE IF EXISTS task_fts',
+            FTS_TABLE,
+            *FTS_TRIGGERS,
+            "INSERT INTO task_fts (task_fts) VALUES ('rebuild')",
+        ]),
+    ]),
+]
+
+def hot_queries(dialect='sqlite'):
+    """인덱스를 반드시 사용해야 하는 핫 쿼리: (이름, 조회문)
+
+    라우트와 작업이 실행하는 조회문을 같은 함수로 만들므로 쿼리를 바꾸면 검사도 함께 바뀐다.
+    """
+    from app.analytics import completed_statement
+    from app.archive import DEFAULT_BATCH_SIZE, candidates_statement
+    from app.models import ArchivedTask, Task
+    from app.pagination import MAX_LIMIT
+    from app.queries import (
+        DUE_WINDOWS, TASK_SORTS, calendar_statement, heatmap_statement, parse_task_filters,
+        recent_tasks_statement, task_list_statements
+    )
+    from app.stats import statistics_statement
+    from app.sync import changes_statement, tombstones_statement
+
+    user_id, day = 1, date(2000, 1, 1)
+    queries = []
+    for sort in TASK_SORTS:
+        for archived in ('0', '1'):
+            filters = parse_task_filters({'sort': sort, 'include_archived': archived})
+            for index, statement in enumerate(task_list_statements(user_id, filters, ['id'], None)):
+                queries.append((f'tasks by {sort}{" with archived" * (archived == "1")} #{index + 1}',
+                                statement.limit(MAX_LIMIT + 1)))
+    for window in DUE_WINDOWS:
+        filters = parse_task_filters({'sort': 'due_date', 'due': window})
+        for index, statement in enumerate(task_list_statements(user_id, filters, ['id'], None)):
+            queries.append((f'{window} tasks #{index + 1}', statement.limit(MAX_LIMIT + 1)))
+    queries += [
+        ('recent tasks', recent_tasks_statement(user_id)),
+        ('calendar range', calendar_statement(user_id, '2000-01-01', '2000-01-31', True)),
+        ('calendar range with archived',
+         calendar_statement(user_id, '2000-01-01', '2000-01-31', True, archived=True)),
+        ('statistics', statistics_statement(user_id, day)),
+        ('task changes since', changes_statement(user_id, 1, 10)),
+        ('tombstones since', tombstones_statement(user_id, 1, 10)),
+        ('completed task durations', completed_statement(dialect, Task.__table__, user_id)),
+        ('archived task durations', completed_statement(dialect, ArchivedTask.__table__, user_id)),
+        ('archive candidates',
+         candidates_statement(user_id, datetime(2000, 1, 1), DEFAULT_BATCH_SIZE)),
+        ('heatmap range', heatmap_statement(user_id, day, date(2000, 12, 31))),
+    ]
+    return queries
+
+
+def _ensure_version_table(conn):
+    conn.execute(text(
+        'CREATE TABLE IF NOT EXISTS schema_migrations ('
+        'version INTEGER PRIMARY KEY, description VARCHAR(200) NOT NULL, '
+        'applied_at DATETIME DEFAULT CURRENT_TIMESTAMP)'
+    ))
+
+
+def current_version(conn):
+    _ensure_version_table(conn)
+    return conn.execute(text('SELECT COALESCE(MAX(version), 0) FROM schema_migrations')).scalar()
+
+
+# 다른 프로세스가 마이그레이션 중일 때 기다리는 최대 시간 (큰 테이블 재생성도 끝날 수 있도록 넉넉하게)
+MIGRATION_LOCK_TIMEOUT_MS = 10 * 60 * 1000
+# PostgreSQL advisory lock 키 (이 앱의 스키마 마이그레이션 전용)
+MIGRATION_LOCK_KEY = 0x746F646F
+
+
+def lock_schema(conn):
+    """트랜잭션을 시작하면서 스키마 쓰기 잠금을 잡는다 (여러 워커가 동시에 시작해도 한 곳만 진행)
+
+    SQLite는 BEGIN IMMEDIATE로 데이터베이스 쓰기 잠금을, PostgreSQL은 트랜잭션 advisory lock을
+    잡는다. 잠금은 트랜잭션이 끝날 때 풀린다.
+    """
+    if conn.dialect.name == 'sqlite':
+        driver_connection = conn.connection.driver_connection
+        # pysqlite는 DDL 앞에서 트랜잭션을 자동으로 시작하지 않으므로 직접 시작
+        if driver_connection.in_transaction:
+            return
+        previous = conn.exec_driver_sql('PRAGMA busy_timeout').scalar()
+        conn.exec_driver_sql(f'PRAGMA busy_timeout = {MIGRATION_LOCK_TIMEOUT_MS}')
+        try:
+            conn.exec_driver_sql('BEGIN IMMEDIATE')
+        finally:
+            conn.exec_driver_sql(f'PRAGMA busy_timeout = {int(previous)}')
+    elif conn.dialect.name == 'postgresql':
+        conn.execute(text('SELECT pg_advisory_xact_lock(:key)'), {'key': MIGRATION_LOCK_KEY})
+
+
+def upgrade(engine, metadata=None):
+    """아직 적용되지 않은 마이그레이션을 순서대로 적용하고 적용된 버전 목록을 반환
+
+    스키마 쓰기 잠금을 잡은 트랜잭션 하나에서 실행하므로 여러 워커가 동시에 시작해도 안전하다.
+    잠금을 기다리는 동안 다른 워커가 끝낸 마이그레이션은 잠금을 얻은 뒤 다시 읽은 버전으로 건너뛴다.
+    중간에 실패하면 그 실행에서 적용한 마이그레이션이 모두 롤백된다. metadata를 주면 같은 잠금
+    안에서 없는 테이블을 먼저 만든다 (새 데이터베이스).
+    """
+    applied = []
+    with engine.begin() as conn:
+        lock_schema(conn)
+        if metadata is not None:
+            metadata.create_all(conn)
+        version = current_version(conn)
+        for number, description, statements in MIGRATIONS:
+            if number <= version:
+                continue
+            for statement in statements:
+                if callable(statement):
+                    statement(conn)
+                else:
+                    conn.execute(text(statement))
+            conn.execute(
+                text('INSERT INTO schema_migrations (version, description) VALUES (:v, :d)'),
+                {'v': number, 'd': description}
+            )
+            applied.append(number)
+    return applied
+
+
+# 일별 완료 집계 재계산: 보관 테이블로 옮긴 완료 작업도 기록에 포함
+# (마이그레이션 2는 보관 테이블이 생기기 전의 집계 방식 그대로 둔다)
+REBUILD_DAILY_COMPLETIONS = [
+    'DELETE FROM daily_completion',
+    'INSERT INTO daily_completion (user_id, day, category, count) '
+    'SELECT user_id, date(completed_at), category, count(*) FROM ('
+    "SELECT user_id, completed_at, category FROM task WHERE status = 'completed' "
+    'AND completed_at IS NOT NULL '
+    'UNION ALL SELECT user_id, completed_at, category FROM archived_task WHERE completed_at IS NOT NULL'
+    ') GROUP BY user_id, date(completed_at), category',
+]
+
+
+def rebuild_daily_completions(engine):
+    """DailyCompletion 집계를 작업 테이블과 보관 테이블에서 다시 계산"""
+    with engine.begin() as conn:
+        for statement in REBUILD_DAILY_COMPLETIONS:
+            conn.execute(text(statement))
+
+
+def check_query_plans(engine):
+    """핫 쿼리 중 전체 스캔이나 별도 정렬을 하는 쿼리의 (이름, 실행계획) 목록을 반환
+
+    LIMIT이 걸린 서브쿼리 결과를 합치며 정렬하는 것(보관 작업 포함 목록)과 UNION의 중복 제거는
+    인덱스로 읽은 행만큼만 정렬하므로 허용한다.
+    """
+    failures = []
+    with engine.connect() as conn:
+        for name, statement in hot_queries(conn.dialect.name):
+            sql = str(statement.compile(dialect=conn.dialect, compile_kwargs={'literal_binds': True}))
+            plan = [row[-1] for row in conn.exec_driver_sql('EXPLAIN QUERY PLAN ' + sql)]
+            uses_index = any('USING' in step and 'INDEX' in step for step in plan)
+            # SCAN anon_N은 테이블이 아니라 LIMIT이 걸린 서브쿼리(co-routine) 결과를 읽는 단계
+            full_scan = any(step.startswith('SCAN') and 'INDEX' not in step
+                            and not step.startswith('SCAN anon_') for step in plan)
+            sorts = any('TEMP B-TREE FOR' in step and not previous.startswith('SCAN anon_')
+                        for previous, step in zip([''] + plan, plan))
+            if full_scan or sorts or not uses_index:
+                failures.append((name, plan))
+    return failures
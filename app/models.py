@@ -1,7 +1,10 @@
 from app import db
 from flask_login import UserMixin
 from datetime import datetime
-from werkzeug.security import generate_password_hash, check_password_hash
+from sqlalchemy import event, inspect, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from app.passwords import PasswordHasherBusy, password_hasher
 
 class User(UserMixin, db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -9,30 +12,54 @@ class User(UserMixin, db.Model):
     email = db.Column(db.String(120), unique=True, nullable=False)
     password_hash = db.Column(db.String(120), nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # 작업이 변경될 때마다 증가하는 버전 (ETag 생성에 사용)
+    data_version = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    # 정리된 삭제 기록 중 가장 큰 revision (이보다 오래된 동기화 토큰은 전체 재동기화)
+    sync_floor = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    # 보관 테이블로 옮긴 완료 작업 수 (통계에서 작업 테이블 집계에 더함)
+    archived_task_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
     
     # Relationship with tasks
     tasks = db.relationship('Task', backref='user', lazy=True, cascade='all, delete-orphan')
     
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = password_hasher.hash(password)
     
     def check_password(self, password):
-        return check_password_hash(self.password_hash, password)
+        if not password_hasher.verify(self.password_hash, password):
+            return False
+        # 해시 방식/파라미터 설정이 바뀌었으면 로그인할 때 새 설정으로 다시 해시 (커밋은 호출한 쪽)
+        if password_hasher.needs_rehash(self.password_hash):
+            try:
+                self.set_password(password)
+            except PasswordHasherBusy:
+                pass
+        return True
     
     def __repr__(self):
         return f'<User {self.username}>'
 
+# 우선순위 정렬용 숫자 순위 (priority 값에서 DB가 계산하는 컬럼이라 모든 INSERT/UPDATE 경로에서 일치)
+PRIORITY_RANKS = {'low': 0, 'medium': 1, 'high': 2}
+PRIORITY_RANK_SQL = "CASE priority WHEN 'low' THEN 0 WHEN 'high' THEN 2 ELSE 1 END"
+
 class Task(db.Model):
+    # AUTOINCREMENT: 삭제되거나 보관 테이블로 옮긴 작업의 id를 새 작업에 다시 주지 않는다
+    # (보관 작업과 id 충돌, 삭제 기록과 같은 id의 새 작업이 섞이는 것을 방지)
+    __table_args__ = {'sqlite_autoincrement': True}
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
     description = db.Column(db.Text)
     category = db.Column(db.String(50), nullable=False)  # '회사일', '사이드프로젝트', '공부'
     priority = db.Column(db.String(20), default='medium')  # 'low', 'medium', 'high'
+    priority_rank = db.Column(db.SmallInteger, db.Computed(PRIORITY_RANK_SQL))
     status = db.Column(db.String(20), default='pending')  # 'pending', 'completed'
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     completed_at = db.Column(db.DateTime)
     due_date = db.Column(db.Date)
+    # 마지막으로 변경된 트랜잭션의 소유자 data_version (증분 동기화 기준)
+    revision = db.Column(db.Integer, nullable=False, default=0, server_default='0')
     
     # Foreign key
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
@@ -47,3 +74,199 @@ class Task(db.Model):
     
     def __repr__(self):
         return f'<Task {self.title}>'
+
+class ArchivedTask(db.Model):
+    """완료 후 ARCHIVE_AFTER_DAYS가 지나 작업 테이블에서 옮겨진 작업 (archive.archive_completed_tasks)
+
+    컬럼은 Task와 같고 id도 그대로 유지한다. include_archived=1로 요청한 조회에서만 읽는다.
+    """
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    title = db.Column(db.String(200), nullable=False)
+    description = db.Column(db.Text)
+    category = db.Column(db.String(50), nullable=False)
+    priority = db.Column(db.String(20))
+    priority_rank = db.Column(db.SmallInteger, db.Computed(PRIORITY_RANK_SQL))
+    status = db.Column(db.String(20))
+    created_at = db.Column(db.DateTime)
+    updated_at = db.Column(db.DateTime)
+    completed_at = db.Column(db.DateTime)
+    due_date = db.Column(db.Date)
+    revision = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    archived_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<ArchivedTask {self.title}>'
+
+# 작업 테이블의 목록/캘린더/분석 인덱스와 같은 순서 (include_archived 조회도 인덱스 범위 검색)
+db.Index('ix_archived_task_user_created', ArchivedTask.user_id,
+         ArchivedTask.created_at.desc(), ArchivedTask.id.desc())
+db.Index('ix_archived_task_user_updated', ArchivedTask.user_id,
+         ArchivedTask.updated_at.desc(), ArchivedTask.id.desc())
+db.Index('ix_archived_task_user_priority', ArchivedTask.user_id,
+         ArchivedTask.priority_rank.desc(), ArchivedTask.id.desc())
+db.Index('ix_archived_task_user_due_id', ArchivedTask.user_id, ArchivedTask.due_date, ArchivedTask.id)
+db.Index('ix_archived_task_user_completed_cover', ArchivedTask.user_id, ArchivedTask.completed_at,
+         ArchivedTask.created_at, ArchivedTask.due_date)
+
+class DailyCompletion(db.Model):
+    """잔디 캘린더용 사용자/날짜/카테고리별 완료 개수 집계"""
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'day', 'category', name='uq_daily_completion'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    day = db.Column(db.Date, nullable=False)
+    category = db.Column(db.String(50), nullable=False)
+    count = db.Column(db.Integer, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f'<DailyCompletion {self.user_id} {self.day} {self.category}={self.count}>'
+
+class DeletedTask(db.Model):
+    """증분 동기화용 삭제 기록 (보관 기간이 지나면 compact_tombstones로 정리)"""
+    __table_args__ = (
+        db.Index('ix_deleted_task_user_revision', 'user_id', 'revision', 'task_id'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    task_id = db.Column(db.Integer, nullable=False)
+    revision = db.Column(db.Integer, nullable=False)
+    deleted_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<DeletedTask {self.user_id} {self.task_id}@{self.revision}>'
+
+def _committed_value(task, name):
+    history = inspect(task).attrs[name].history
+    if history.deleted:
+        return history.deleted[0]
+    if history.unchanged:
+        return history.unchanged[0]
+    return getattr(task, name)
+
+def completion_key(user_id, status, completed_at, category):
+    """DailyCompletion 집계 키 (완료 상태가 아니면 None)"""
+    if status != 'completed' or completed_at is None:
+        return None
+    return (user_id, completed_at.date(), category)
+
+def apply_completion_deltas(connection, deltas):
+    """{(user_id, day, category): 증감} 을 DailyCompletion에 upsert"""
+    dialect = postgresql if connection.dialect.name == 'postgresql' else sqlite
+    table = DailyCompletion.__table__
+    for (user_id, day, category), delta in deltas.items():
+        if not delta:
+            continue
+        stmt = dialect.insert(table).values(
+            user_id=user_id, day=day, category=category, count=max(delta, 0)
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.user_id, table.c.day, table.c.category],
+            set_={'count': table.c.count + delta}
+        )
+        connection.execute(stmt)
+
+@event.listens_for(Session, 'before_flush')
+def _sync_daily_completions(session, flush_context, instances):
+    """Task 완료 상태 변경을 같은 트랜잭션 안에서 DailyCompletion에 반영"""
+    deltas = {}
+    
+    def add(key, delta):
+        if key is not None:
+            deltas[key] = deltas.get(key, 0) + delta
+    
+    for task in session.new:
+        if isinstance(task, Task):
+            add(completion_key(task.user_id, task.status, task.completed_at, task.category), 1)
+    
+    for task in session.dirty:
+        if not isinstance(task, Task):
+            continue
+        state = inspect(task)
+        if not any(state.attrs[name].history.has_changes()
+                   for name in ('status', 'completed_at', 'category')):
+            continue
+        add(completion_key(task.user_id, _committed_value(task, 'status'),
+                           _committed_value(task, 'completed_at'),
+                           _committed_value(task, 'category')), -1)
+        add(completion_key(task.user_id, task.status, task.completed_at, task.category), 1)
+    
+    for task in session.deleted:
+        if isinstance(task, Task):
+            add(completion_key(task.user_id, _committed_value(task, 'status'),
+                               _committed_value(task, 'completed_at'),
+                               _committed_value(task, 'category')), -1)
+    
+    if any(deltas.values()):
+        apply_completion_deltas(session.connection(), deltas)
+
+def bump_data_version(session, user_ids):
+    """사용자들의 data_version을 1 증가 (ORM을 거치지 않는 벌크 변경에서도 호출)
+
+    변경된 사용자 id는 session.info에 기록되어 커밋 후 사용자 캐시 무효화에 쓰인다.
+    증가된 {user_id: data_version}을 반환하며, 이 값을 변경한 작업의 revision으로 기록한다.
+    """
+    if not user_ids:
+        return {}
+    table = User.__table__
+    connection = session.connection()
+    connection.execute(
+        table.update()
+        .where(table.c.id.in_(sorted(user_ids)))
+        .values(data_version=table.c.data_version + 1)
+    )
+    session.info.setdefault('changed_user_ids', set()).update(user_ids)
+    versions = dict(connection.execute(
+        select(table.c.id, table.c.data_version).where(table.c.id.in_(sorted(user_ids)))
+    ).all())
+    # 트랜잭션 전후 버전 {user_id: (이전, 최신)} (커밋 후 통계 캐시 증감 적용에 사용)
+    bumped = session.info.setdefault('data_versions', {})
+    for user_id, version in versions.items():
+        bumped[user_id] = (bumped.get(user_id, (version - 1,))[0], version)
+    return versions
+
+def record_tombstones(connection, user_id, task_ids, revision):
+    """삭제한 작업 id를 증분 동기화용 삭제 기록에 추가"""
+    if task_ids:
+        now = datetime.utcnow()
+        connection.execute(DeletedTask.__table__.insert(), [
+            {'user_id': user_id, 'task_id': task_id, 'revision': revision, 'deleted_at': now}
+            for task_id in task_ids
+        ])
+
+@event.listens_for(Session, 'before_flush')
+def _bump_task_owners_version(session, flush_context, instances):
+    """Task가 추가/수정/삭제되면 같은 트랜잭션에서 소유자의 data_version을 증가
+
+    추가/수정된 작업에는 증가된 버전을 revision으로 기록하고, 삭제된 작업은 삭제 기록을 남긴다.
+    """
+    changed = [task for task in session.new if isinstance(task, Task)]
+    changed.extend(task for task in session.dirty
+                   if isinstance(task, Task) and session.is_modified(task))
+    deleted = {}
+    for task in session.deleted:
+        if isinstance(task, Task):
+            deleted.setdefault(_committed_value(task, 'user_id'), []).append(task.id)
+    user_ids = {task.user_id for task in changed} | set(deleted)
+    user_ids.discard(None)
+    versions = bump_data_version(session, user_ids)
+    for task in changed:
+        if task.user_id in versions:
+            task.revision = versions[task.user_id]
+    # 사용자와 함께 삭제되는 작업은 동기화할 클라이언트가 없으므로 기록하지 않음
+    removed_users = {user.id for user in session.deleted if isinstance(user, User)}
+    for user_id, task_ids in deleted.items():
+        if user_id in versions and user_id not in removed_users:
+            record_tombstones(session.connection(), user_id, task_ids, versions[user_id])
+
+@event.listens_for(Session, 'before_flush')
+def _track_changed_users(session, flush_context, instances):
+    """사용자 정보가 바뀌거나 삭제되면 커밋 후 캐시 무효화 대상으로 기록"""
+    changed_users = {user.id for user in session.dirty
+                     if isinstance(user, User) and session.is_modified(user)}
+    changed_users.update(user.id for user in session.deleted if isinstance(user, User))
+    if changed_users:
+        session.info.setdefault('changed_user_ids', set()).update(changed_users)
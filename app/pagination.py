@@ -0,0 +1,99 @@
+import base64
+import json
+import operator
+from datetime import datetime
+from sqlalchemy import select, union_all
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 200
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(value, task_id):
+    """(정렬 키 값, id)를 불투명한 커서 문자열로 인코딩 (날짜/시각은 ISO 문자열)"""
+    if hasattr(value, 'isoformat'):
+        value = value.isoformat()
+    payload = json.dumps([value, task_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor, parse=datetime.fromisoformat):
+    """커서 문자열을 (정렬 키 값, id) 튜플로 디코딩 (값은 parse로 복원, NULL이면 None)"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        value, task_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return (parse(value) if value is not None else None), int(task_id)
+    except (ValueError, TypeError):
+        raise InvalidCursor(cursor)
+
+
+def parse_limit(value, default=DEFAULT_LIMIT, maximum=MAX_LIMIT):
+    """limit 파라미터를 1..maximum 범위로 제한"""
+    if value is None:
+        return default
+    try:
+        limit = int(value)
+    except ValueError:
+        return default
+    return max(1, min(limit, maximum))
+
+
+def keyset_statements(query, sort_col, id_col, cursor, descending=True, nullable=False,
+                      parse=datetime.fromisoformat):
+    """(sort_col, id) 순서의 키셋 페이지 조회문 목록 (limit은 호출한 쪽에서 적용)
+
+    NULL이 될 수 있는 정렬 키는 방향과 관계없이 NULL을 마지막에 두며, 값이 있는 구간과
+    NULL 구간을 각각 인덱스 범위 검색으로 나눠 조회한다. 앞의 조회문부터 실행해 필요한 개수가
+    찰 때까지 이어 붙인다.
+    """
+    after = operator.lt if descending else operator.gt
+    order = (lambda column: column.desc()) if descending else (lambda column: column.asc())
+    value = task_id = None
+    if cursor:
+        value, task_id = decode_cursor(cursor, parse)
+
+    statements = []
+    if not (cursor and value is None):
+        segment = query.where(sort_col.is_not(None)) if nullable else query
+        if cursor:
+            segment = segment.where(after(sort_col, value) |
+                                    ((sort_col == value) & after(id_col, task_id)))
+        statements.append(segment.order_by(order(sort_col), order(id_col)))
+    if nullable:
+        segment = query.where(sort_col.is_(None))
+        if cursor and value is None:
+            segment = segment.where(after(id_col, task_id))
+        statements.append(segment.order_by(order(id_col)))
+    return statements
+
+
+def merge_ordered(statements, order_names, descending, limit):
+    """같은 순서로 정렬된 조회문들을 하나로 합친 조회문
+
+    각 조회문은 자기 인덱스 순서대로 limit개까지만 읽고, 합친 결과(최대 limit * 개수)만
+    다시 정렬한다. 정렬 키가 모두 NULL인 구간도 (NULL, id) 순서로 같게 정렬된다.
+    """
+    combined = union_all(*(select(*sub.c) for sub in
+                           (statement.limit(limit).subquery() for statement in statements)))
+    columns = combined.selected_columns
+    order = (lambda column: column.desc()) if descending else (lambda column: column.asc())
+    return combined.order_by(*(order(columns[name]) for name in order_names))
+
+
+def split_page(rows, limit):
+    """limit + 1개까지 조회한 결과를 (rows, has_more)로 나눈다"""
+    return rows[:limit], len(rows) > limit
+
+
+def fetch_page(execute, statements, limit):
+    """keyset_statements의 조회문을 차례로 실행해 limit + 1개까지 모은 뒤 (rows, has_more)로 나눈다"""
+    rows = []
+    for statement in statements:
+        rows.extend(execute(statement.limit(limit + 1 - len(rows))).all())
+        if len(rows) > limit:
+            break
+    return split_page(rows, limit)
+
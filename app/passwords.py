@@ -0,0 +1,148 @@
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from werkzeug.security import check_password_hash, generate_password_hash
+
+
+def hash_password(password, method=None):
+    """풀 워커에서 실행하는 해시 함수 (forkserver/spawn 워커가 이름으로 import할 수 있는 모듈 수준 함수)"""
+    if method:
+        return generate_password_hash(password, method)
+    return generate_password_hash(password)
+
+
+def verify_password(password_hash, password):
+    return check_password_hash(password_hash, password)
+
+
+class PasswordHasherBusy(RuntimeError):
+    """해시 작업이 대기 한도를 넘었거나 제한 시간 안에 끝나지 않음 (503으로 응답)"""
+
+    def __init__(self, retry_after=1):
+        super().__init__('요청이 많아 잠시 후 다시 시도해주세요.')
+        self.retry_after = retry_after
+
+
+class PasswordHasher:
+    """비밀번호 해시/검증을 요청 스레드 밖의 프로세스 풀에서 실행
+
+    동시에 처리 중이거나 대기 중인 작업은 workers + queue_size개로 제한하고, 넘치면
+    기다리지 않고 PasswordHasherBusy를 발생시킨다. 제한 시간이 지나 요청은 포기해도 이미
+    워커에서 실행 중인 작업은 멈출 수 없으므로, 자리는 작업이 실제로 끝날 때 반납한다.
+    workers=0이면 풀 없이 호출한 스레드에서 계산하지만 동시 실행 수 제한은 그대로 적용된다.
+    """
+
+    def __init__(self, method=None, workers=0, queue_size=16, timeout=10, retry_after=1):
+        self.configure(method, workers, queue_size, timeout, retry_after)
+
+    def configure(self, method=None, workers=0, queue_size=16, timeout=10, retry_after=1):
+        self.shutdown()
+        self.method = method
+        self.workers = workers
+        self.timeout = timeout
+        self.retry_after = retry_after
+        self.capacity = workers + queue_size if workers else max(queue_size, 1)
+        self._slots = threading.BoundedSemaphore(self.capacity)
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._pool = None
+        self._method_prefix = None
+
+    def shutdown(self):
+        pool = getattr(self, '_pool', None)
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    @property
+    def in_flight(self):
+        return self._in_flight
+
+    def _get_pool(self):
+        with self._lock:
+            if self._pool is None:
+                # 요청 처리 중(스레드가 여러 개인 서버 프로세스 안에서) 처음 필요할 때 만든다.
+                # 그런 프로세스를 fork하면 다른 스레드가 잡고 있던 잠금이 자식에 잠긴 채 복사될 수
+                # 있으므로, 단일 스레드 서버 프로세스에서 워커를 fork하는 forkserver를 쓴다.
+                # 워커는 이 모듈만 미리 import하고 hash_password/verify_password를 이름으로 실행한다.
+                # 개발 서버(python run.py)에서는 워커가 run.py를 __mp_main__으로 다시 import해 앱을
+                # 한 번 더 만들지만, gunicorn/uvicorn처럼 실행 스크립트가 보호된 경우에는 그렇지 않다.
+                if 'forkserver' in multiprocessing.get_all_start_methods():
+                    context = multiprocessing.get_context('forkserver')
+                    context.set_forkserver_preload([__name__])
+                else:
+                    context = multiprocessing.get_context('spawn')
+                self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+            return self._pool
+
+    def _reset_pool(self, pool):
+        with self._lock:
+            if self._pool is pool:
+                self._pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def _release(self, future=None):
+        with self._lock:
+            self._in_flight -= 1
+        self._slots.release()
+
+    def _run(self, func, *args):
+        if not self._slots.acquire(blocking=False):
+            raise PasswordHasherBusy(self.retry_after)
+        with self._lock:
+            self._in_flight += 1
+        if not self.workers:
+            try:
+                return func(*args)
+            finally:
+                self._release()
+        try:
+            pool = self._get_pool()
+            future = pool.submit(func, *args)
+        except BaseException:
+            self._release()
+            raise
+        # 취소되거나 끝났을 때 (이미 끝났으면 바로) 자리를 반납
+        future.add_done_callback(self._release)
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeout:
+            # 아직 시작하지 않은 작업만 취소된다. 실행 중이면 끝날 때까지 자리를 차지한다
+            future.cancel()
+            raise PasswordHasherBusy(self.retry_after)
+        except BrokenProcessPool:
+            # 워커 프로세스가 죽었으면 풀을 새로 만들고 이번 요청은 직접 계산
+            self._reset_pool(pool)
+            return func(*args)
+
+    def hash(self, password):
+        return self._run(hash_password, password, self.method)
+
+    def verify(self, password_hash, password):
+        return self._run(verify_password, password_hash, password)
+
+    def method_prefix(self):
+        """현재 설정으로 만든 해시의 '방식:파라미터' 부분 (예: 'scrypt:32768:8:1')"""
+        if self._method_prefix is None:
+            sample = generate_password_hash('', self.method) if self.method else generate_password_hash('')
+            self._method_prefix = sample.split('$', 1)[0]
+        return self._method_prefix
+
+    def needs_rehash(self, password_hash):
+        """저장된 해시가 현재 해시 방식/파라미터와 다르면 True"""
+        return password_hash.split('$', 1)[0] != self.method_prefix()
+
+
+password_hasher = PasswordHasher()
+
+
+def configure_password_hasher(app):
+    password_hasher.configure(
+        method=app.config.get('PASSWORD_HASH_METHOD'),
+        workers=app.config.get('PASSWORD_HASH_WORKERS', 0),
+        queue_size=app.config.get('PASSWORD_HASH_QUEUE', 16),
+        timeout=app.config.get('PASSWORD_HASH_TIMEOUT', 10),
+        retry_after=app.config.get('PASSWORD_HASH_RETRY_AFTER', 1)
+    )
+    app.extensions['password_hasher'] = password_hasher
@@ -0,0 +1,218 @@
+from datetime import date, datetime, timedelta
+from sqlalchemy import or_, select, union, union_all
+from app.models import PRIORITY_RANKS, ArchivedTask, DailyCompletion, Task
+from app.pagination import (
+    MAX_LIMIT, InvalidCursor, encode_cursor, keyset_statements, merge_ordered, parse_limit
+)
+from app.serializers import parse_fields, serialize_event, task_serializer
+
+# 목록 정렬: 이름 -> (컬럼, 기본 내림차순 여부, 커서 값 복원 함수, NULL 가능 여부)
+# 각 정렬은 (user_id, 컬럼, id) 인덱스를 따라 읽는다 (migrations.hot_queries 참고)
+TASK_SORTS = {
+    'created_at': (Task.created_at, True, datetime.fromisoformat, False),
+    'updated_at': (Task.updated_at, True, datetime.fromisoformat, False),
+    'due_date': (Task.due_date, False, date.fromisoformat, True),
+    'priority': (Task.priority_rank, True, int, False),
+}
+DUE_WINDOWS = ('overdue', 'today', 'week', 'none')
+
+
+def _split(value):
+    """'a,b' 형태의 다중 값 파라미터 ('all'이나 빈 값이면 빈 목록)"""
+    if not value or value == 'all':
+        return []
+    return list(dict.fromkeys(item.strip() for item in value.split(',') if item.strip()))
+
+
+def include_archived(args):
+    """include_archived=1이면 보관 테이블도 함께 조회 (기본은 작업 테이블만)"""
+    return args.get('include_archived') in ('1', 'true')
+
+
+def task_tables(archived):
+    """조회할 테이블 목록 (작업 테이블, archived면 보관 테이블 추가)"""
+    return (Task.__table__, ArchivedTask.__table__) if archived else (Task.__table__,)
+
+
+def parse_task_filters(args):
+    """목록 조회의 필터/정렬 파라미터를 검증 (잘못된 값이면 ValueError)
+
+    category, status, priority, due는 쉼표로 여러 값을 줄 수 있고 값끼리는 OR로 묶인다.
+    """
+    priorities = _split(args.get('priority'))
+    unknown = [value for value in priorities if value not in PRIORITY_RANKS]
+    if unknown:
+        raise ValueError(f'알 수 없는 우선순위입니다: {", ".join(unknown)}')
+    due = _split(args.get('due'))
+    unknown = [value for value in due if value not in DUE_WINDOWS]
+    if unknown:
+        raise ValueError(f'알 수 없는 마감 기간입니다: {", ".join(unknown)} ({", ".join(DUE_WINDOWS)})')
+    sort = args.get('sort') or 'created_at'
+    if sort not in TASK_SORTS:
+        raise ValueError(f'알 수 없는 정렬입니다: {sort} ({", ".join(TASK_SORTS)})')
+    order = args.get('order')
+    if order not in (None, '', 'asc', 'desc'):
+        raise ValueError('order는 asc 또는 desc여야 합니다.')
+    return {
+        'categories': _split(args.get('category')),
+        'statuses': _split(args.get('status')),
+        'priorities': priorities,
+        'due': due,
+        'sort': sort,
+        'descending': order == 'desc' if order else TASK_SORTS[sort][1],
+        'archived': include_archived(args),
+    }
+
+
+def due_window_condition(window, today=None, table=None):
+    """마감 기간 조건: 지난 미완료 작업, 오늘, 이번 주(월~일), 마감일 없음"""
+    today = today or date.today()
+    columns = (table if table is not None else Task.__table__).c
+    if window == 'overdue':
+        return (columns.due_date < today) & (columns.status != 'completed')
+    if window == 'today':
+        return columns.due_date == today
+    if window == 'week':
+        monday = today - timedelta(days=today.weekday())
+        return columns.due_date.between(monday, monday + timedelta(days=6))
+    return columns.due_date.is_(None)
+
+
+def _task_list_statements(table, user_id, filters, fields, cursor):
+    sort_key, _, parse, nullable = TASK_SORTS[filters['sort']]
+    sort_col = table.c[sort_key.key]
+    columns = [table.c[name] for name in fields]
+    if sort_key.key not in fields:
+        columns.append(sort_col)
+    statement = select(*columns).where(table.c.user_id == user_id)
+
+    if filters['categories']:
+        statement = statement.where(table.c.category.in_(filters['categories']))
+
+    if filters['statuses']:
+        statement = statement.where(table.c.status.in_(filters['statuses']))
+
+    if filters['priorities']:
+        statement = statement.where(
+            table.c.priority_rank.in_([PRIORITY_RANKS[value] for value in filters['priorities']]))
+
+    if filters['due']:
+        today = date.today()
+        statement = statement.where(
+            or_(*(due_window_condition(window, today, table) for window in filters['due'])))
+        # '마감일 없음'을 고르지 않았으면 마감일이 NULL인 구간은 항상 비므로 조회하지 않는다
+        nullable = nullable and 'none' in filters['due']
+
+    return keyset_statements(statement, sort_col, table.c.id, cursor, filters['descending'], nullable, parse)
+
+
+def task_list_statements(user_id, filters, fields, cursor, limit=MAX_LIMIT):
+    """작업 목록 키셋 페이지 조회문 목록 (요청된 컬럼과 정렬 키, id만 로드)
+
+    앞에서부터 실행해 limit + 1개가 찰 때까지 이어 붙인다. 잘못된 커서면 InvalidCursor.
+    보관 작업을 포함하면 두 테이블을 각자 인덱스 순서로 limit + 1개까지 읽어 합친다.
+    """
+    parts = [_task_list_statements(table, user_id, filters, fields, cursor)
+             for table in task_tables(filters['archived'])]
+    if len(parts) == 1:
+        return parts[0]
+    order = (TASK_SORTS[filters['sort']][0].key, 'id')
+    return [merge_ordered(segments, order, filters['descending'], limit + 1) for segments in zip(*parts)]
+
+
+def task_list_request(user_id, args):
+    """GET /api/tasks 파라미터로 (limit, 필터, 조회문 목록, 직렬화 함수)를 만든다
+
+    Flask 뷰와 ASGI 경로가 함께 쓴다. 잘못된 파라미터면 응답할 메시지를 담은 ValueError.
+    """
+    limit = parse_limit(args.get('limit'))
+    try:
+        fields = parse_fields(args.get('fields'))
+    except ValueError as e:
+        raise ValueError(f'알 수 없는 필드입니다: {e}')
+    filters = parse_task_filters(args)
+    try:
+        statements = task_list_statements(user_id, filters, fields, args.get('cursor'), limit)
+    except InvalidCursor:
+        raise ValueError('잘못된 커서입니다.')
+    return limit, filters, statements, task_serializer(tuple(fields))
+
+
+def page_cursor(rows, has_more, filters):
+    """마지막 행의 (정렬 키, id)로 다음 페이지 커서를 만든다 (더 없으면 None)"""
+    if not has_more:
+        return None
+    last = rows[-1]
+    return encode_cursor(getattr(last, TASK_SORTS[filters['sort']][0].key), last.id)
+
+
+def recent_tasks_statement(user_id, limit=5):
+    """대시보드 최근 작업 조회문 (ix_task_user_created 인덱스 순서)"""
+    return (
+        select(Task.id, Task.title, Task.category, Task.status, Task.created_at)
+        .where(Task.user_id == user_id)
+        .order_by(Task.created_at.desc(), Task.id.desc())
+        .limit(limit)
+    )
+
+
+def heatmap_statement(user_id, start, end):
+    """기간 내 일별/카테고리별 완료 개수 조회문 (DailyCompletion 집계, 날짜순)"""
+    return (
+        select(DailyCompletion.day, DailyCompletion.category, DailyCompletion.count)
+        .where(DailyCompletion.user_id == user_id, DailyCompletion.day.between(start, end),
+               DailyCompletion.count > 0)
+        .order_by(DailyCompletion.day)
+    )
+
+
+def month_range(day=None):
+    """day가 속한 달의 (첫날, 마지막 날)"""
+    first = (day or date.today()).replace(day=1)
+    next_month = (first + timedelta(days=32)).replace(day=1)
+    return first, next_month - timedelta(days=1)
+
+
+def calendar_statement(user_id, start_date, end_date, compact, archived=False):
+    """캘린더 이벤트 조회문 (compact면 설명 컬럼 제외, archived면 보관 작업 포함)"""
+    names = ['id', 'title', 'due_date', 'created_at', 'category', 'status', 'priority']
+    if not compact:
+        names.append('description')
+    tables = task_tables(archived)
+
+    def base(table):
+        return select(*(table.c[name] for name in names)).where(table.c.user_id == user_id)
+
+    # 날짜 범위 필터링 (선택사항)
+    if start_date and end_date:
+        try:
+            start = datetime.strptime(start_date, '%Y-%m-%d').date()
+            end = datetime.strptime(end_date, '%Y-%m-%d').date()
+        except ValueError:
+            start = None  # 날짜 파싱 실패 시 필터링 없이 진행
+
+        if start is not None:
+            # 마감일이 있는 작업들 또는 생성일이 범위 내인 작업들
+            # OR 대신 각각 인덱스 범위 검색을 하는 두 쿼리의 UNION으로 조회
+            created_start = datetime.combine(start, datetime.min.time())
+            created_end = datetime.combine(end + timedelta(days=1), datetime.min.time())
+            statements = []
+            for table in tables:
+                statements.append(base(table).where(table.c.due_date.between(start, end)))
+                statements.append(base(table).where(table.c.created_at >= created_start,
+                                                    table.c.created_at < created_end))
+            return union(*statements)
+    if len(tables) == 1:
+        return base(tables[0])
+    return union_all(*(base(table) for table in tables))
+
+
+def calendar_request(user_id, args):
+    """GET /api/calendar/events 파라미터로 (조회문, 직렬화 함수)를 만든다 (Flask 뷰와 ASGI 경로 공용)
+
+    compact=1이면 설명을 제외한 가벼운 이벤트를 만든다.
+    """
+    compact = args.get('compact') in ('1', 'true')
+    statement = calendar_statement(user_id, args.get('start'), args.get('end'), compact,
+                                   include_archived(args))
+    return statement, lambda row: serialize_event(row, compact)
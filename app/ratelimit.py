@@ -0,0 +1,71 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+
+
+class TokenBucketLimiter:
+    """키(사용자명, IP 등)별 토큰 버킷
+
+    키마다 최대 burst개의 토큰을 가지고 refill_seconds마다 하나씩 채워진다.
+    프로세스 내 상태이므로 워커마다 따로 계산되며, 오래 쓰이지 않은 키는 LRU로 버린다.
+    burst가 0이면 제한하지 않는다.
+    """
+
+    def __init__(self, burst=5, refill_seconds=12, max_keys=100000):
+        self.configure(burst, refill_seconds, max_keys)
+
+    def configure(self, burst=5, refill_seconds=12, max_keys=100000):
+        self.burst = burst
+        self.refill_seconds = refill_seconds
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        self._buckets = OrderedDict()
+
+    def consume(self, key):
+        """토큰 하나를 쓰고 (허용 여부, 다음 토큰까지 남은 초)를 반환"""
+        if not self.burst:
+            return True, 0
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (float(self.burst), now))
+            tokens = min(self.burst, tokens + (now - updated_at) / self.refill_seconds)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        retry_after = 0 if allowed else math.ceil((1 - tokens) * self.refill_seconds)
+        return allowed, retry_after
+
+    def reset(self, key=None):
+        with self._lock:
+            if key is None:
+                self._buckets.clear()
+            else:
+                self._buckets.pop(key, None)
+
+
+# 로그인 시도 제한: 같은 사용자명에 대한 시도와 같은 IP의 시도를 따로 센다
+login_user_limiter = TokenBucketLimiter()
+login_ip_limiter = TokenBucketLimiter(burst=20, refill_seconds=3)
+
+
+def configure_login_limiters(app):
+    login_user_limiter.configure(app.config.get('LOGIN_USER_BURST', 5),
+                                 app.config.get('LOGIN_USER_REFILL_SECONDS', 12))
+    login_ip_limiter.configure(app.config.get('LOGIN_IP_BURST', 20),
+                               app.config.get('LOGIN_IP_REFILL_SECONDS', 3))
+
+
+def check_login_rate(username, remote_addr):
+    """로그인 시도를 허용하면 0, 아니면 Retry-After로 보낼 초를 반환"""
+    retry_after = 0
+    for limiter, key in ((login_ip_limiter, remote_addr or 'unknown'),
+                         (login_user_limiter, (username or '').strip().lower())):
+        allowed, wait = limiter.consume(key)
+        if not allowed:
+            retry_after = max(retry_after, wait)
+    return retry_after
@@ -0,0 +1,141 @@
+import threading
+from collections import OrderedDict
+from datetime import date
+from functools import wraps
+from flask import Response, make_response, request
+from flask_login import current_user
+from app.compression import compress_response, is_compressible, negotiate_encoding
+
+
+class CachedBody:
+    __slots__ = ('body', 'mimetype', 'encoding')
+
+    def __init__(self, body, mimetype, encoding):
+        self.body = body
+        self.mimetype = mimetype
+        self.encoding = encoding
+
+    def to_response(self):
+        response = Response(self.body, mimetype=self.mimetype)
+        if self.encoding:
+            response.headers['Content-Encoding'] = self.encoding
+        response.vary.add('Accept-Encoding')
+        return response
+
+
+class ResponseCache:
+    """압축까지 끝난 응답 본문을 저장하는 LRU 캐시 (전체 바이트 수로 제한)
+
+    키에 사용자의 data_version이 들어가므로 데이터가 바뀌면 이전 항목은 더 이상 조회되지 않고
+    LRU로 밀려난다. 워커별 프로세스 내 캐시이지만 버전 키 덕분에 워커 간 무효화가 필요 없다.
+    """
+
+    def __init__(self, max_bytes=0, max_entry_bytes=0):
+        self.configure(max_bytes, max_entry_bytes)
+
+    def configure(self, max_bytes=0, max_entry_bytes=0):
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = min(max_entry_bytes, max_bytes) if max_bytes else 0
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self):
+        return self.max_bytes > 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def set(self, key, entry):
+        if len(entry.body) > self.max_entry_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.size -= len(previous.body)
+            self._entries[key] = entry
+            self.size += len(entry.body)
+            while self.size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= len(evicted.body)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def capture(self, key, response, encoding):
+        """응답 본문을 그대로 내보내면서 끝까지 전송되면 캐시에 저장하는 이터러블"""
+        mimetype = response.mimetype
+        limit = self.max_entry_bytes
+        if not response.is_streamed:
+            self.set(key, CachedBody(response.get_data(), mimetype, encoding))
+            return response.response
+
+        def tee(chunks):
+            parts = []
+            size = 0
+            for chunk in chunks:
+                if parts is not None:
+                    size += len(chunk)
+                    if size > limit:
+                        parts = None  # 너무 큰 응답은 스트리밍만 하고 저장하지 않음
+                    else:
+                        parts.append(chunk)
+                yield chunk
+            # 클라이언트가 중간에 끊으면 여기까지 오지 않으므로 불완전한 본문은 저장되지 않는다
+            if parts is not None:
+                self.set(key, CachedBody(b''.join(parts), mimetype, encoding))
+        return tee(response.iter_encoded())
+
+    def stats(self):
+        with self._lock:
+            return {'entries': len(self._entries), 'bytes': self.size,
+                    'hits': self.hits, 'misses': self.misses}
+
+
+response_cache = ResponseCache()
+
+
+def configure_response_cache(app):
+    response_cache.configure(app.config.get('RESPONSE_CACHE_MAX_BYTES', 0),
+                             app.config.get('RESPONSE_CACHE_MAX_ENTRY_BYTES', 0))
+    app.extensions['response_cache'] = response_cache
+
+
+def cache_key(user_id, version, path, args, encoding):
+    return (user_id, version, date.today(), path, tuple(sorted(args.items(multi=True))), encoding)
+
+
+def cached_response(view):
+    """(사용자, data_version, 경로, 쿼리, 인코딩)이 같으면 저장된 압축 본문을 그대로 반환
+
+    SQL 실행도 직렬화도 압축도 건너뛴다. login_required/conditional 아래에 적용한다.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if not response_cache.enabled:
+            return view(*args, **kwargs)
+        encoding = negotiate_encoding()
+        key = cache_key(current_user.id, current_user.data_version, request.path, request.args, encoding)
+        entry = response_cache.get(key)
+        if entry is not None:
+            return entry.to_response()
+
+        response = make_response(view(*args, **kwargs))
+        if not is_compressible(response):
+            return response
+        compress_response(response, encoding)
+        response.response = response_cache.capture(key, response, response.headers.get('Content-Encoding'))
+        return response
+    return wrapper
@@ -5,6 +5,8 @@ from sqlalchemy import and_, func, extract
 from app import db
 from app.models import Task
 from app.forms import TaskForm
+from app.serializers import serialize_event, serialize_recent_task
+from app.stats import statistics_cache
 
 main = Blueprint('main', __name__)
 
@@ -14,30 +16,19 @@ def index():
         return redirect(url_for('auth.login'))
     
     # Get tasks statistics
-    total_tasks = Task.query.filter_by(user_id=current_user.id).count()
-    completed_tasks = Task.query.filter_by(user_id=current_user.id, status='completed').count()
-    pending_tasks = total_tasks - completed_tasks
+    stats = statistics_cache.get(current_user.id, current_user.data_version)
     
     # Get recent tasks
     recent_tasks = Task.query.filter_by(user_id=current_user.id)\
                            .order_by(Task.created_at.desc())\
                            .limit(5).all()
     
-    # Get today's completed tasks for grass calendar
-    today = date.today()
-    today_completed = Task.query.filter_by(
-        user_id=current_user.id, 
-        status='completed'
-    ).filter(
-        func.date(Task.completed_at) == today
-    ).count()
-    
     return render_template('index.html', 
-                         total_tasks=total_tasks,
-                         completed_tasks=completed_tasks,
-                         pending_tasks=pending_tasks,
+                         total_tasks=stats['total_tasks'],
+                         completed_tasks=stats['completed_tasks'],
+                         pending_tasks=stats['pending_tasks'],
                          recent_tasks=recent_tasks,
-                         today_completed=today_completed)
+                         today_completed=stats['today_completed'])
 
 @main.route('/tasks')
 @login_required
@@ -74,6 +65,7 @@ def add_task():
         )
         db.session.add(task)
         db.session.commit()
+        statistics_cache.task_created(current_user.id, task)
         flash('작업이 추가되었습니다!', 'success')
         return redirect(url_for('main.tasks'))
     
@@ -103,20 +95,24 @@ def edit_task(task_id):
 def toggle_task(task_id):
     task = Task.query.filter_by(id=task_id, user_id=current_user.id).first_or_404()
     
+    old_status, old_completed_at = task.status, task.completed_at
     if task.status == 'completed':
         task.mark_pending()
     else:
         task.mark_completed()
     
     db.session.commit()
+    statistics_cache.task_status_changed(current_user.id, old_status, old_completed_at, task)
     return jsonify({'status': task.status, 'completed_at': task.completed_at})
 
 @main.route('/delete_task/<int:task_id>', methods=['POST'])
 @login_required
 def delete_task(task_id):
     task = Task.query.filter_by(id=task_id, user_id=current_user.id).first_or_404()
+    status, completed_at = task.status, task.completed_at
     db.session.delete(task)
     db.session.commit()
+    statistics_cache.task_deleted(current_user.id, status, completed_at)
     flash('작업이 삭제되었습니다!', 'success')
     return redirect(url_for('main.tasks'))
 
@@ -124,25 +120,7 @@ def delete_task(task_id):
 @login_required
 def statistics():
     """Get current statistics for dashboard"""
-    total_tasks = Task.query.filter_by(user_id=current_user.id).count()
-    completed_tasks = Task.query.filter_by(user_id=current_user.id, status='completed').count()
-    pending_tasks = total_tasks - completed_tasks
-    
-    # Get today's completed tasks
-    today = date.today()
-    today_completed = Task.query.filter_by(
-        user_id=current_user.id, 
-        status='completed'
-    ).filter(
-        func.date(Task.completed_at) == today
-    ).count()
-    
-    return jsonify({
-        'total_tasks': total_tasks,
-        'completed_tasks': completed_tasks,
-        'pending_tasks': pending_tasks,
-        'today_completed': today_completed
-    })
+    return jsonify(statistics_cache.get(current_user.id, current_user.data_version))
 
 @main.route('/api/recent_tasks')
 @login_required
@@ -152,17 +130,7 @@ def recent_tasks():
                            .order_by(Task.created_at.desc())\
                            .limit(5).all()
     
-    tasks_data = []
-    for task in recent_tasks:
-        tasks_data.append({
-            'id': task.id,
-            'title': task.title,
-            'category': task.category,
-            'status': task.status,
-            'created_at': task.created_at.strftime('%m/%d %H:%M')
-        })
-    
-    return jsonify(tasks_data)
+    return jsonify([serialize_recent_task(task) for task in recent_tasks])
 
 @main.route('/api/calendar_events')
 @login_required
@@ -189,21 +157,4 @@ def calendar_events():
     
     tasks = query.all()
     
-    events = []
-    for task in tasks:
-        # 마감일이 있으면 마감일을, 없으면 생성일을 사용
-        event_date = task.due_date.strftime('%Y-%m-%d') if task.due_date else task.created_at.strftime('%Y-%m-%d')
-        
-        events.append({
-            'id': task.id,
-            'title': task.title,
-            'start': event_date,
-            'due_date': task.due_date.strftime('%Y-%m-%d') if task.due_date else None,
-            'created_at': task.created_at.strftime('%Y-%m-%d'),
-            'category': task.category,
-            'status': task.status,
-            'priority': task.priority,
-            'description': task.description
-        })
-    
-    return jsonify(events)
+    return jsonify([serialize_event(task) for task in tasks])
@@ -0,0 +1,171 @@
+import re
+from contextlib import contextmanager
+from sqlalchemy import Date, DateTime, or_, text
+from app import db
+from app.migrations import FTS_INSERT_TRIGGER
+from app.models import Task
+from app.serializers import isoformat
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 50
+MAX_QUERY_LENGTH = 100
+# trigram 토크나이저는 3글자 미만의 검색어를 색인으로 찾을 수 없다
+MIN_TRIGRAM_LENGTH = 3
+# 짧은 검색어만 있으면 색인 없이 LIKE로 찾으므로 최근 작업 이만큼만 살펴본다
+SHORT_TERM_SCAN_LIMIT = 2000
+HIGHLIGHT_OPEN = '<mark>'
+HIGHLIGHT_CLOSE = '</mark>'
+SNIPPET_TOKENS = 12
+
+FTS_SEARCH_SQL = (
+    'SELECT t.id, t.title, t.category, t.priority, t.status, t.due_date, t.created_at, '
+    f"highlight(task_fts, 0, '{HIGHLIGHT_OPEN}', '{HIGHLIGHT_CLOSE}') AS title_highlight, "
+    f"snippet(task_fts, 1, '{HIGHLIGHT_OPEN}', '{HIGHLIGHT_CLOSE}', '…', {SNIPPET_TOKENS}) AS snippet "
+    'FROM task_fts JOIN task t ON t.id = task_fts.rowid '
+    'WHERE task_fts MATCH :match AND task_fts.user_id = :user_id{extra} '
+    'ORDER BY bm25(task_fts, 10.0, 1.0) LIMIT :limit OFFSET :offset'
+)
+
+
+def split_terms(query):
+    return [term for term in query.split() if term][:10]
+
+
+def fts_match_expression(terms):
+    """검색어마다 큰따옴표로 감싼 구문을 AND로 연결한 FTS5 MATCH 식"""
+    return ' '.join('"' + term.replace('"', '""') + '"' for term in terms)
+
+
+def _like_pattern(term):
+    escaped = term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f'%{escaped}%'
+
+
+def _highlight(value, terms):
+    if not value:
+        return value
+    pattern = re.compile('|'.join(re.escape(term) for term in terms), re.IGNORECASE)
+    return pattern.sub(lambda m: f'{HIGHLIGHT_OPEN}{m.group(0)}{HIGHLIGHT_CLOSE}', value)
+
+
+def _snippet(value, terms, width=40):
+    """첫 번째 일치 위치 주변을 잘라 강조한 설명 일부"""
+    if not value:
+        return ''
+    lowered = value.lower()
+    positions = [lowered.find(term.lower()) for term in terms]
+    positions = [position for position in positions if position >= 0]
+    if not positions:
+        return ''
+    start = max(min(positions) - width // 2, 0)
+    end = min(start + width, len(value))
+    text_part = value[start:end]
+    prefix = '…' if start > 0 else ''
+    suffix = '…' if end < len(value) else ''
+    return prefix + _highlight(text_part, terms) + suffix
+
+
+def _row_to_result(row, title_highlight, snippet):
+    return {
+        'id': row.id,
+        'title': row.title,
+        'category': row.category,
+        'priority': row.priority,
+        'status': row.status,
+        'due_date': isoformat(row.due_date) if row.due_date else None,
+        'created_at': isoformat(row.created_at),
+        'title_highlight': title_highlight,
+        'snippet': snippet
+    }
+
+
+def _fts_search(user_id, terms, short_terms, limit, offset):
+    params = {
+        'match': fts_match_expression(terms), 'user_id': user_id,
+        'limit': limit + 1, 'offset': offset
+    }
+    # 색인으로 찾을 수 없는 짧은 검색어는 FTS로 좁힌 후보에 LIKE 조건으로 추가
+    extra = ''
+    for index, term in enumerate(short_terms):
+        params[f'short{index}'] = _like_pattern(term)
+        extra += (f" AND (t.title LIKE :short{index} ESCAPE '\\' "
+                  f"OR t.description LIKE :short{index} ESCAPE '\\')")
+    statement = text(FTS_SEARCH_SQL.format(extra=extra)).columns(due_date=Date, created_at=DateTime)
+    rows = db.session.execute(statement, params).all()
+    return [_row_to_result(row, row.title_highlight, row.snippet) for row in rows]
+
+
+def _like_search(user_id, terms, limit, offset, scan_limit=None):
+    """FTS를 쓸 수 없을 때(짧은 검색어, SQLite 이외 DB)의 LIKE 검색 (최신순)
+
+    scan_limit을 주면 최근 작업 scan_limit개 안에서만 찾는다 (ix_task_user_created 범위 읽기).
+    """
+    query = db.session.query(
+        Task.id, Task.title, Task.description, Task.category, Task.priority,
+        Task.status, Task.due_date, Task.created_at
+    ).filter(Task.user_id == user_id)
+    if scan_limit is not None:
+        recent = (db.session.query(Task.id).filter(Task.user_id == user_id)
+                  .order_by(Task.created_at.desc(), Task.id.desc()).limit(scan_limit))
+        query = query.filter(Task.id.in_(recent.scalar_subquery()))
+    for term in terms:
+        pattern = _like_pattern(term)
+        query = query.filter(or_(
+            Task.title.ilike(pattern, escape='\\'),
+            Task.description.ilike(pattern, escape='\\')
+        ))
+    rows = query.order_by(Task.created_at.desc(), Task.id.desc()).offset(offset).limit(limit + 1).all()
+    return [
+        _row_to_result(row, _highlight(row.title, terms), _snippet(row.description, terms))
+        for row in rows
+    ]
+
+
+def search_tasks(user_id, query, limit=DEFAULT_LIMIT, offset=0):
+    """제목/설명 전문 검색. (결과 목록, 다음 페이지 offset 또는 None)을 반환
+
+    SQLite에서는 BM25 순위의 FTS5 trigram 색인을 사용하고, 그 밖의 DB나
+    3글자 미만 검색어만 있는 경우에는 LIKE 검색으로 대체한다. 짧은 검색어만 있으면
+    (회의, 보고 등 두 글자 단어) 색인을 쓸 수 없으므로 최근 작업 SHORT_TERM_SCAN_LIMIT개만 찾는다.
+    """
+    terms = split_terms(query[:MAX_QUERY_LENGTH])
+    if not terms:
+        return [], None
+    long_terms = [term for term in terms if len(term) >= MIN_TRIGRAM_LENGTH]
+    short_terms = [term for term in terms if len(term) < MIN_TRIGRAM_LENGTH]
+
+    if not long_terms:
+        results = _like_search(user_id, terms, limit, offset, SHORT_TERM_SCAN_LIMIT)
+    elif db.engine.dialect.name == 'sqlite':
+        results = _fts_search(user_id, long_terms, short_terms, limit, offset)
+    else:
+        results = _like_search(user_id, terms, limit, offset)
+
+    next_offset = offset + limit if len(results) > limit else None
+    return results[:limit], next_offset
+
+
+@contextmanager
+def deferred_fts_index(connection):
+    """대량 INSERT 동안 행마다 FTS를 갱신하는 트리거를 끄고, 끝나면 새 행을 한 번에 색인
+
+    trigram 색인은 트리거로 한 행씩 넣는 것보다 INSERT ... SELECT 한 번이 훨씬 빠르다.
+    트리거 삭제/재생성은 현재 트랜잭션 안에서 일어나므로 다른 연결에는 보이지 않고,
+    도중에 예외가 나서 롤백되면 트리거도 원래대로 돌아간다.
+    """
+    if connection.dialect.name != 'sqlite' or not connection.exec_driver_sql(
+            "SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = 'task_fts_ai'").first():
+        yield
+        return
+    # pysqlite는 DDL 앞에서 트랜잭션을 자동으로 시작하지 않으므로 직접 시작
+    if not connection.connection.driver_connection.in_transaction:
+        connection.exec_driver_sql('BEGIN')
+    connection.exec_driver_sql('DROP TRIGGER task_fts_ai')
+    # 쓰기 잠금을 잡은 뒤에 읽어야 다른 연결이 그 사이 넣은 행과 겹치지 않는다
+    start_id = connection.exec_driver_sql('SELECT COALESCE(MAX(id), 0) FROM task').scalar()
+    yield
+    connection.execute(text(
+        'INSERT INTO task_fts (rowid, title, description, user_id) '
+        'SELECT id, title, description, user_id FROM task WHERE id > :start_id'
+    ), {'start_id': start_id})
+    connection.exec_driver_sql(FTS_INSERT_TRIGGER)
@@ -0,0 +1,149 @@
+import json
+from functools import lru_cache
+from flask import Response, stream_with_context
+from app.models import Task
+
+try:
+    import orjson
+except ImportError:  # orjson이 없으면 표준 json으로 동작
+    orjson = None
+
+STREAM_CHUNK_SIZE = 200
+
+
+def dumps(value):
+    """JSON bytes로 인코딩 (orjson이 설치되어 있으면 사용)"""
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode()
+
+
+def loads(value):
+    """JSON 디코딩 (orjson이 설치되어 있으면 사용). 잘못된 JSON이면 ValueError"""
+    if orjson is not None:
+        return orjson.loads(value)
+    return json.loads(value)
+
+
+def isoformat(value):
+    return value.isoformat()
+
+
+def ymd(value):
+    return value.strftime('%Y-%m-%d')
+
+
+def short_datetime(value):
+    return value.strftime('%m/%d %H:%M')
+
+
+# 조회 가능한 필드: 이름 -> (컬럼, 직렬화 함수)
+TASK_FIELDS = {
+    'id': (Task.id, None),
+    'title': (Task.title, None),
+    'description': (Task.description, None),
+    'category': (Task.category, None),
+    'priority': (Task.priority, None),
+    'status': (Task.status, None),
+    'created_at': (Task.created_at, isoformat),
+    'updated_at': (Task.updated_at, isoformat),
+    'completed_at': (Task.completed_at, isoformat),
+    'due_date': (Task.due_date, isoformat),
+}
+
+RECENT_TASK_FIELDS = (
+    ('id', None), ('title', None), ('category', None), ('status', None),
+    ('created_at', short_datetime),
+)
+
+EVENT_FIELDS = (
+    ('id', None), ('title', None), ('due_date', ymd), ('created_at', ymd),
+    ('category', None), ('status', None), ('priority', None),
+)
+
+
+def parse_fields(value):
+    """fields 파라미터를 검증된 필드 목록으로 변환 (id는 항상 포함)"""
+    if not value:
+        return list(TASK_FIELDS)
+    fields = [name.strip() for name in value.split(',') if name.strip()]
+    unknown = [name for name in fields if name not in TASK_FIELDS]
+    if unknown:
+        raise ValueError(', '.join(unknown))
+    if 'id' not in fields:
+        fields.insert(0, 'id')
+    return list(dict.fromkeys(fields))
+
+
+def compile_serializer(spec):
+    """(이름, 직렬화 함수) 목록으로 행 -> dict 함수를 만든다
+
+    행은 ORM 객체든 결과 Row든 속성 접근만 되면 된다.
+    """
+    spec = tuple(spec)
+
+    def serialize(row):
+        data = {}
+        for name, formatter in spec:
+            value = getattr(row, name)
+            data[name] = formatter(value) if formatter is not None and value is not None else value
+        return data
+    return serialize
+
+
+@lru_cache(maxsize=64)
+def task_serializer(fields=tuple(TASK_FIELDS)):
+    return compile_serializer((name, TASK_FIELDS[name][1]) for name in fields)
+
+
+serialize_task = task_serializer()
+serialize_recent_task = compile_serializer(RECENT_TASK_FIELDS)
+_serialize_event_base = compile_serializer(EVENT_FIELDS)
+
+
+def serialize_event(row, compact=False):
+    event = _serialize_event_base(row)
+    # 마감일이 있으면 마감일을, 없으면 생성일을 사용
+    event['start'] = event['due_date'] or event['created_at']
+    if not compact:
+        event['description'] = row.description
+    return event
+
+
+def json_open(key):
+    return b'{' + dumps(key) + b':['
+
+
+def json_items(rows, serialize, first):
+    """배열 원소 chunk (첫 chunk가 아니면 앞에 쉼표를 붙임)"""
+    return (b'' if first else b',') + b','.join(dumps(serialize(row)) for row in rows)
+
+
+def json_close(extra=None):
+    return b']' + b''.join(b',' + dumps(name) + b':' + dumps(value)
+                           for name, value in (extra or {}).items()) + b'}'
+
+
+def stream_json(key, rows, serialize, extra=None, status=200):
+    """{key: [...], **extra} 형태의 JSON을 chunk 단위로 생성하는 스트리밍 응답
+
+    rows는 지연 평가되는 쿼리 결과여도 되며, 전체 응답을 메모리에 만들지 않는다.
+    """
+    def generate():
+        yield json_open(key)
+        chunk = []
+        first = True
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= STREAM_CHUNK_SIZE:
+                yield json_items(chunk, serialize, first)
+                first = False
+                chunk = []
+        if chunk:
+            yield json_items(chunk, serialize, first)
+        yield json_close(extra)
+    body = generate()
+    # 지연 평가되는 결과는 DB 세션이 살아 있도록 요청 컨텍스트를 유지한 채 스트리밍
+    if not isinstance(rows, (list, tuple)):
+        body = stream_with_context(body)
+    return Response(body, status=status, mimetype='application/json')
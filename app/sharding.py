@@ -0,0 +1,202 @@
+"""사용자별 샤드 라우팅 (SHARD_DATABASE_URLS가 설정된 경우에만 사용)
+
+기본 DB는 로그인/회원가입에 쓰는 사용자 디렉터리로 남고, 각 사용자의 작업, 완료 집계,
+삭제 기록과 사용자 행 사본(data_version 포함)은 user_id로 정해지는 샤드 DB에 저장된다.
+로그인한 요청은 load_user에서 샤드를 세션에 연결하므로 요청의 모든 쿼리가 그 샤드로 간다.
+샤드마다 쓰기 잠금이 따로 있어 서로 다른 샤드 사용자의 커밋은 기다리지 않는다.
+
+샤드 번호는 jump consistent hash로 정하므로 URL 목록은 뒤에 추가하는 방식으로만 늘린다.
+늘린 뒤에는 shards-rebalance 명령으로 샤드가 바뀐 사용자만 옮긴다.
+"""
+from flask import g, has_app_context
+from flask_sqlalchemy.session import Session
+from sqlalchemy import create_engine, func, insert, select
+from sqlalchemy.exc import IntegrityError
+
+# 한 번에 IN (...)으로 확인하는 id 개수 (SQLite 바인드 변수 한도 이내)
+ID_CHUNK_SIZE = 500
+
+
+def jump_hash(key, buckets):
+    """Jump consistent hash: 버킷 수가 n에서 n + 1로 늘면 키의 1/(n + 1)만 새 버킷으로 이동"""
+    key &= 0xFFFFFFFFFFFFFFFF
+    bucket, candidate = -1, 0
+    while candidate < buckets:
+        bucket = candidate
+        key = (key * 2862933555777941757 + 1) & 0xFFFFFFFFFFFFFFFF
+        candidate = int((bucket + 1) * (float(1 << 31) / float((key >> 33) + 1)))
+    return bucket
+
+
+class ShardRouter:
+    """샤드 엔진 목록과 user_id -> 샤드 매핑"""
+
+    def __init__(self):
+        self.engines = []
+
+    @property
+    def enabled(self):
+        return bool(self.engines)
+
+    def configure(self, urls, engine_options=None):
+        self.engines = [create_engine(url, **(engine_options(url) if engine_options else {}))
+                        for url in urls]
+
+    def shard_for(self, user_id, count=None):
+        return jump_hash(user_id, count or len(self.engines))
+
+    def engine_for(self, user_id):
+        return self.engines[self.shard_for(user_id)]
+
+
+shard_router = ShardRouter()
+
+
+class ShardedSession(Session):
+    """요청에 샤드가 연결되어 있으면 모든 쿼리를 그 샤드 엔진으로 보내는 세션"""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and has_app_context():
+            engine = g.get('shard_engine')
+            if engine is not None:
+                return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def bind_user_shard(user_id):
+    """현재 요청의 세션을 사용자의 샤드에 연결 (샤딩을 쓰지 않으면 아무것도 하지 않음)"""
+    if shard_router.enabled:
+        g.shard_engine = shard_router.engine_for(user_id)
+
+
+def configure_shards(app, db):
+    """샤드 엔진을 만들고 기본 DB와 같은 스키마로 생성/업그레이드"""
+    from app.config import engine_options, register_sqlite_pragmas
+    from app.migrations import upgrade
+    shard_router.configure(app.config.get('SHARD_DATABASE_URLS') or [], engine_options)
+    for engine in shard_router.engines:
+        register_sqlite_pragmas(engine, app.config)
+        upgrade(engine, db.metadata)
+    app.extensions['shard_router'] = shard_router
+
+
+def copy_user_to_shard(directory_engine, user_id):
+    """디렉터리의 사용자 행을 샤드에 복사 (회원가입 직후 첫 로드 시). 사용자가 없으면 False"""
+    from app.models import User
+    table = User.__table__
+    with directory_engine.connect() as conn:
+        row = conn.execute(select(table).where(table.c.id == user_id)).mappings().first()
+    if row is None:
+        return False
+    try:
+        with shard_router.engine_for(user_id).begin() as conn:
+            conn.execute(insert(table).values(**row))
+    except IntegrityError:
+        pass  # 다른 요청이 먼저 복사함
+    return True
+
+
+def _insertable(table, row, skip=()):
+    return {column.name: row[column.name] for column in table.columns
+            if column.computed is None and column.name not in skip}
+
+
+def move_user(user_id, source, target, keep_user=False):
+    """사용자의 데이터를 source 엔진에서 target 엔진으로 옮긴다 (옮겼으면 True)
+
+    target에 남아 있던 해당 사용자 데이터는 지우고 다시 복사하므로 중간에 실패해도 다시
+    실행하면 된다. 작업 id가 target의 다른 작업과 겹치면 새 id를 받으므로 sync_floor를 올려
+    클라이언트가 다음 증분 동기화에서 전체 목록을 다시 받게 한다. keep_user면 source의
+    사용자 행을 남긴다 (샤딩 전 단일 DB에서 옮길 때).
+
+    보관된 작업은 target의 작업 테이블로 되돌린다.
+    다음 archive-tasks 실행 때 다시 보관된다.
+    """
+    from app.models import ArchivedTask, DailyCompletion, DeletedTask, Task, User
+    users, tasks, archived = User.__table__, Task.__table__, ArchivedTask.__table__
+    completions, tombstones = DailyCompletion.__table__, DeletedTask.__table__
+    user_tables = (tombstones, completions, archived, tasks)
+
+    with source.connect() as conn:
+        user = conn.execute(select(users).where(users.c.id == user_id)).mappings().first()
+        if user is None:
+            return False
+        task_rows = [
+            row for table in (tasks, archived) for row in conn.execute(
+                select(*(table.c[column.name] for column in tasks.columns if column.computed is None))
+                .where(table.c.user_id == user_id).order_by(table.c.id)
+            ).mappings()
+        ]
+        completion_rows = conn.execute(
+            select(completions).where(completions.c.user_id == user_id)
+        ).mappings().all()
+    if keep_user and not task_rows and not completion_rows:
+        return False
+
+    with target.begin() as conn:
+        previous = conn.execute(select(users.c.data_version).where(users.c.id == user_id)).scalar()
+        version = max(user['data_version'], previous or 0) + 1
+        for table in user_tables:
+            conn.execute(table.delete().where(table.c.user_id == user_id))
+        conn.execute(users.delete().where(users.c.id == user_id))
+        conn.execute(users.insert(), [dict(_insertable(users, user), data_version=version,
+                                           sync_floor=version, archived_task_count=0)])
+
+        ids = [row['id'] for row in task_rows]
+        # 보관 테이블의 id와도 겹치지 않아야 나중에 다시 보관할 수 있다
+        keep_ids = not any(
+            conn.execute(select(func.count()).select_from(table)
+                         .where(table.c.id.in_(ids[start:start + ID_CHUNK_SIZE]))).scalar()
+            for table in (tasks, archived)
+            for start in range(0, len(ids), ID_CHUNK_SIZE)
+        )
+        skip = () if keep_ids else ('id',)
+        if task_rows:
+            conn.execute(tasks.insert(), [dict(_insertable(tasks, row, skip), revision=version)
+                                          for row in task_rows])
+        if completion_rows:
+            conn.execute(completions.insert(), [_insertable(completions, row, ('id',))
+                                                for row in completion_rows])
+
+    with source.begin() as conn:
+        for table in user_tables:
+            conn.execute(table.delete().where(table.c.user_id == user_id))
+        if not keep_user:
+            conn.execute(users.delete().where(users.c.id == user_id))
+    return True
+
+
+def rebalance(directory_engine, previous_count):
+    """샤드 수가 previous_count에서 현재 수로 바뀌어 샤드가 달라진 사용자를 옮긴다
+
+    previous_count가 0이면 샤딩 전 단일 DB(디렉터리)에서 각 사용자의 샤드로 옮긴다.
+    쓰기를 멈춘 상태에서 실행해야 한다. 옮긴 사용자 id 목록을 반환한다.
+    """
+    from app.models import User
+    with directory_engine.connect() as conn:
+        user_ids = conn.execute(select(User.id).order_by(User.id)).scalars().all()
+    moved = []
+    for user_id in user_ids:
+        target = shard_router.engine_for(user_id)
+        if previous_count:
+            source = shard_router.engines[shard_router.shard_for(user_id, previous_count)]
+            if source is target:
+                continue
+            changed = move_user(user_id, source, target)
+        else:
+            changed = move_user(user_id, directory_engine, target, keep_user=True)
+        if changed:
+            moved.append(user_id)
+    return moved
+
+
+def shard_summary():
+    """샤드별 (번호, URL, 사용자 수, 작업 수)"""
+    from app.models import Task, User
+    summary = []
+    for index, engine in enumerate(shard_router.engines):
+        with engine.connect() as conn:
+            users = conn.execute(select(func.count()).select_from(User.__table__)).scalar()
+            tasks = conn.execute(select(func.count()).select_from(Task.__table__)).scalar()
+        summary.append((index, engine.url.render_as_string(hide_password=True), users, tasks))
+    return summary
@@ -0,0 +1,176 @@
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from flask import make_response, request
+from flask_login import current_user
+from app.compression import negotiate_encoding
+from app.response_cache import CachedBody, cache_key
+
+
+class _Call:
+    __slots__ = ('event', 'result', 'expires')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.expires = None
+
+
+class SingleFlight:
+    """같은 키의 동시 요청을 계산 하나로 합치는 테이블 (single-flight)
+
+    먼저 온 요청(leader)만 뷰를 실행하고, 계산 중에 같은 키로 들어온 요청은 완료를 기다렸다가
+    leader가 만든 본문을 그대로 받는다. 완료 후 window초 동안은 결과를 그대로 재사용한다.
+    키에 data_version이 들어가므로 데이터가 바뀐 뒤의 요청은 합쳐지지 않는다.
+    테이블이 max_entries만큼 차면 합치지 않고 각자 계산한다.
+    """
+
+    def __init__(self, window=0.0, max_entries=0, max_entry_bytes=0, timeout=10.0):
+        self.configure(window, max_entries, max_entry_bytes, timeout)
+
+    def configure(self, window=0.0, max_entries=0, max_entry_bytes=0, timeout=10.0):
+        self.window = window
+        self.max_entries = max_entries
+        self.max_entry_bytes = max_entry_bytes
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._calls = {}
+        # 완료 후 window 동안 남겨 둔 항목 (완료 순 = 만료 순)
+        self._retained = OrderedDict()
+        self.leaders = 0
+        self.shared = 0
+        self.bypassed = 0
+
+    @property
+    def enabled(self):
+        return self.max_entries > 0
+
+    def _purge(self, now):
+        while self._retained:
+            key, call = next(iter(self._retained.items()))
+            if call.expires > now:
+                break
+            del self._retained[key]
+            if self._calls.get(key) is call:
+                del self._calls[key]
+
+    def join(self, key):
+        """(call, leader 여부)를 반환. 테이블이 가득 차면 (None, True)"""
+        with self._lock:
+            self._purge(time.monotonic())
+            call = self._calls.get(key)
+            if call is not None:
+                self.shared += 1
+                return call, False
+            if len(self._calls) >= self.max_entries:
+                self.bypassed += 1
+                return None, True
+            call = self._calls[key] = _Call()
+            self.leaders += 1
+            return call, True
+
+    def wait(self, call):
+        """leader의 결과를 기다린다 (실패/시간 초과/공유할 수 없는 결과면 None)"""
+        if not call.event.wait(self.timeout):
+            return None
+        return call.result
+
+    def finish(self, key, call, result):
+        """leader의 계산 완료 (result가 None이면 기다리던 요청은 각자 계산, 두 번째 호출부터는 무시)"""
+        shareable = result is not None and len(result.body) <= self.max_entry_bytes
+        with self._lock:
+            if call.event.is_set():
+                return
+            call.result = result
+            if shareable and self.window > 0:
+                call.expires = time.monotonic() + self.window
+                self._retained[key] = call
+                self._retained.move_to_end(key)
+            elif self._calls.get(key) is call:
+                del self._calls[key]
+        call.event.set()
+
+    def stats(self):
+        with self._lock:
+            return {'entries': len(self._calls), 'leaders': self.leaders,
+                    'shared': self.shared, 'bypassed': self.bypassed}
+
+
+single_flight = SingleFlight()
+
+
+def configure_single_flight(app):
+    single_flight.configure(app.config.get('SINGLE_FLIGHT_WINDOW_MS', 0) / 1000,
+                            app.config.get('SINGLE_FLIGHT_MAX_ENTRIES', 0),
+                            app.config.get('SINGLE_FLIGHT_MAX_ENTRY_BYTES', 0),
+                            app.config.get('SINGLE_FLIGHT_TIMEOUT', 10))
+    app.extensions['single_flight'] = single_flight
+
+
+def _share(key, call, response):
+    """leader 응답의 본문을 그대로 보내면서 끝나면 기다리는 요청과 공유"""
+    encoding = response.headers.get('Content-Encoding')
+    if not response.is_streamed:
+        single_flight.finish(key, call, CachedBody(response.get_data(), response.mimetype, encoding))
+        return response.response
+    # 서버가 본문을 한 번도 읽지 않고 닫으면(클라이언트 종료 등) 제너레이터의 finally가 실행되지
+    # 않으므로, 응답이 닫힐 때 항상 완료 처리한다 (이미 완료됐으면 무시됨)
+    response.call_on_close(lambda: single_flight.finish(key, call, None))
+
+    def tee(chunks):
+        parts = []
+        size = 0
+        complete = False
+        try:
+            for chunk in chunks:
+                if parts is not None:
+                    size += len(chunk)
+                    if size > single_flight.max_entry_bytes:
+                        # 너무 큰 본문은 공유하지 않고 기다리던 요청을 바로 풀어 각자 계산하게 함
+                        parts = None
+                        single_flight.finish(key, call, None)
+                    else:
+                        parts.append(chunk)
+                yield chunk
+            complete = True
+        finally:
+            # 클라이언트가 중간에 끊어도 기다리는 요청이 남지 않도록 항상 완료 처리
+            if parts is not None:
+                body = CachedBody(b''.join(parts), response.mimetype, encoding) if complete else None
+                single_flight.finish(key, call, body)
+    return tee(response.iter_encoded())
+
+
+def coalesced(view):
+    """(사용자, data_version, 경로, 쿼리, 인코딩)이 같은 동시 요청은 뷰를 한 번만 실행
+
+    conditional 아래, cached_response 위에 적용한다. 200 응답만 공유한다.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        # HEAD는 본문을 읽지 않으므로 공유할 결과가 생기지 않는다
+        if not single_flight.enabled or request.method != 'GET':
+            return view(*args, **kwargs)
+        key = cache_key(current_user.id, current_user.data_version, request.path, request.args,
+                        negotiate_encoding())
+        call, leader = single_flight.join(key)
+        if not leader:
+            entry = single_flight.wait(call)
+            if entry is not None:
+                return entry.to_response()
+            return view(*args, **kwargs)
+        if call is None:
+            return view(*args, **kwargs)
+
+        try:
+            response = make_response(view(*args, **kwargs))
+        except BaseException:
+            single_flight.finish(key, call, None)
+            raise
+        if response.status_code != 200 or response.direct_passthrough:
+            single_flight.finish(key, call, None)
+            return response
+        response.response = _share(key, call, response)
+        return response
+    return wrapper
@@ -0,0 +1,161 @@
+import threading
+from datetime import date, datetime, time, timedelta
+from sqlalchemy import case, event, func, select
+from sqlalchemy.orm import Session
+from app import db
+from app.models import Task, User
+
+
+def today_range(day=None):
+    """하루를 [00:00, 다음날 00:00) 반열린 구간으로 변환 (인덱스 사용 가능)"""
+    day = day or date.today()
+    start = datetime.combine(day, time.min)
+    return start, start + timedelta(days=1)
+
+
+def statistics_statement(user_id, day=None):
+    """(전체, 완료, 오늘 완료, 보관 개수, data_version) 조회문 (사용자 인덱스 범위 집계 한 번)"""
+    start, end = today_range(day)
+    is_completed = Task.status == 'completed'
+    archived_count = select(User.archived_task_count).where(User.id == user_id).scalar_subquery()
+    data_version = select(User.data_version).where(User.id == user_id).scalar_subquery()
+    return select(
+        func.count(Task.id),
+        func.coalesce(func.sum(case((is_completed, 1), else_=0)), 0),
+        func.coalesce(func.sum(case(
+            (is_completed & (Task.completed_at >= start) & (Task.completed_at < end), 1),
+            else_=0
+        )), 0),
+        func.coalesce(archived_count, 0),
+        data_version,
+    ).where(Task.user_id == user_id)
+
+
+def _statistics(user_id, day=None):
+    """(data_version, 통계)를 한 쿼리로 읽는다 (같은 스냅샷의 버전과 집계)"""
+    total, completed, today_completed, archived, version = db.session.execute(
+        statistics_statement(user_id, day)).one()
+    total += archived
+    completed += archived
+    return version, {
+        'total_tasks': total,
+        'completed_tasks': completed,
+        'pending_tasks': total - completed,
+        'today_completed': today_completed
+    }
+
+
+def compute_statistics(user_id, day=None):
+    """조건부 집계 한 번으로 대시보드 통계를 계산
+
+    보관 테이블로 옮긴 작업은 모두 완료된 작업이므로 사용자 행의 보관 개수를 전체/완료에 더한다.
+    """
+    return _statistics(user_id, day)[1]
+
+
+class StatisticsCache:
+    """사용자별 통계 캐시 (항목마다 계산한 시점의 data_version을 함께 저장)
+
+    조회 시 사용자의 현재 data_version과 다르면 다른 워커나 배치 작업이 데이터를 바꾼 것이므로
+    다시 계산한다. 변경 라우트는 커밋 후 카운터를 증감시키는데, 커밋 직전 버전이 캐시 항목과
+    같을 때(그 사이 다른 변경이 없을 때)만 적용하고 항목의 버전을 커밋된 버전으로 올린다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}
+
+    def get(self, user_id, data_version):
+        today = date.today()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry['day'] == today and entry['version'] == data_version:
+                return self._snapshot(entry)
+        version, stats = _statistics(user_id, today)
+        with self._lock:
+            entry = self._entries.get(user_id)
+            # 동시에 더 새 버전으로 갱신된 항목은 덮어쓰지 않는다
+            if entry is None or entry['day'] != today or entry['version'] < version:
+                self._entries[user_id] = {
+                    'day': today,
+                    'version': version,
+                    'total': stats['total_tasks'],
+                    'completed': stats['completed_tasks'],
+                    'today': stats['today_completed'],
+                }
+        return stats
+
+    def invalidate(self, user_id=None):
+        with self._lock:
+            if user_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(user_id, None)
+
+    # 변경 메서드는 적용한 통계 증감을 응답/이벤트와 같은 형태의 dict로 반환한다.
+    def task_created(self, user_id, task):
+        return self._apply(user_id, total=1, **self._status_delta(task.status, task.completed_at, 1))
+
+    def task_deleted(self, user_id, status, completed_at):
+        return self._apply(user_id, total=-1, **self._status_delta(status, completed_at, -1))
+
+    def task_status_changed(self, user_id, old_status, old_completed_at, task):
+        removed = self._status_delta(old_status, old_completed_at, -1)
+        added = self._status_delta(task.status, task.completed_at, 1)
+        return self._apply(
+            user_id,
+            completed=removed['completed'] + added['completed'],
+            today=removed['today'] + added['today']
+        )
+
+    @staticmethod
+    def _status_delta(status, completed_at, sign):
+        if status != 'completed':
+            return {'completed': 0, 'today': 0}
+        start, end = today_range()
+        is_today = completed_at is not None and start <= completed_at < end
+        return {'completed': sign, 'today': sign if is_today else 0}
+
+    def _apply(self, user_id, total=0, completed=0, today=0):
+        delta = {
+            'total_tasks': total,
+            'completed_tasks': completed,
+            'pending_tasks': total - completed,
+            'today_completed': today
+        }
+        versions = db.session.info.get('committed_data_versions', {}).get(user_id)
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return delta
+            if versions is None or entry['version'] != versions[0] or entry['day'] != date.today():
+                del self._entries[user_id]
+                return delta
+            entry['version'] = versions[1]
+            entry['total'] += total
+            entry['completed'] += completed
+            entry['today'] += today
+        return delta
+
+    @staticmethod
+    def _snapshot(entry):
+        return {
+            'total_tasks': entry['total'],
+            'completed_tasks': entry['completed'],
+            'pending_tasks': entry['total'] - entry['completed'],
+            'today_completed': entry['today']
+        }
+
+
+statistics_cache = StatisticsCache()
+
+
+@event.listens_for(Session, 'after_commit')
+def _remember_committed_versions(session):
+    """커밋된 트랜잭션의 (이전, 최신) data_version을 커밋 후 통계 증감 적용에 넘긴다"""
+    session.info['committed_data_versions'] = session.info.pop('data_versions', {})
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_versions(session):
+    session.info.pop('data_versions', None)
@@ -0,0 +1,101 @@
+from datetime import datetime, timedelta
+from sqlalchemy import delete, func, select, update
+from app import db
+from app.models import DeletedTask, Task, User
+from app.serializers import STREAM_CHUNK_SIZE, TASK_FIELDS
+
+DEFAULT_RETENTION_DAYS = 30
+
+
+class InvalidSyncToken(ValueError):
+    pass
+
+
+def parse_sync_token(value):
+    """since 파라미터를 revision 정수로 변환 (없으면 0 = 전체 동기화)"""
+    if value in (None, ''):
+        return 0
+    try:
+        token = int(value)
+    except ValueError:
+        raise InvalidSyncToken(value)
+    if token < 0:
+        raise InvalidSyncToken(value)
+    return token
+
+
+def sync_state(user_id):
+    """(현재 data_version, sync_floor)를 사용자 행에서 직접 읽는다 (캐시된 버전보다 최신)"""
+    return db.session.execute(
+        select(User.data_version, User.sync_floor).where(User.id == user_id)
+    ).one()
+
+
+def changes_statement(user_id, since, until):
+    """revision이 (since, until] 구간인 작업 조회문 (since가 0이면 전체, revision 순)"""
+    statement = (
+        select(*(column for column, _ in TASK_FIELDS.values()))
+        .where(Task.user_id == user_id, Task.revision <= until)
+    )
+    if since:
+        statement = statement.where(Task.revision > since)
+    return statement.order_by(Task.revision, Task.id)
+
+
+def tombstones_statement(user_id, since, until):
+    """revision이 (since, until] 구간인 삭제 기록의 작업 id 조회문"""
+    return (
+        select(DeletedTask.task_id)
+        .where(DeletedTask.user_id == user_id,
+               DeletedTask.revision > since, DeletedTask.revision <= until)
+        .order_by(DeletedTask.revision, DeletedTask.task_id)
+    )
+
+
+def changed_tasks(user_id, since, until):
+    """revision이 (since, until] 구간인 작업 (since가 0이면 전체, revision 순 서버 측 커서)"""
+    return db.session.execute(
+        changes_statement(user_id, since, until).execution_options(yield_per=STREAM_CHUNK_SIZE)
+    )
+
+
+def deleted_task_ids(user_id, since, until):
+    """since 이후 until까지 삭제된 작업 id (전체 동기화면 빈 목록)"""
+    if not since:
+        return []
+    return db.session.execute(tombstones_statement(user_id, since, until)).scalars().all()
+
+
+def task_changes(user_id, since):
+    """since 토큰 이후의 변경 (작업 결과, 삭제된 id, 새 토큰, 전체 재동기화 여부)
+
+    until을 먼저 읽고 그 이하의 revision만 돌려주므로, 조회 중에 커밋된 변경은 다음 동기화에
+    포함된다. 토큰이 정리된 삭제 기록보다 오래됐거나 현재 버전보다 크면 (DB 복원 등)
+    전체 목록을 reset으로 돌려준다. 클라이언트는 삭제를 먼저 적용한 뒤 작업을 반영해야 한다.
+    """
+    until, floor = sync_state(user_id)
+    reset = bool(since) and (since < floor or since > until)
+    if reset:
+        since = 0
+    deleted = deleted_task_ids(user_id, since, until)
+    return changed_tasks(user_id, since, until), deleted, until, reset
+
+
+def compact_tombstones(engine, retention_days=DEFAULT_RETENTION_DAYS, now=None):
+    """보관 기간이 지난 삭제 기록을 지우고 사용자별 sync_floor를 올린다 (지운 개수 반환)"""
+    cutoff = (now or datetime.utcnow()) - timedelta(days=retention_days)
+    with engine.begin() as conn:
+        floors = conn.execute(
+            select(DeletedTask.user_id, func.max(DeletedTask.revision))
+            .where(DeletedTask.deleted_at < cutoff)
+            .group_by(DeletedTask.user_id)
+        ).all()
+        for user_id, revision in floors:
+            conn.execute(
+                update(User)
+                .where(User.id == user_id, User.sync_floor < revision)
+                .values(sync_floor=revision)
+            )
+        return conn.execute(
+            delete(DeletedTask).where(DeletedTask.deleted_at < cutoff)
+        ).rowcount
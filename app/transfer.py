@@ -0,0 +1,232 @@
+import csv
+import io
+from datetime import date, datetime
+from sqlalchemy import select, union_all
+from app import db
+from app.models import Task, apply_completion_deltas, bump_data_version, completion_key
+from app.queries import include_archived, task_tables
+from app.search import deferred_fts_index
+from app.serializers import TASK_FIELDS, dumps, loads, serialize_task
+from app.validation import validate_task_data
+
+FORMATS = ('ndjson', 'csv')
+MIMETYPES = {'ndjson': 'application/x-ndjson', 'csv': 'text/csv'}
+EXPORT_CHUNK_SIZE = 1000
+IMPORT_CHUNK_SIZE = 5000
+READ_BUFFER_SIZE = 64 * 1024
+MAX_IMPORT_ROWS = 1000000
+MAX_REPORTED_ERRORS = 100
+STATUSES = ('pending', 'completed')
+EXPORT_COLUMNS = tuple(TASK_FIELDS)
+IMPORT_COLUMNS = ('title', 'description', 'category', 'priority', 'status',
+                  'created_at', 'updated_at', 'completed_at', 'due_date', 'user_id', 'revision')
+SQLITE_INSERT_SQL = (
+    f'INSERT INTO task ({", ".join(IMPORT_COLUMNS)}) VALUES ({", ".join("?" * len(IMPORT_COLUMNS))})'
+)
+
+
+class ImportAborted(ValueError):
+    def __init__(self, line, message):
+        super().__init__(f'{line}번째 줄: {message}')
+        self.line = line
+        # import_tasks가 채운다: 중단 전에 커밋된 개수와 마지막으로 커밋된 줄
+        self.imported = 0
+        self.resume_after = 0
+
+
+def export_statement(user_id, archived=False):
+    """내보내기 조회문 (생성순, archived면 보관 작업도 생성순으로 합쳐서)"""
+    if not archived:
+        return (
+            select(*(column for column, _ in TASK_FIELDS.values()))
+            .where(Task.user_id == user_id)
+            .order_by(Task.created_at, Task.id)
+            .execution_options(yield_per=EXPORT_CHUNK_SIZE)
+        )
+    combined = union_all(*(
+        select(*(table.c[name] for name in EXPORT_COLUMNS)).where(table.c.user_id == user_id)
+        for table in task_tables(archived)
+    ))
+    columns = combined.selected_columns
+    return combined.order_by(columns.created_at, columns.id).execution_options(yield_per=EXPORT_CHUNK_SIZE)
+
+
+def export_request(user_id, args):
+    """GET /api/tasks/export 파라미터로 (형식, 조회문, mimetype, 추가 헤더)를 만든다 (Flask 뷰와 ASGI 경로 공용)
+
+    형식이 잘못되면 응답할 메시지를 담은 ValueError.
+    """
+    fmt = args.get('format', 'ndjson')
+    if fmt not in FORMATS:
+        raise ValueError('format은 ndjson 또는 csv여야 합니다.')
+    filename = f'tasks-{date.today().strftime("%Y%m%d")}.{fmt}'
+    return fmt, export_statement(user_id, include_archived(args)), MIMETYPES[fmt], {
+        'Content-Disposition': f'attachment; filename="{filename}"'
+    }
+
+
+def generate_ndjson(rows):
+    chunk = []
+    for row in rows:
+        chunk.append(dumps(serialize_task(row)))
+        if len(chunk) >= EXPORT_CHUNK_SIZE:
+            yield b'\n'.join(chunk) + b'\n'
+            chunk = []
+    if chunk:
+        yield b'\n'.join(chunk) + b'\n'
+
+
+def generate_csv(rows, header=True):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(EXPORT_COLUMNS)
+    count = 0
+    for row in rows:
+        data = serialize_task(row)
+        writer.writerow(['' if data[name] is None else data[name] for name in EXPORT_COLUMNS])
+        count += 1
+        if count % EXPORT_CHUNK_SIZE == 0:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode()
+
+
+def _parse_datetime(value, name):
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise ValueError(f'{name} 형식이 올바르지 않습니다. (ISO 8601)')
+
+
+def parse_import_row(data, user_id, now):
+    """내보내기 형식의 행 하나를 검증해 task 테이블 행 dict로 변환
+
+    TaskForm과 같은 규칙(validate_task_data)을 적용하고, 상태와 생성/완료 시각이 있으면 유지한다.
+    id와 updated_at은 무시한다.
+    """
+    row = validate_task_data(data)
+    status = data.get('status') or 'pending'
+    if status not in STATUSES:
+        raise ValueError('상태가 올바르지 않습니다.')
+    created_at = _parse_datetime(data.get('created_at'), 'created_at') or now
+    completed_at = None
+    if status == 'completed':
+        completed_at = _parse_datetime(data.get('completed_at'), 'completed_at') or now
+    row.update(user_id=user_id, status=status, created_at=created_at,
+               updated_at=now, completed_at=completed_at)
+    return row
+
+
+def read_records(stream, fmt):
+    """업로드 스트림에서 (줄 번호, dict)를 차례로 읽는다 (전체를 메모리에 올리지 않음)"""
+    if isinstance(stream, io.RawIOBase):
+        stream = io.BufferedReader(stream, READ_BUFFER_SIZE)
+    text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='' if fmt == 'csv' else None)
+    if fmt == 'csv':
+        reader = csv.DictReader(text)
+        for record in reader:
+            yield reader.line_num, record
+        return
+    for line_number, line in enumerate(text, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = loads(line)
+        except ValueError:
+            record = None
+        yield line_number, record
+
+
+def import_tasks(user_id, records, skip_invalid=False, after_line=0):
+    """레코드를 검증하며 IMPORT_CHUNK_SIZE개씩 청크마다 따로 커밋
+
+    청크마다 짧은 트랜잭션(data_version 증가, executemany INSERT, FTS 색인, 일별 완료 집계)으로
+    커밋하므로 큰 파일을 가져오는 동안에도 SQLite 쓰기 잠금은 청크 하나 동안만 잡힌다.
+    after_line 이하의 줄은 건너뛰므로 중간에 실패하면 마지막으로 커밋된 줄 다음부터 다시 가져올 수 있다.
+
+    skip_invalid가 False면 첫 오류에서 그 청크만 롤백하고 ImportAborted를 발생시킨다
+    (imported, resume_after에 이미 커밋된 개수와 줄 번호). (가져온 수, 건너뛴 수, 오류 목록,
+    마지막으로 커밋된 줄)을 반환한다.
+    """
+    now = datetime.utcnow()
+    errors = []
+    imported = skipped = 0
+    resume_after = after_line
+    chunk = []
+    try:
+        for line, record in records:
+            if line <= after_line:
+                continue
+            try:
+                if not isinstance(record, dict):
+                    raise ValueError('JSON 객체 또는 CSV 행이어야 합니다.')
+                row = parse_import_row(record, user_id, now)
+            except ValueError as e:
+                if not skip_invalid:
+                    raise ImportAborted(line, str(e))
+                skipped += 1
+                if len(errors) < MAX_REPORTED_ERRORS:
+                    errors.append({'line': line, 'error': str(e)})
+                continue
+            if imported + len(chunk) >= MAX_IMPORT_ROWS:
+                raise ImportAborted(line, f'한 번에 최대 {MAX_IMPORT_ROWS}개까지 가져올 수 있습니다.')
+            chunk.append(row)
+            if len(chunk) >= IMPORT_CHUNK_SIZE:
+                _commit_chunk(user_id, chunk)
+                imported += len(chunk)
+                resume_after = line
+                chunk = []
+        if chunk:
+            _commit_chunk(user_id, chunk)
+            imported += len(chunk)
+            resume_after = line
+    except ImportAborted as e:
+        db.session.rollback()
+        e.imported, e.resume_after = imported, resume_after
+        raise
+    except BaseException:
+        db.session.rollback()
+        raise
+    return imported, skipped, errors, resume_after
+
+
+def _commit_chunk(user_id, rows):
+    """한 청크를 한 트랜잭션으로 INSERT하고 커밋"""
+    connection = db.session.connection()
+    # 가져온 행에 기록할 revision이 필요하므로 버전을 먼저 올린다
+    revision = bump_data_version(db.session, {user_id})[user_id]
+    deltas = {}
+    for row in rows:
+        row['revision'] = revision
+        key = completion_key(user_id, row['status'], row['completed_at'], row['category'])
+        if key is not None:
+            deltas[key] = deltas.get(key, 0) + 1
+    with deferred_fts_index(connection):
+        _insert_chunk(connection, rows)
+    apply_completion_deltas(connection, deltas)
+    db.session.commit()
+
+
+def _sqlite_datetime(value):
+    # SQLAlchemy의 SQLite DateTime 저장 형식과 같은 문자열
+    return value.isoformat(' ', 'microseconds') if value is not None else None
+
+
+def _insert_chunk(connection, rows):
+    if connection.dialect.name != 'sqlite':
+        connection.execute(Task.__table__.insert(), rows)
+        return
+    # SQLite에서는 Core가 행마다 하는 파라미터 처리를 건너뛰고 드라이버 executemany를 바로 호출
+    connection.exec_driver_sql(SQLITE_INSERT_SQL, [
+        (row['title'], row['description'], row['category'], row['priority'], row['status'],
+         _sqlite_datetime(row['created_at']), _sqlite_datetime(row['updated_at']),
+         _sqlite_datetime(row['completed_at']),
+         row['due_date'].isoformat() if row['due_date'] is not None else None, row['user_id'],
+         row['revision'])
+        for row in rows
+    ])
@@ -0,0 +1,249 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from flask_login import UserMixin
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+from app import db
+
+
+class CachedUser(UserMixin):
+    """current_user로 쓰이는 가벼운 사용자 레코드 (ORM 객체가 아님)"""
+    FIELDS = ('id', 'username', 'email', 'data_version')
+
+    def __init__(self, id, username, email, data_version):
+        self.id = id
+        self.username = username
+        self.email = email
+        self.data_version = data_version
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.FIELDS}
+
+    def __repr__(self):
+        return f'<CachedUser {self.username}>'
+
+
+def user_statement(user_id):
+    from app.models import User
+    return select(User.id, User.username, User.email, User.data_version).where(User.id == user_id)
+
+
+def version_statement(user_id):
+    """사용자의 현재 data_version (기본 키 조회 한 번)"""
+    from app.models import User
+    return select(User.data_version).where(User.id == user_id)
+
+
+class LocalBackend:
+    """프로세스 내 TTL + LRU 캐시
+
+    다른 워커 프로세스의 커밋으로는 무효화되지 않으므로 data_version은 TTL 동안 오래될 수 있다.
+    그래서 UserCache는 적중할 때마다 data_version을 DB에서 다시 읽는다.
+    """
+    shared = False
+
+    def __init__(self, max_entries=10000, ttl=60):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def get(self, user_id):
+        """(레코드 또는 None, 저장 토큰). 적중해도 버전을 다시 읽으므로 토큰은 쓰지 않는다"""
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None, None
+            expires_at, record = entry
+            if expires_at < time.monotonic():
+                del self._entries[user_id]
+                return None, None
+            self._entries.move_to_end(user_id)
+            return record, None
+
+    def set(self, user_id, record, token=None):
+        with self._lock:
+            self._entries[user_id] = (time.monotonic() + self.ttl, record)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, user_ids):
+        with self._lock:
+            for user_id in user_ids:
+                self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class RedisBackend:
+    """여러 워커가 공유하는 Redis 캐시 (redis-py 호환 클라이언트면 무엇이든 가능)
+
+    캐시 미스 후 DB에서 읽은 레코드를 저장하기 전에 다른 워커가 커밋하고 무효화하면, 옛 레코드가
+    무효화 뒤에 저장되어 TTL 동안 오래된 data_version이 쓰인다. 이를 막기 위해 무효화할 때마다
+    사용자별 세대 키를 올리고, 미스 때 읽어 둔 세대가 그대로일 때만 저장한다 (Lua로 원자적으로 비교).
+    """
+    shared = True
+    # KEYS: 레코드, 세대 / ARGV: 레코드 JSON, TTL, 미스 때 읽은 세대 (없었으면 '')
+    STORE_SCRIPT = (
+        "if (redis.call('GET', KEYS[2]) or '') == ARGV[3] then "
+        "redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2]) return 1 end return 0"
+    )
+
+    def __init__(self, client, ttl=60, prefix='todolist:user:'):
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+        self._store = client.register_script(self.STORE_SCRIPT)
+
+    @classmethod
+    def from_url(cls, url, **kwargs):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError('USER_CACHE_REDIS_URL을 사용하려면 redis 패키지가 필요합니다.')
+        return cls(redis.Redis.from_url(url), **kwargs)
+
+    def _generation_key(self, user_id):
+        return f'{self.prefix}{user_id}:generation'
+
+    def get(self, user_id):
+        """(레코드 또는 None, 저장 토큰) — 레코드와 무효화 세대를 한 번에 읽는다"""
+        value, generation = self.client.mget(f'{self.prefix}{user_id}', self._generation_key(user_id))
+        if value:
+            return json.loads(value), None
+        return None, generation.decode() if isinstance(generation, bytes) else (generation or '')
+
+    def set(self, user_id, record, token=None):
+        """token이 있으면 get 이후 무효화되지 않았을 때만 저장"""
+        if token is None:
+            self.client.set(f'{self.prefix}{user_id}', json.dumps(record), ex=self.ttl)
+            return
+        self._store(keys=[f'{self.prefix}{user_id}', self._generation_key(user_id)],
+                    args=[json.dumps(record), self.ttl, token])
+
+    def delete(self, user_ids):
+        if not user_ids:
+            return
+        # 세대 키는 미스 후 저장까지 걸릴 수 있는 시간보다 길게 (레코드 TTL만큼) 남긴다
+        pipe = self.client.pipeline()
+        for user_id in user_ids:
+            pipe.incr(self._generation_key(user_id))
+            pipe.expire(self._generation_key(user_id), self.ttl)
+        pipe.delete(*(f'{self.prefix}{user_id}' for user_id in user_ids))
+        pipe.execute()
+
+    def clear(self):
+        for key in self.client.scan_iter(f'{self.prefix}*'):
+            self.client.delete(key)
+
+
+class UserCache:
+    """id로 사용자 레코드를 캐시하는 로더
+
+    캐시 적중 시 ORM 객체를 만들지 않는다. 사용자 정보나 data_version이 바뀐 트랜잭션이
+    커밋되면 해당 사용자 항목을 무효화한다.
+
+    data_version은 ETag/304, 응답 캐시, single-flight의 검증 값이므로 다른 워커의 커밋을
+    놓치면 안 된다. 공유되지 않는 백엔드(LocalBackend)에서는 적중해도 data_version만 DB에서
+    다시 읽는다. 즉 요청마다 사용자 행 기본 키 조회 한 번은 그대로 남고, 줄어드는 것은 전체 행
+    조회와 ORM 객체 생성뿐이다. 사용자 쿼리 자체를 없애려면 공유 백엔드(Redis)를 써야 하며,
+    Redis 항목은 커밋 시 무효화되므로 적중하면 DB를 조회하지 않는다.
+    """
+
+    def __init__(self, backend=None):
+        self._lock = threading.Lock()
+        self.configure(backend or LocalBackend())
+
+    def configure(self, backend):
+        self.backend = backend
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+    @property
+    def verify_version(self):
+        """캐시 적중 시 data_version을 DB에서 다시 읽어야 하는지 (백엔드가 워커 간 공유되지 않음)"""
+        return not self.backend.shared
+
+    def load(self, user_id):
+        user, token = self.lookup(user_id)
+        if user is None:
+            return self.store(db.session.execute(user_statement(user_id)).first(), token)
+        if self.verify_version:
+            return self.refresh(user, db.session.execute(version_statement(user_id)).scalar())
+        return user
+
+    def lookup(self, user_id):
+        """(캐시된 사용자 또는 None, 미스일 때 store에 넘길 토큰). DB는 조회하지 않는다"""
+        record, token = self.backend.get(user_id)
+        with self._lock:
+            if record is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return (CachedUser(**record) if record is not None else None), token
+
+    def refresh(self, user, data_version):
+        """DB에서 읽은 data_version으로 캐시된 사용자를 갱신 (사용자 행이 없으면 None)"""
+        if data_version is None:
+            self.invalidate([user.id])
+            return None
+        if data_version != user.data_version:
+            user.data_version = data_version
+            self.backend.set(user.id, user.to_dict())
+        return user
+
+    def store(self, row, token=None):
+        """user_statement 결과 행을 캐시에 넣고 CachedUser로 반환 (행이 없으면 None)
+
+        token은 lookup이 돌려준 값으로, 그 사이 무효화되었으면 캐시에 넣지 않는다.
+        """
+        if row is None:
+            return None
+        user = CachedUser(row.id, row.username, row.email, row.data_version)
+        self.backend.set(user.id, user.to_dict(), token)
+        return user
+
+    def invalidate(self, user_ids):
+        self.backend.delete(list(user_ids))
+
+    def stats(self):
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        total = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_ratio': round(hits / total, 4) if total else 0.0
+        }
+
+
+user_cache = UserCache()
+
+
+def configure_user_cache(app):
+    """설정에 따라 캐시 백엔드를 선택 (USER_CACHE_REDIS_URL이 있으면 Redis 공유 캐시)"""
+    ttl = app.config.get('USER_CACHE_TTL', 60)
+    if app.config.get('USER_CACHE_REDIS_URL'):
+        backend = RedisBackend.from_url(app.config['USER_CACHE_REDIS_URL'], ttl=ttl)
+    else:
+        backend = LocalBackend(max_entries=app.config.get('USER_CACHE_MAX_ENTRIES', 10000), ttl=ttl)
+    user_cache.configure(backend)
+    app.extensions['user_cache'] = user_cache
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_changed_users(session):
+    user_ids = session.info.pop('changed_user_ids', None)
+    if user_ids:
+        user_cache.invalidate(user_ids)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_changed_users(session):
+    session.info.pop('changed_user_ids', None)
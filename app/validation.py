@@ -0,0 +1,58 @@
+from datetime import date, datetime
+from app.forms import TaskForm
+
+# TaskForm과 같은 규칙을 JSON/대량 입력에도 적용하기 위한 값 목록
+CATEGORIES = [value for value, _ in TaskForm.category.kwargs['choices']]
+PRIORITIES = [value for value, _ in TaskForm.priority.kwargs['choices']]
+TITLE_MAX_LENGTH = 200
+
+EDITABLE_FIELDS = ('title', 'description', 'category', 'priority', 'due_date')
+
+
+def parse_due_date(value):
+    """'YYYY-MM-DD' 문자열을 date로 변환 (빈 값은 None)"""
+    if not value:
+        return None
+    # 대량 가져오기에서 행마다 호출되므로 정확한 'YYYY-MM-DD'는 빠른 경로로 변환
+    if isinstance(value, str) and len(value) == 10 and value[4] == '-' and value[7] == '-':
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            pass
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    except (TypeError, ValueError):
+        raise ValueError('마감일 형식이 올바르지 않습니다. (YYYY-MM-DD)')
+
+
+def validate_task_data(data, partial=False):
+    """작업 입력값을 검증하고 정리된 필드 dict를 반환
+
+    partial=True 이면 수정 요청처럼 주어진 필드만 검증한다.
+    """
+    if not isinstance(data, dict):
+        raise ValueError('작업 데이터는 객체여야 합니다.')
+    
+    cleaned = {}
+    if 'title' in data or not partial:
+        title = (data.get('title') or '').strip()
+        if not title or len(title) > TITLE_MAX_LENGTH:
+            raise ValueError(f'제목은 1~{TITLE_MAX_LENGTH}자여야 합니다.')
+        cleaned['title'] = title
+    if 'description' in data or not partial:
+        cleaned['description'] = data.get('description') or ''
+    if 'category' in data or not partial:
+        if data.get('category') not in CATEGORIES:
+            raise ValueError('카테고리가 올바르지 않습니다.')
+        cleaned['category'] = data['category']
+    if 'priority' in data or not partial:
+        priority = data.get('priority') or 'medium'
+        if priority not in PRIORITIES:
+            raise ValueError('우선순위가 올바르지 않습니다.')
+        cleaned['priority'] = priority
+    if 'due_date' in data or not partial:
+        due_date = parse_due_date(data.get('due_date'))
+        # 기존 update_task와 같이 빈 마감일은 수정하지 않음
+        if due_date is not None or not partial:
+            cleaned['due_date'] = due_date
+    return cleaned
@@ -0,0 +1,15 @@
+"""ASGI 진입점 (비동기 읽기 라우트 + Flask 폴백, app/asgi.py 참고)
+
+    pip install -r requirements-optional.txt   # uvicorn, asgiref, aiosqlite, greenlet (고정 버전)
+    uvicorn asgi:app --host 0.0.0.0 --port 8000 --workers 4
+    gunicorn asgi:app -k uvicorn.workers.UvicornWorker -w 4 -b 0.0.0.0:8000
+
+워커 수는 CPU 코어 수 정도로 둔다. 비동기 경로는 워커당 이벤트 루프 하나로 처리되고,
+나머지 라우트는 워커마다 ASGI_WSGI_THREADS개 스레드에서 실행된다.
+기존 WSGI 배포는 그대로 사용할 수 있다.
+
+    gunicorn run:app -k gthread -w 4 --threads 8 -b 0.0.0.0:8000
+"""
+from app.asgi import create_asgi_app
+
+app = create_asgi_app()
@@ -0,0 +1,467 @@
+"""API 벤치마크/부하 테스트
+
+합성 DB(seed.py)를 만든 뒤 app/api.py의 모든 라우트를 두 가지 방식으로 측정한다.
+
+- client: Flask 테스트 클라이언트로 시나리오마다 순서대로 반복 (라우트별 지연 시간과 정확한 SQL 수)
+- http:   로컬 서버(또는 --url)에 여러 스레드로 가중치 섞인 요청을 보내는 부하 생성기
+
+결과는 p50/p95/p99 지연 시간, 처리량, SQL 수로 출력하고 --save로 JSON 기준선을 저장한다.
+--compare 기준선과 비교해 임계값을 넘는 회귀가 있으면 종료 코드 1로 끝난다.
+
+    python benchmarks/bench.py client --users 5 --tasks-per-user 2000 --save baseline.json
+    python benchmarks/bench.py http --threads 8 --seconds 10 --compare baseline-http.json
+    python benchmarks/bench.py compare baseline.json current.json --threshold 0.2
+"""
+import argparse
+import http.client
+import json
+import logging
+import os
+import platform
+import random
+import re
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from urllib.parse import urlsplit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from sqlalchemy import event  # noqa: E402
+
+from app import db  # noqa: E402
+from scenarios import SCENARIOS, WorkerState  # noqa: E402
+from seed import add_spec_arguments, create_seeded_app, spec_from_args  # noqa: E402
+
+SERVER_TIMING_SQL = re.compile(r'desc="(\d+) queries"')
+
+
+class TestClientTransport:
+    """Flask 테스트 클라이언트 (응답 본문까지 모두 읽은 시점까지 측정)"""
+
+    def __init__(self, app):
+        self.client = app.test_client()
+
+    def request(self, method, path, json_body=None, headers=None, first_chunk=False):
+        response = self.client.open(path, method=method, json=json_body, headers=headers)
+        try:
+            if first_chunk:
+                body = next(response.iter_encoded(), b'')
+            else:
+                body = response.get_data()
+        finally:
+            response.close()
+        return response.status_code, response.headers, body
+
+
+class HTTPTransport:
+    """keep-alive 연결 하나와 세션 쿠키를 유지하는 최소 HTTP 클라이언트"""
+
+    def __init__(self, base_url, timeout=30):
+        parts = urlsplit(base_url)
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.timeout = timeout
+        self.cookies = {}
+        self._connection = None
+
+    def _connect(self):
+        if self._connection is None:
+            self._connection = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        return self._connection
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def _store_cookies(self, response):
+        for header in response.headers.get_all('Set-Cookie') or ():
+            name, _, value = header.split(';', 1)[0].partition('=')
+            if value:
+                self.cookies[name] = value
+            else:
+                self.cookies.pop(name, None)
+
+    def request(self, method, path, json_body=None, headers=None, first_chunk=False):
+        request_headers = dict(headers or {})
+        body = None
+        if json_body is not None:
+            body = json.dumps(json_body).encode()
+            request_headers['Content-Type'] = 'application/json'
+        if self.cookies:
+            request_headers['Cookie'] = '; '.join(f'{name}={value}' for name, value in self.cookies.items())
+        for attempt in range(2):
+            connection = self._connect()
+            try:
+                connection.request(method, path, body=body, headers=request_headers)
+                response = connection.getresponse()
+                break
+            except (http.client.HTTPException, OSError):
+                # 서버가 닫은 keep-alive 연결이면 한 번만 다시 연결
+                self.close()
+                if attempt:
+                    raise
+        self._store_cookies(response)
+        if first_chunk:
+            data = response.readline()
+            self.close()
+        else:
+            data = response.read()
+            if response.will_close:
+                self.close()
+        return response.status, response.headers, data
+
+
+class SQLCounter:
+    """스레드별 SQL 실행 횟수 (테스트 클라이언트는 요청을 호출한 스레드에서 처리)"""
+
+    def __init__(self, engine):
+        self._local = threading.local()
+        event.listen(engine, 'before_cursor_execute', self._count)
+
+    def _count(self, *args):
+        self._local.count = getattr(self._local, 'count', 0) + 1
+
+    def value(self):
+        return getattr(self._local, 'count', 0)
+
+
+def server_timing_sql(headers):
+    """Server-Timing 헤더의 SQL 수 (스트리밍 응답은 본문 생성 중 쿼리가 빠짐)"""
+    match = SERVER_TIMING_SQL.search(headers.get('Server-Timing') or '')
+    return int(match.group(1)) if match else None
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(int(round(fraction * (len(sorted_values) - 1))), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+class Recorder:
+    def __init__(self):
+        self.samples = {}
+
+    def add(self, name, elapsed, ok, sql_count):
+        entry = self.samples.setdefault(name, {'latencies': [], 'errors': 0, 'sql': []})
+        entry['latencies'].append(elapsed)
+        if not ok:
+            entry['errors'] += 1
+        if sql_count is not None:
+            entry['sql'].append(sql_count)
+
+    def merge(self, other):
+        for name, entry in other.samples.items():
+            target = self.samples.setdefault(name, {'latencies': [], 'errors': 0, 'sql': []})
+            target['latencies'].extend(entry['latencies'])
+            target['errors'] += entry['errors']
+            target['sql'].extend(entry['sql'])
+
+    def summary(self, elapsed=None):
+        """시나리오별 요약. elapsed가 있으면(동시 부하) 벽시계 기준 처리량을 계산"""
+        scenarios = {}
+        for name, entry in sorted(self.samples.items()):
+            latencies = sorted(entry['latencies'])
+            sql = sorted(entry['sql'])
+            busy = sum(latencies)
+            scenarios[name] = {
+                'count': len(latencies),
+                'errors': entry['errors'],
+                'p50_ms': round(percentile(latencies, 0.50) * 1000, 3),
+                'p95_ms': round(percentile(latencies, 0.95) * 1000, 3),
+                'p99_ms': round(percentile(latencies, 0.99) * 1000, 3),
+                'mean_ms': round(busy / len(latencies) * 1000, 3) if latencies else 0.0,
+                'throughput': round(len(latencies) / (elapsed or busy), 2) if latencies and (elapsed or busy) else 0.0,
+                'sql_median': percentile(sql, 0.5) if sql else None,
+                'sql_max': sql[-1] if sql else None,
+            }
+        return scenarios
+
+
+def _run_once(scenario, transport, state, recorder, sql_counter=None):
+    if scenario.setup:
+        scenario.setup(transport, state)
+    before = sql_counter.value() if sql_counter else 0
+    started = time.perf_counter()
+    try:
+        status, headers, _ = scenario.run(transport, state)
+        ok = status in scenario.expected
+    except Exception:
+        headers, ok = {}, False
+    elapsed = time.perf_counter() - started
+    if sql_counter:
+        sql_count = sql_counter.value() - before
+    else:
+        sql_count = server_timing_sql(headers) if headers else None
+    recorder.add(scenario.name, elapsed, ok, sql_count)
+    if scenario.teardown:
+        scenario.teardown(transport, state)
+
+
+def select_scenarios(names):
+    if not names:
+        return SCENARIOS
+    wanted = set(names.split(','))
+    unknown = wanted - {scenario.name for scenario in SCENARIOS}
+    if unknown:
+        raise SystemExit(f'알 수 없는 시나리오: {", ".join(sorted(unknown))}')
+    return [scenario for scenario in SCENARIOS if scenario.name in wanted]
+
+
+def run_client(app, scenarios, iterations, warmup, seed):
+    """시나리오마다 warmup 후 iterations번 순서대로 실행 (사용자 bench0)"""
+    with app.app_context():
+        sql_counter = SQLCounter(db.engine)
+    transport = TestClientTransport(app)
+    state = WorkerState('bench0', random.Random(seed))
+    state.login(transport)
+    state.load_task_ids(transport)
+
+    recorder = Recorder()
+    for scenario in scenarios:
+        count = min(iterations, scenario.max_iterations or iterations)
+        for _ in range(min(warmup, count)):
+            _run_once(scenario, transport, state, Recorder())
+        for _ in range(count):
+            _run_once(scenario, transport, state, recorder, sql_counter)
+    return {'scenarios': recorder.summary()}
+
+
+def run_http(base_url, scenarios, threads, seconds, users, seed):
+    """threads개 작업자가 seconds 동안 가중치에 따라 시나리오를 골라 요청"""
+    recorders = [Recorder() for _ in range(threads)]
+    weights = [scenario.weight for scenario in scenarios]
+    ready = threading.Barrier(threads + 1)
+    start = threading.Event()
+    deadline = [0.0]
+    failures = []
+
+    def worker(index):
+        transport = HTTPTransport(base_url)
+        state = WorkerState(f'bench{index % users}', random.Random(seed + index))
+        try:
+            state.login(transport)
+            state.load_task_ids(transport)
+        except Exception as e:
+            failures.append(str(e))
+        ready.wait()
+        start.wait()
+        if failures:
+            return
+        while time.perf_counter() < deadline[0]:
+            scenario = state.rng.choices(scenarios, weights)[0]
+            _run_once(scenario, transport, state, recorders[index])
+        transport.close()
+
+    pool = [threading.Thread(target=worker, args=(index,), daemon=True) for index in range(threads)]
+    for thread in pool:
+        thread.start()
+    # 모든 작업자가 로그인을 마친 뒤 동시에 시작
+    ready.wait()
+    started = time.perf_counter()
+    deadline[0] = started + seconds
+    start.set()
+    for thread in pool:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    if failures:
+        raise SystemExit(f'작업자 준비 실패: {failures[0]}')
+
+    recorder = Recorder()
+    for item in recorders:
+        recorder.merge(item)
+    scenarios_summary = recorder.summary(elapsed)
+    total = sum(entry['count'] for entry in scenarios_summary.values())
+    errors = sum(entry['errors'] for entry in scenarios_summary.values())
+    latencies = sorted(value for entry in recorder.samples.values() for value in entry['latencies'])
+    return {
+        'scenarios': scenarios_summary,
+        'total': {
+            'count': total,
+            'errors': errors,
+            'elapsed_s': round(elapsed, 3),
+            'throughput': round(total / elapsed, 2) if elapsed else 0.0,
+            'p50_ms': round(percentile(latencies, 0.50) * 1000, 3),
+            'p95_ms': round(percentile(latencies, 0.95) * 1000, 3),
+            'p99_ms': round(percentile(latencies, 0.99) * 1000, 3),
+        }
+    }
+
+
+class LocalServer:
+    """werkzeug 멀티스레드 개발 서버를 백그라운드 스레드에서 실행"""
+
+    def __init__(self, app):
+        from werkzeug.serving import make_server
+        logging.getLogger('werkzeug').setLevel(logging.WARNING)
+        self.server = make_server('127.0.0.1', 0, app, threaded=True)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        return f'http://127.0.0.1:{self.server.server_port}'
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=os.path.dirname(__file__),
+            stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare_results(baseline, current, threshold, min_delta_ms=1.0):
+    """기준선 대비 회귀 목록 (p95 증가, 처리량 감소, SQL 수 증가)"""
+    regressions = []
+    base_scenarios = baseline.get('scenarios', {})
+    for name, entry in current.get('scenarios', {}).items():
+        base = base_scenarios.get(name)
+        if base is None or not entry['count'] or not base['count']:
+            continue
+        if (entry['p95_ms'] > base['p95_ms'] * (1 + threshold)
+                and entry['p95_ms'] - base['p95_ms'] >= min_delta_ms):
+            regressions.append((name, 'p95_ms', base['p95_ms'], entry['p95_ms']))
+        if entry['throughput'] < base['throughput'] * (1 - threshold):
+            regressions.append((name, 'throughput', base['throughput'], entry['throughput']))
+        if base.get('sql_median') is not None and entry.get('sql_median') is not None \
+                and entry['sql_median'] > base['sql_median']:
+            regressions.append((name, 'sql_median', base['sql_median'], entry['sql_median']))
+        if entry['errors'] > base['errors']:
+            regressions.append((name, 'errors', base['errors'], entry['errors']))
+    base_total, total = baseline.get('total'), current.get('total')
+    if base_total and total and total['throughput'] < base_total['throughput'] * (1 - threshold):
+        regressions.append(('(total)', 'throughput', base_total['throughput'], total['throughput']))
+    return regressions
+
+
+def print_report(result):
+    print(f'{"scenario":<26} {"count":>7} {"err":>5} {"p50 ms":>9} {"p95 ms":>9} '
+          f'{"p99 ms":>9} {"req/s":>9} {"sql":>5}')
+    for name, entry in result['scenarios'].items():
+        sql = '-' if entry['sql_median'] is None else entry['sql_median']
+        print(f'{name:<26} {entry["count"]:>7} {entry["errors"]:>5} {entry["p50_ms"]:>9.2f} '
+              f'{entry["p95_ms"]:>9.2f} {entry["p99_ms"]:>9.2f} {entry["throughput"]:>9.1f} {sql:>5}')
+    total = result.get('total')
+    if total:
+        print(f'{"(total)":<26} {total["count"]:>7} {total["errors"]:>5} {total["p50_ms"]:>9.2f} '
+              f'{total["p95_ms"]:>9.2f} {total["p99_ms"]:>9.2f} {total["throughput"]:>9.1f}')
+
+
+def print_regressions(regressions, threshold):
+    if not regressions:
+        print(f'\n회귀 없음 (임계값 {threshold:.0%})')
+        return
+    print(f'\n회귀 {len(regressions)}건 (임계값 {threshold:.0%}):')
+    for name, metric, before, after in regressions:
+        print(f'  {name:<26} {metric:<11} {before} -> {after}')
+
+
+def finish(result, args):
+    print_report(result)
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        print(f'\n저장: {args.save}')
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline['meta']['mode'] != result['meta']['mode']:
+            raise SystemExit('같은 모드(client/http)의 결과끼리만 비교할 수 있습니다.')
+        regressions = compare_results(baseline, result, args.threshold)
+        print_regressions(regressions, args.threshold)
+        if regressions:
+            raise SystemExit(1)
+
+
+def _metadata(args, spec=None):
+    meta = {
+        'mode': args.mode,
+        'revision': git_revision(),
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+    }
+    if spec is not None:
+        meta['seed'] = spec.to_dict()
+    return meta
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    subparsers = parser.add_subparsers(dest='mode', required=True)
+
+    def add_common(sub):
+        add_spec_arguments(sub)
+        sub.add_argument('--db', help='합성 DB 경로 (기본: 임시 디렉터리)')
+        sub.add_argument('--scenarios', help='쉼표로 구분한 시나리오 이름 (기본: 전체)')
+        sub.add_argument('--save', help='결과 JSON 저장 경로')
+        sub.add_argument('--compare', help='비교할 기준선 JSON')
+        sub.add_argument('--threshold', type=float, default=0.2, help='회귀로 볼 변화율 (기본 0.2)')
+
+    client = subparsers.add_parser('client', help='테스트 클라이언트로 라우트별 측정')
+    add_common(client)
+    client.add_argument('--iterations', type=int, default=50)
+    client.add_argument('--warmup', type=int, default=5)
+
+    load = subparsers.add_parser('http', help='멀티스레드 HTTP 부하 생성')
+    add_common(load)
+    load.add_argument('--threads', type=int, default=8)
+    load.add_argument('--seconds', type=float, default=10)
+    load.add_argument('--url', help='이미 실행 중인 서버 주소 (seed.py로 만든 DB를 사용 중이어야 함)')
+
+    compare = subparsers.add_parser('compare', help='저장된 두 결과 비교')
+    compare.add_argument('baseline')
+    compare.add_argument('current')
+    compare.add_argument('--threshold', type=float, default=0.2)
+
+    args = parser.parse_args()
+
+    if args.mode == 'compare':
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        with open(args.current, encoding='utf-8') as f:
+            current = json.load(f)
+        regressions = compare_results(baseline, current, args.threshold)
+        print_regressions(regressions, args.threshold)
+        raise SystemExit(1 if regressions else 0)
+
+    scenarios = select_scenarios(args.scenarios)
+    spec = spec_from_args(args)
+
+    if args.mode == 'http' and args.url:
+        result = run_http(args.url, scenarios, args.threads, args.seconds, args.users, args.seed)
+        result['meta'] = dict(_metadata(args), url=args.url)
+        finish(result, args)
+        return
+
+    path = args.db or os.path.join(tempfile.mkdtemp(prefix='todolist-bench-'), 'bench.db')
+    started = time.perf_counter()
+    app = create_seeded_app(path, spec)
+    print(f'합성 DB 준비: {spec.users}명 x {spec.tasks_per_user}개 ({time.perf_counter() - started:.1f}s)\n')
+
+    if args.mode == 'client':
+        result = run_client(app, scenarios, args.iterations, args.warmup, args.seed)
+        result['meta'] = dict(_metadata(args, spec), iterations=args.iterations)
+    else:
+        with LocalServer(app) as server:
+            result = run_http(server.url, scenarios, args.threads, args.seconds, spec.users, args.seed)
+        result['meta'] = dict(_metadata(args, spec), threads=args.threads, seconds=args.seconds)
+    finish(result, args)
+
+
+if __name__ == '__main__':
+    main()
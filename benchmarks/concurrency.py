@@ -0,0 +1,121 @@
+"""SQLite 동시 읽기/쓰기 처리량 비교 부하 테스트
+
+기본 SQLite 설정(rollback journal, busy timeout 없음)과 WAL 설정을 같은 부하로 실행해
+초당 처리량과 'database is locked' 오류 수를 비교한다. --shards를 주면 WAL 설정에 사용자별
+샤드 DB 파일 N개를 더한 모드도 실행한다 (쓰기 비율이 높을수록 차이가 크다).
+
+    python benchmarks/concurrency.py --threads 8 --seconds 5 --write-ratio 0.3 --shards 4
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app import create_app, db  # noqa: E402
+from app.models import User  # noqa: E402
+from app.sharding import shard_router  # noqa: E402
+
+MODES = {
+    'default': {
+        'SQLITE_JOURNAL_MODE': 'DELETE',
+        'SQLITE_SYNCHRONOUS': 'FULL',
+        'SQLITE_BUSY_TIMEOUT_MS': 0,
+        'SQLITE_MMAP_SIZE': 0,
+        'SQLITE_CACHE_SIZE': 0,
+    },
+    'wal': {},  # build_config의 기본값 (WAL, synchronous=NORMAL, busy timeout 등)
+}
+
+
+def run_mode(name, overrides, threads, seconds, write_ratio, shards=0):
+    directory = tempfile.mkdtemp(prefix=f'todolist-{name}-')
+    config = {
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': f'sqlite:///{os.path.join(directory, "load.db")}',
+        'SHARD_DATABASE_URLS': [f'sqlite:///{os.path.join(directory, f"shard{index}.db")}'
+                                for index in range(shards)],
+    }
+    config.update(overrides)
+    app = create_app(config)
+
+    with app.app_context():
+        for index in range(threads):
+            user = User(username=f'load{index}', email=f'load{index}@example.com')
+            user.set_password('password')
+            db.session.add(user)
+        db.session.commit()
+
+    counts = {'reads': 0, 'writes': 0, 'locked': 0, 'errors': 0}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def worker(index):
+        client = app.test_client()
+        client.post('/api/auth/login', json={'username': f'load{index}', 'password': 'password'})
+        task_ids = []
+        rng = random.Random(index)
+        local = {'reads': 0, 'writes': 0, 'locked': 0, 'errors': 0}
+        while time.perf_counter() < deadline:
+            if rng.random() < write_ratio or not task_ids:
+                if task_ids and rng.random() < 0.5:
+                    response = client.post(f'/api/tasks/{rng.choice(task_ids)}/toggle')
+                else:
+                    response = client.post('/api/tasks', json={'title': 'load', 'category': '공부'})
+                    if response.status_code == 201:
+                        task_ids.append(response.get_json()['task']['id'])
+                kind = 'writes'
+            else:
+                response = client.get('/api/tasks?limit=50')
+                response.get_data()
+                kind = 'reads'
+            if response.status_code < 400:
+                local[kind] += 1
+            elif b'locked' in response.get_data():
+                local['locked'] += 1
+            else:
+                local['errors'] += 1
+        with lock:
+            for key, value in local.items():
+                counts[key] += value
+
+    pool = [threading.Thread(target=worker, args=(index,)) for index in range(threads)]
+    started = time.perf_counter()
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    with app.app_context():
+        db.engine.dispose()
+    for engine in shard_router.engines:
+        engine.dispose()
+    total = counts['reads'] + counts['writes']
+    return dict(counts, mode=name, elapsed=elapsed, throughput=total / elapsed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--seconds', type=float, default=5)
+    parser.add_argument('--write-ratio', type=float, default=0.3)
+    parser.add_argument('--shards', type=int, default=0, help='WAL + 샤드 N개 모드도 실행 (0이면 생략)')
+    args = parser.parse_args()
+
+    modes = [(name, overrides, 0) for name, overrides in MODES.items()]
+    if args.shards:
+        modes.append((f'shards{args.shards}', {}, args.shards))
+    print(f'{"mode":<8} {"ops/s":>10} {"reads":>8} {"writes":>8} {"locked":>8} {"errors":>8}')
+    for name, overrides, shards in modes:
+        result = run_mode(name, overrides, args.threads, args.seconds, args.write_ratio, shards)
+        print(f'{result["mode"]:<8} {result["throughput"]:>10.1f} {result["reads"]:>8} '
+              f'{result["writes"]:>8} {result["locked"]:>8} {result["errors"]:>8}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,206 @@
+"""app/api.py의 모든 라우트를 호출하는 벤치마크 시나리오
+
+각 시나리오는 transport(테스트 클라이언트 또는 HTTP)와 작업자 상태를 받아 요청 하나를 보내고
+(status, headers, body)를 반환한다. 측정에 포함되지 않아야 하는 준비 요청(삭제할 작업 만들기,
+로그아웃 후 재로그인 등)은 setup/teardown에서 처리한다.
+"""
+import itertools
+import json
+from datetime import date, timedelta
+from urllib.parse import quote
+
+from seed import PASSWORD, WORDS
+
+_unique = itertools.count(1)
+
+
+class WorkerState:
+    """부하 작업자 한 명(로그인 세션 하나)의 상태"""
+
+    def __init__(self, username, rng):
+        self.username = username
+        self.rng = rng
+        self.task_ids = []
+        self.created_ids = []
+        self.cursor = None
+        self.etag = None
+        self.sync_token = None
+
+    def login(self, transport):
+        status, _, _ = transport.request('POST', '/api/auth/login',
+                                         {'username': self.username, 'password': PASSWORD})
+        if status != 200:
+            raise RuntimeError(f'{self.username} 로그인 실패 ({status})')
+
+    def load_task_ids(self, transport):
+        status, _, body = transport.request('GET', '/api/tasks?fields=id&limit=200')
+        if status != 200:
+            raise RuntimeError(f'작업 목록 조회 실패 ({status})')
+        data = json.loads(body)
+        self.task_ids = [task['id'] for task in data['tasks']]
+        self.cursor = data.get('next_cursor')
+
+
+class Scenario:
+    def __init__(self, name, run, weight=1, setup=None, teardown=None, max_iterations=None,
+                 expected=(200,)):
+        self.name = name
+        self.run = run
+        self.weight = weight
+        self.setup = setup
+        self.teardown = teardown
+        # 비밀번호 해시처럼 한 번에 수백 ms가 걸리는 시나리오는 반복 횟수를 제한
+        self.max_iterations = max_iterations
+        self.expected = expected
+
+
+def _get(path):
+    return lambda transport, state: transport.request('GET', path(state) if callable(path) else path)
+
+
+def _task_payload(state):
+    words = state.rng.sample(WORDS, 2)
+    payload = {
+        'title': ' '.join(words),
+        'description': f'벤치마크 {words[0]}',
+        'category': state.rng.choice(['회사일', '사이드프로젝트', '공부']),
+        'priority': state.rng.choice(['low', 'medium', 'high']),
+    }
+    if state.rng.random() < 0.5:
+        payload['due_date'] = (date.today() + timedelta(days=state.rng.randint(0, 30))).isoformat()
+    return payload
+
+
+def _month_range(state):
+    start = date.today().replace(day=1) - timedelta(days=state.rng.randint(0, 5) * 30)
+    return start.replace(day=1), (start + timedelta(days=42))
+
+
+def tasks_page2(state):
+    return f'/api/tasks?limit=50&cursor={state.cursor}' if state.cursor else '/api/tasks?limit=50'
+
+
+def tasks_filtered(state):
+    category = state.rng.choice(['회사일', '사이드프로젝트', '공부'])
+    return f'/api/tasks?category={quote(category)}&status=pending&limit=50'
+
+
+def search_path(state):
+    return f'/api/tasks/search?q={quote(state.rng.choice(WORDS))}'
+
+
+def heatmap_path(state):
+    end = date.today()
+    return f'/api/dashboard/heatmap?from={(end - timedelta(days=364)).isoformat()}&to={end.isoformat()}'
+
+
+def calendar_path(compact):
+    def build(state):
+        start, end = _month_range(state)
+        suffix = '&compact=1' if compact else ''
+        return f'/api/calendar/events?start={start.isoformat()}&end={end.isoformat()}{suffix}'
+    return build
+
+
+def tasks_not_modified(transport, state):
+    headers = {'If-None-Match': state.etag} if state.etag else None
+    status, response_headers, body = transport.request('GET', '/api/tasks?limit=50', headers=headers)
+    state.etag = response_headers.get('ETag') or state.etag
+    return status, response_headers, body
+
+
+def task_changes(transport, state):
+    """마지막 동기화 토큰 이후의 변경만 조회 (첫 요청은 전체 동기화)"""
+    path = f'/api/tasks/changes?since={state.sync_token}' if state.sync_token else '/api/tasks/changes'
+    status, headers, body = transport.request('GET', path)
+    if status == 200:
+        state.sync_token = json.loads(body)['sync_token']
+    return status, headers, body
+
+
+def create_task(transport, state):
+    status, headers, body = transport.request('POST', '/api/tasks', _task_payload(state))
+    if status == 201:
+        state.created_ids.append(json.loads(body)['task']['id'])
+    return status, headers, body
+
+
+def batch_create(transport, state):
+    operations = [{'op': 'create', 'data': _task_payload(state)} for _ in range(20)]
+    status, headers, body = transport.request('POST', '/api/tasks/batch', {'operations': operations})
+    if status == 200:
+        state.created_ids.extend(result['id'] for result in json.loads(body)['results'])
+    return status, headers, body
+
+
+def update_task(transport, state):
+    task_id = state.rng.choice(state.task_ids)
+    return transport.request('PUT', f'/api/tasks/{task_id}', {'title': f'수정 {state.rng.choice(WORDS)}'})
+
+
+def toggle_task(transport, state):
+    return transport.request('POST', f'/api/tasks/{state.rng.choice(state.task_ids)}/toggle')
+
+
+def ensure_created_task(transport, state):
+    if not state.created_ids:
+        create_task(transport, state)
+
+
+def delete_task(transport, state):
+    return transport.request('DELETE', f'/api/tasks/{state.created_ids.pop()}')
+
+
+def login(transport, state):
+    return transport.request('POST', '/api/auth/login', {'username': state.username, 'password': PASSWORD})
+
+
+def register(transport, state):
+    name = f'{state.username}-r{next(_unique)}-{state.rng.randrange(10 ** 9)}'
+    return transport.request('POST', '/api/auth/register',
+                             {'username': name, 'email': f'{name}@example.com', 'password': PASSWORD})
+
+
+def logout(transport, state):
+    return transport.request('POST', '/api/auth/logout')
+
+
+def relogin(transport, state):
+    state.login(transport)
+
+
+def stream_first_event(transport, state):
+    """SSE 연결 후 첫 청크(retry 지시)까지의 시간"""
+    return transport.request('GET', '/api/stream', first_chunk=True)
+
+
+SCENARIOS = [
+    Scenario('auth.login', login, weight=1, max_iterations=10),
+    Scenario('auth.register', register, weight=1, max_iterations=10, expected=(201,)),
+    Scenario('auth.logout', logout, weight=1, teardown=relogin, max_iterations=10),
+    Scenario('auth.me', _get('/api/auth/me'), weight=5),
+    Scenario('system.user_cache', _get('/api/system/user-cache'), weight=1),
+    Scenario('tasks.list', _get('/api/tasks?limit=50'), weight=30),
+    Scenario('tasks.list.page2', _get(tasks_page2), weight=5),
+    Scenario('tasks.list.fields', _get('/api/tasks?limit=200&fields=id,title,status'), weight=5),
+    Scenario('tasks.list.filtered', _get(tasks_filtered), weight=5),
+    Scenario('tasks.list.archived', _get('/api/tasks?limit=50&include_archived=1'), weight=2),
+    Scenario('tasks.list.not_modified', tasks_not_modified, weight=10, expected=(200, 304)),
+    Scenario('tasks.changes', task_changes, weight=10),
+    Scenario('tasks.search', _get(search_path), weight=5),
+    Scenario('tasks.create', create_task, weight=5, expected=(201,)),
+    Scenario('tasks.batch', batch_create, weight=1),
+    Scenario('tasks.update', update_task, weight=3),
+    Scenario('tasks.toggle', toggle_task, weight=5),
+    Scenario('tasks.delete', delete_task, weight=3, setup=ensure_created_task),
+    Scenario('tasks.export', _get('/api/tasks/export'), weight=1, max_iterations=50),
+    Scenario('dashboard.statistics', _get('/api/dashboard/statistics'), weight=10),
+    Scenario('dashboard.recent_tasks', _get('/api/dashboard/recent-tasks'), weight=10),
+    Scenario('dashboard.bootstrap', _get('/api/dashboard/bootstrap'), weight=10),
+    Scenario('analytics', _get('/api/analytics'), weight=3),
+    Scenario('analytics.monthly', _get('/api/analytics?period=month'), weight=1),
+    Scenario('dashboard.heatmap', _get(heatmap_path), weight=3),
+    Scenario('calendar.events', _get(calendar_path(False)), weight=5),
+    Scenario('calendar.events.compact', _get(calendar_path(True)), weight=5),
+    Scenario('stream.connect', stream_first_event, weight=1, max_iterations=20),
+]
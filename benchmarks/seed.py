@@ -0,0 +1,178 @@
+"""벤치마크용 합성 데이터베이스 생성
+
+사용자 수, 사용자당 작업 수, 카테고리/상태/마감일 분포를 지정해 재현 가능한(seed 고정)
+SQLite 데이터베이스를 만든다. 모든 사용자의 비밀번호는 'password'이다.
+
+    python benchmarks/seed.py /tmp/bench.db --users 20 --tasks-per-user 2000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from sqlalchemy import insert  # noqa: E402
+from werkzeug.security import generate_password_hash  # noqa: E402
+
+from app import create_app, db  # noqa: E402
+from app.migrations import rebuild_daily_completions  # noqa: E402
+from app.models import Task, User  # noqa: E402
+from app.search import deferred_fts_index  # noqa: E402
+from app.validation import CATEGORIES, PRIORITIES  # noqa: E402
+
+PASSWORD = 'password'
+INSERT_CHUNK_SIZE = 5000
+WORDS = ('보고서', '회의', '리뷰', '배포', '정리', '알고리즘', '영어', '운동', '독서', '기획',
+         'refactor', 'deploy', 'review', 'report', 'meeting', 'study', 'project', 'release')
+
+
+def parse_weights(value, choices):
+    """'공부:3,회사일:1' 형식의 가중치 문자열 (빈 값이면 균등 분포)"""
+    if not value:
+        return {choice: 1.0 for choice in choices}
+    weights = {}
+    for part in value.split(','):
+        name, _, weight = part.partition(':')
+        if name not in choices:
+            raise ValueError(f'알 수 없는 값입니다: {name} (가능한 값: {", ".join(choices)})')
+        weights[name] = float(weight or 1)
+    return weights
+
+
+class SeedSpec:
+    """합성 데이터 분포 설정"""
+
+    def __init__(self, users=10, tasks_per_user=1000, days=365, completed_ratio=0.4,
+                 due_ratio=0.5, due_spread_days=60, categories=None, priorities=None, seed=42):
+        self.users = users
+        self.tasks_per_user = tasks_per_user
+        self.days = days
+        self.completed_ratio = completed_ratio
+        self.due_ratio = due_ratio
+        self.due_spread_days = due_spread_days
+        self.categories = parse_weights(categories, CATEGORIES)
+        self.priorities = parse_weights(priorities, PRIORITIES)
+        self.seed = seed
+
+    def to_dict(self):
+        return dict(vars(self))
+
+
+def _task_rows(rng, spec, user_id, now):
+    categories, category_weights = zip(*spec.categories.items())
+    priorities, priority_weights = zip(*spec.priorities.items())
+    for _ in range(spec.tasks_per_user):
+        created_at = now - timedelta(seconds=rng.randrange(spec.days * 86400))
+        completed = rng.random() < spec.completed_ratio
+        completed_at = None
+        if completed:
+            completed_at = min(created_at + timedelta(seconds=rng.randrange(14 * 86400)), now)
+        due_date = None
+        if rng.random() < spec.due_ratio:
+            offset = rng.randint(-spec.due_spread_days, spec.due_spread_days)
+            due_date = (created_at + timedelta(days=offset)).date()
+        words = rng.sample(WORDS, 3)
+        yield {
+            'title': ' '.join(words),
+            'description': f'{words[0]} 관련 작업 메모 {rng.randrange(10000)}' if rng.random() < 0.7 else None,
+            'category': rng.choices(categories, category_weights)[0],
+            'priority': rng.choices(priorities, priority_weights)[0],
+            'status': 'completed' if completed else 'pending',
+            'created_at': created_at,
+            'updated_at': completed_at or created_at,
+            'completed_at': completed_at,
+            'due_date': due_date,
+            'user_id': user_id,
+        }
+
+
+def seed_database(engine, spec):
+    """빈 스키마에 사용자와 작업을 대량 삽입하고 완료 집계를 다시 계산
+
+    ORM 이벤트(집계/버전 갱신)를 거치지 않는 Core executemany로 넣은 뒤
+    DailyCompletion을 한 번에 재계산한다. FTS 색인은 삽입이 끝난 뒤 한 번에 채운다.
+    """
+    rng = random.Random(spec.seed)
+    now = datetime.utcnow()
+    password_hash = generate_password_hash(PASSWORD)
+    with engine.begin() as conn:
+        user_ids = conn.execute(
+            insert(User).returning(User.id, sort_by_parameter_order=True),
+            [
+                {'username': f'bench{index}', 'email': f'bench{index}@example.com',
+                 'password_hash': password_hash, 'created_at': now, 'data_version': 0}
+                for index in range(spec.users)
+            ]
+        ).scalars().all()
+
+        with deferred_fts_index(conn):
+            chunk = []
+            for user_id in user_ids:
+                for row in _task_rows(rng, spec, user_id, now):
+                    chunk.append(row)
+                    if len(chunk) >= INSERT_CHUNK_SIZE:
+                        conn.execute(insert(Task), chunk)
+                        chunk = []
+            if chunk:
+                conn.execute(insert(Task), chunk)
+    rebuild_daily_completions(engine)
+    return user_ids
+
+
+def create_seeded_app(path, spec, overrides=None):
+    """path에 새 SQLite DB를 만들고 spec대로 채운 앱을 반환"""
+    for suffix in ('', '-wal', '-shm'):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    config = {
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': f'sqlite:///{os.path.abspath(path)}',
+        # 같은 계정으로 반복 로그인하므로 로그인 시도 제한은 끈다
+        'LOGIN_USER_BURST': 0,
+        'LOGIN_IP_BURST': 0,
+    }
+    config.update(overrides or {})
+    app = create_app(config)
+    with app.app_context():
+        seed_database(db.engine, spec)
+    return app
+
+
+def add_spec_arguments(parser):
+    parser.add_argument('--users', type=int, default=10)
+    parser.add_argument('--tasks-per-user', type=int, default=1000)
+    parser.add_argument('--days', type=int, default=365, help='작업 생성일 분포 기간(일)')
+    parser.add_argument('--completed-ratio', type=float, default=0.4)
+    parser.add_argument('--due-ratio', type=float, default=0.5, help='마감일이 있는 작업 비율')
+    parser.add_argument('--due-spread-days', type=int, default=60, help='생성일 기준 마감일 범위(±일)')
+    parser.add_argument('--categories', help="카테고리 가중치 (예: '공부:3,회사일:1')")
+    parser.add_argument('--priorities', help="우선순위 가중치 (예: 'high:1,medium:3,low:1')")
+    parser.add_argument('--seed', type=int, default=42)
+
+
+def spec_from_args(args):
+    return SeedSpec(
+        users=args.users, tasks_per_user=args.tasks_per_user, days=args.days,
+        completed_ratio=args.completed_ratio, due_ratio=args.due_ratio,
+        due_spread_days=args.due_spread_days, categories=args.categories,
+        priorities=args.priorities, seed=args.seed
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('path', help='생성할 SQLite 파일 경로 (있으면 덮어씀)')
+    add_spec_arguments(parser)
+    args = parser.parse_args()
+
+    spec = spec_from_args(args)
+    started = time.perf_counter()
+    create_seeded_app(args.path, spec)
+    print(f'{spec.users}명 x {spec.tasks_per_user}개 작업 생성 ({time.perf_counter() - started:.1f}s): {args.path}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""작업 내보내기/가져오기 처리량과 메모리 측정
+
+한 사용자에게 --tasks개 작업을 만든 뒤 GET /api/tasks/export를 스트리밍으로 끝까지 읽으며
+Python 힙 최대 사용량(tracemalloc)을 재고, 내보낸 NDJSON/CSV를 다른 사용자로
+POST /api/tasks/import 해 초당 가져온 행 수를 잰다.
+
+    python benchmarks/transfer.py --tasks 1000000 --format ndjson
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from seed import PASSWORD, SeedSpec, create_seeded_app  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--tasks', type=int, default=200000)
+    parser.add_argument('--format', choices=('ndjson', 'csv'), default='ndjson')
+    parser.add_argument('--db', help='합성 DB 경로 (기본: 임시 디렉터리)')
+    args = parser.parse_args()
+
+    path = args.db or os.path.join(tempfile.mkdtemp(prefix='todolist-transfer-'), 'transfer.db')
+    started = time.perf_counter()
+    app = create_seeded_app(path, SeedSpec(users=1, tasks_per_user=args.tasks))
+    print(f'합성 DB 준비: {args.tasks}개 ({time.perf_counter() - started:.1f}s)')
+
+    exporter = app.test_client()
+    exporter.post('/api/auth/login', json={'username': 'bench0', 'password': PASSWORD})
+    export_path = os.path.join(os.path.dirname(path), f'export.{args.format}')
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    response = exporter.get(f'/api/tasks/export?format={args.format}')
+    size = 0
+    with open(export_path, 'wb') as f:
+        for chunk in response.response:
+            f.write(chunk)
+            size += len(chunk)
+    response.close()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f'내보내기: {args.tasks / elapsed:,.0f} rows/s, {size / 1024 / 1024:.1f} MiB, '
+          f'최대 힙 {peak / 1024 / 1024:.1f} MiB')
+
+    importer = app.test_client()
+    importer.post('/api/auth/register', json={'username': 'importer', 'email': 'importer@example.com',
+                                              'password': PASSWORD})
+    importer.post('/api/auth/login', json={'username': 'importer', 'password': PASSWORD})
+    with open(export_path, 'rb') as f:
+        started = time.perf_counter()
+        response = importer.post(f'/api/tasks/import?format={args.format}', data=f)
+        elapsed = time.perf_counter() - started
+    result = response.get_json()
+    if response.status_code != 200:
+        raise SystemExit(f'가져오기 실패: {result}')
+    print(f'가져오기: {result["imported"] / elapsed:,.0f} rows/s ({result["imported"]}개, {elapsed:.1f}s)')
+
+
+if __name__ == '__main__':
+    main()
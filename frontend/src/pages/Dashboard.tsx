@@ -1,6 +1,6 @@
 import React, { useState, useEffect } from 'react';
-import { dashboardAPI, calendarAPI } from '../services/api';
-import { Statistics, Task, CalendarEvent } from '../types';
+import { dashboardAPI, calendarAPI, subscribeToTaskEvents } from '../services/api';
+import { Statistics, Task, CalendarEvent, TaskEvent } from '../types';
 import Calendar from 'react-calendar';
 import 'react-calendar/dist/Calendar.css';
 
@@ -13,20 +13,44 @@ const Dashboard: React.FC = () => {
 
   useEffect(() => {
     loadDashboardData();
+    return subscribeToTaskEvents({
+      onEvent: applyTaskEvent,
+      onResync: loadDashboardData,
+    });
   }, []);
 
+  // 서버 이벤트의 통계 증감과 작업 변경을 다시 불러오지 않고 반영
+  const applyTaskEvent = (event: TaskEvent) => {
+    const delta = event.statistics_delta;
+    if (delta) {
+      setStatistics((current) => current && {
+        total_tasks: current.total_tasks + delta.total_tasks,
+        completed_tasks: current.completed_tasks + delta.completed_tasks,
+        pending_tasks: current.pending_tasks + delta.pending_tasks,
+        today_completed: current.today_completed + delta.today_completed,
+      });
+    }
+    if (event.type === 'task.created') {
+      // 최근 작업 목록은 서버 형식(MM/DD HH:mm)이 달라 다시 불러옴
+      dashboardAPI.getRecentTasks().then((data) => setRecentTasks(data.tasks));
+    } else if (event.type === 'task.deleted') {
+      setRecentTasks((current) => current.filter((task) => task.id !== event.task.id));
+    } else {
+      setRecentTasks((current) => current.map((task) => (
+        task.id === event.task.id ? { ...task, status: event.task.status ?? task.status, title: event.task.title ?? task.title } : task
+      )));
+    }
+  };
+
   const loadDashboardData = async () => {
     try {
       setLoading(true);
-      const [statsData, recentData, eventsData] = await Promise.all([
-        dashboardAPI.getStatistics(),
-        dashboardAPI.getRecentTasks(),
-        calendarAPI.getEvents(),
-      ]);
+      // 첫 화면에 필요한 데이터는 bootstrap 요청 한 번으로 받음
+      const data = await dashboardAPI.getBootstrap(['statistics', 'recent_tasks', 'calendar']);
 
-      setStatistics(statsData);
-      setRecentTasks(recentData.tasks);
-      setCalendarEvents(eventsData.events);
+      setStatistics(data.statistics ?? null);
+      setRecentTasks(data.recent_tasks ?? []);
+      setCalendarEvents(data.calendar?.events ?? []);
     } catch (error) {
       console.error('Dashboard data loading error:', error);
     } finally {
@@ -34,6 +58,21 @@ const Dashboard: React.FC = () => {
     }
   };
 
+  // 다른 달로 이동하면 그 달의 이벤트만 조회
+  const loadMonthEvents = async (activeStartDate: Date | null) => {
+    if (!activeStartDate) return;
+    const first = new Date(activeStartDate.getFullYear(), activeStartDate.getMonth(), 1);
+    const last = new Date(activeStartDate.getFullYear(), activeStartDate.getMonth() + 1, 0);
+    const format = (date: Date) =>
+      `${date.getFullYear()}-${String(date.getMonth() + 1).padStart(2, '0')}-${String(date.getDate()).padStart(2, '0')}`;
+    try {
+      const response = await calendarAPI.getEvents(format(first), format(last), true);
+      setCalendarEvents(response.events);
+    } catch (error) {
+      console.error('Calendar events loading error:', error);
+    }
+  };
+
   const getCategoryColor = (category: string) => {
     switch (category) {
       case '회사일':
@@ -168,6 +207,7 @@ const Dashboard: React.FC = () => {
               <Calendar
                 onChange={(value) => setCalendarDate(value as Date)}
                 value={calendarDate}
+                onActiveStartDateChange={({ activeStartDate }) => loadMonthEvents(activeStartDate)}
                 tileContent={getTileContent}
                 className="react-calendar-custom"
               />
@@ -1,7 +1,63 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import { Link, useSearchParams } from 'react-router-dom';
-import { tasksAPI } from '../services/api';
-import { Task } from '../types';
+import { tasksAPI, subscribeToTaskEvents } from '../services/api';
+import { DueWindow, Task, TaskEvent, TaskListQuery, TaskSort } from '../types';
+
+// 서버 목록 조회(app/queries.py)와 같은 필터/정렬 규칙: 서버 이벤트를 현재 목록에 반영할 때 사용
+const PRIORITY_RANKS = { low: 0, medium: 1, high: 2 };
+const SORT_DESCENDING: Record<TaskSort, boolean> = {
+  created_at: true,
+  updated_at: true,
+  due_date: false,
+  priority: true,
+};
+
+const formatDate = (date: Date) =>
+  `${date.getFullYear()}-${String(date.getMonth() + 1).padStart(2, '0')}-${String(date.getDate()).padStart(2, '0')}`;
+
+const matchesDue = (task: Task, window: DueWindow, today: Date) => {
+  const todayText = formatDate(today);
+  switch (window) {
+    case 'overdue':
+      return task.due_date !== null && task.due_date < todayText && task.status !== 'completed';
+    case 'today':
+      return task.due_date === todayText;
+    case 'week': {
+      // 이번 주 월~일
+      const monday = new Date(today);
+      monday.setDate(today.getDate() - ((today.getDay() + 6) % 7));
+      const sunday = new Date(monday);
+      sunday.setDate(monday.getDate() + 6);
+      return task.due_date !== null && task.due_date >= formatDate(monday) && task.due_date <= formatDate(sunday);
+    }
+    default:
+      return task.due_date === null;
+  }
+};
+
+const matchesQuery = (task: Task, query: TaskListQuery) => {
+  const today = new Date();
+  return (!query.category?.length || query.category.includes(task.category))
+    && (!query.status?.length || query.status.includes(task.status))
+    && (!query.priority?.length || query.priority.includes(task.priority))
+    && (!query.due?.length || query.due.some((window) => matchesDue(task, window, today)));
+};
+
+const sortValue = (task: Task, sort: TaskSort): string | number | null =>
+  sort === 'priority' ? PRIORITY_RANKS[task.priority] : task[sort];
+
+// (정렬 키, id) 순서, 마감일이 없는 작업은 방향과 관계없이 마지막
+const compareTasks = (sort: TaskSort) => (a: Task, b: Task) => {
+  const direction = SORT_DESCENDING[sort] ? -1 : 1;
+  const left = sortValue(a, sort);
+  const right = sortValue(b, sort);
+  if (left !== right) {
+    if (left === null) return 1;
+    if (right === null) return -1;
+    return (left < right ? -1 : 1) * direction;
+  }
+  return (a.id - b.id) * direction;
+};
 
 const Tasks: React.FC = () => {
   const [tasks, setTasks] = useState<Task[]>([]);
@@ -9,7 +65,11 @@ const Tasks: React.FC = () => {
   const [loading, setLoading] = useState(true);
   const [selectedCategory, setSelectedCategory] = useState<string>('all');
   const [selectedStatus, setSelectedStatus] = useState<string>('all');
+  const [selectedPriority, setSelectedPriority] = useState<string>('all');
+  const [selectedDue, setSelectedDue] = useState<string>('all');
+  const [sort, setSort] = useState<TaskSort>('created_at');
   const [searchQuery, setSearchQuery] = useState<string>('');
+  const [searchMatches, setSearchMatches] = useState<Set<number> | null>(null);
   const [searchParams] = useSearchParams();
 
   const categories = ['회사일', '사이드프로젝트', '공부'];
@@ -18,10 +78,36 @@ const Tasks: React.FC = () => {
     { value: 'in_progress', label: '진행 중' },
     { value: 'completed', label: '완료' }
   ];
+  const priorities = [
+    { value: 'high', label: '높음' },
+    { value: 'medium', label: '보통' },
+    { value: 'low', label: '낮음' }
+  ];
+  const dueWindows = [
+    { value: 'overdue', label: '지연' },
+    { value: 'today', label: '오늘' },
+    { value: 'week', label: '이번 주' },
+    { value: 'none', label: '마감일 없음' }
+  ];
+  const sorts = [
+    { value: 'created_at', label: '최근 생성순' },
+    { value: 'updated_at', label: '최근 수정순' },
+    { value: 'due_date', label: '마감일순' },
+    { value: 'priority', label: '우선순위순' }
+  ];
+
+  // 필터/정렬은 서버에서 처리하므로 바뀔 때마다 해당 목록만 다시 조회
+  const query: TaskListQuery = {
+    category: selectedCategory !== 'all' ? [selectedCategory] : [],
+    status: selectedStatus !== 'all' ? [selectedStatus] : [],
+    priority: selectedPriority !== 'all' ? [selectedPriority as 'low' | 'medium' | 'high'] : [],
+    due: selectedDue !== 'all' ? [selectedDue as DueWindow] : [],
+    sort,
+  };
+  const queryRef = useRef(query);
+  queryRef.current = query;
 
   useEffect(() => {
-    loadTasks();
-    
     // URL 파라미터에서 카테고리 설정
     const categoryParam = searchParams.get('category');
     if (categoryParam && categories.includes(categoryParam)) {
@@ -29,14 +115,50 @@ const Tasks: React.FC = () => {
     }
   }, [searchParams]);
 
+  useEffect(() => {
+    // 다른 탭이나 이 탭에서의 변경을 서버 이벤트로 받아 목록에 바로 반영
+    return subscribeToTaskEvents({
+      onEvent: applyTaskEvent,
+      onResync: loadTasks,
+    });
+  }, []);
+
+  useEffect(() => {
+    // 검색은 서버 전문 검색 색인으로 처리 (입력이 멈춘 뒤 요청)
+    const query = searchQuery.trim();
+    if (!query) {
+      setSearchMatches(null);
+      return;
+    }
+    const timer = setTimeout(async () => {
+      try {
+        const ids = new Set<number>();
+        let offset: number | null = 0;
+        while (offset !== null && ids.size < 500) {
+          const response = await tasksAPI.searchTasks(query, offset);
+          response.tasks.forEach((task) => ids.add(task.id));
+          offset = response.next_offset;
+        }
+        setSearchMatches(ids);
+      } catch (error) {
+        console.error('Task search error:', error);
+      }
+    }, 300);
+    return () => clearTimeout(timer);
+  }, [searchQuery]);
+
+  useEffect(() => {
+    loadTasks();
+  }, [selectedCategory, selectedStatus, selectedPriority, selectedDue, sort]);
+
   useEffect(() => {
     filterTasks();
-  }, [tasks, selectedCategory, selectedStatus, searchQuery]);
+  }, [tasks, searchMatches]);
 
   const loadTasks = async () => {
     try {
       setLoading(true);
-      const response = await tasksAPI.getTasks();
+      const response = await tasksAPI.getTasks(queryRef.current);
       setTasks(response.tasks);
     } catch (error) {
       console.error('Tasks loading error:', error);
@@ -45,22 +167,28 @@ const Tasks: React.FC = () => {
     }
   };
 
-  const filterTasks = () => {
-    let filtered = [...tasks];
-
-    if (selectedCategory !== 'all') {
-      filtered = filtered.filter(task => task.category === selectedCategory);
-    }
+  const applyTaskEvent = (event: TaskEvent) => {
+    // 현재 필터에 맞지 않게 된 작업은 빼고, 새로 맞게 된 작업은 정렬 위치에 넣는다
+    const { sort = 'created_at' } = queryRef.current;
+    setTasks((current) => {
+      const others = current.filter((task) => task.id !== event.task.id);
+      if (event.type === 'task.deleted') {
+        return others;
+      }
+      const previous = current.find((task) => task.id === event.task.id);
+      const task = { ...previous, ...event.task } as Task;
+      if (!matchesQuery(task, queryRef.current)) {
+        return others;
+      }
+      return [...others, task].sort(compareTasks(sort));
+    });
+  };
 
-    if (selectedStatus !== 'all') {
-      filtered = filtered.filter(task => task.status === selectedStatus);
-    }
+  const filterTasks = () => {
+    let filtered = tasks;
 
-    if (searchQuery.trim()) {
-      filtered = filtered.filter(task =>
-        task.title.toLowerCase().includes(searchQuery.toLowerCase()) ||
-        task.description.toLowerCase().includes(searchQuery.toLowerCase())
-      );
+    if (searchMatches) {
+      filtered = filtered.filter(task => searchMatches.has(task.id));
     }
 
     setFilteredTasks(filtered);
@@ -69,8 +197,7 @@ const Tasks: React.FC = () => {
   const handleStatusChange = async (taskId: number, newStatus: string) => {
     try {
       const updatedTask = { status: newStatus };
-      await tasksAPI.updateTask(taskId, updatedTask);
-      await loadTasks(); // 다시 로드
+      await tasksAPI.updateTask(taskId, updatedTask); // 변경 내용은 서버 이벤트로 반영됨
     } catch (error) {
       console.error('Status update error:', error);
     }
@@ -79,8 +206,7 @@ const Tasks: React.FC = () => {
   const handleDeleteTask = async (taskId: number) => {
     if (window.confirm('정말로 이 작업을 삭제하시겠습니까?')) {
       try {
-        await tasksAPI.deleteTask(taskId);
-        await loadTasks(); // 다시 로드
+        await tasksAPI.deleteTask(taskId); // 삭제는 서버 이벤트로 반영됨
       } catch (error) {
         console.error('Task deletion error:', error);
       }
@@ -176,7 +302,47 @@ const Tasks: React.FC = () => {
                     ))}
                   </select>
                 </div>
-                <div className="col-md-6">
+                <div className="col-md-3">
+                  <label className="form-label">우선순위</label>
+                  <select
+                    className="form-select"
+                    value={selectedPriority}
+                    onChange={(e) => setSelectedPriority(e.target.value)}
+                  >
+                    <option value="all">전체</option>
+                    {priorities.map(priority => (
+                      <option key={priority.value} value={priority.value}>{priority.label}</option>
+                    ))}
+                  </select>
+                </div>
+                <div className="col-md-3">
+                  <label className="form-label">마감</label>
+                  <select
+                    className="form-select"
+                    value={selectedDue}
+                    onChange={(e) => setSelectedDue(e.target.value)}
+                  >
+                    <option value="all">전체</option>
+                    {dueWindows.map(window => (
+                      <option key={window.value} value={window.value}>{window.label}</option>
+                    ))}
+                  </select>
+                </div>
+              </div>
+              <div className="row mt-3">
+                <div className="col-md-3">
+                  <label className="form-label">정렬</label>
+                  <select
+                    className="form-select"
+                    value={sort}
+                    onChange={(e) => setSort(e.target.value as TaskSort)}
+                  >
+                    {sorts.map(option => (
+                      <option key={option.value} value={option.value}>{option.label}</option>
+                    ))}
+                  </select>
+                </div>
+                <div className="col-md-9">
                   <label className="form-label">검색</label>
                   <div className="input-group">
                     <span className="input-group-text">
@@ -1,5 +1,5 @@
 import axios from 'axios';
-import { User, Task, LoginData, RegisterData, TaskFormData, Statistics, CalendarEvent } from '../types';
+import { Analytics, User, Task, LoginData, RegisterData, TaskFormData, Statistics, CalendarEvent, DashboardBootstrap, Heatmap, TaskChanges, TaskEvent, TaskListQuery, TaskSearchResult } from '../types';
 
 const API_BASE_URL = 'http://localhost:5000/api';
 
@@ -37,12 +37,41 @@ export const authAPI = {
 
 // Tasks API
 export const tasksAPI = {
-  getTasks: async (category?: string, status?: string): Promise<{ tasks: Task[] }> => {
+  getTasks: async (query: TaskListQuery = {}): Promise<{ tasks: Task[] }> => {
+    // 필터와 정렬은 서버 인덱스로 처리 (여러 값은 쉼표로 묶어 전달)
     const params = new URLSearchParams();
-    if (category && category !== 'all') params.append('category', category);
-    if (status && status !== 'all') params.append('status', status);
+    (['category', 'status', 'priority', 'due'] as const).forEach((key) => {
+      const values = query[key];
+      if (values && values.length > 0) params.append(key, values.join(','));
+    });
+    if (query.sort) params.append('sort', query.sort);
+    if (query.order) params.append('order', query.order);
+    if (query.includeArchived) params.append('include_archived', '1');
     
-    const response = await api.get(`/tasks?${params.toString()}`);
+    // 서버는 커서 기반으로 페이지를 나눠 응답하므로 next_cursor를 따라가며 모두 조회
+    const tasks: Task[] = [];
+    let cursor: string | null = null;
+    do {
+      if (cursor) params.set('cursor', cursor);
+      const response: { data: { tasks: Task[]; next_cursor: string | null } } =
+        await api.get(`/tasks?${params.toString()}`);
+      tasks.push(...response.data.tasks);
+      cursor = response.data.next_cursor;
+    } while (cursor);
+    return { tasks };
+  },
+
+  // 마지막 sync_token 이후 바뀐 작업과 삭제된 id만 조회 (reset이면 tasks가 전체 목록)
+  getTaskChanges: async (since?: string | null): Promise<TaskChanges> => {
+    const params = new URLSearchParams();
+    if (since) params.append('since', since);
+    const response = await api.get(`/tasks/changes?${params.toString()}`);
+    return response.data;
+  },
+
+  searchTasks: async (q: string, offset = 0): Promise<{ tasks: TaskSearchResult[]; next_offset: number | null }> => {
+    const params = new URLSearchParams({ q, offset: String(offset) });
+    const response = await api.get(`/tasks/search?${params.toString()}`);
     return response.data;
   },
 
@@ -74,6 +103,14 @@ export const tasksAPI = {
 
 // Dashboard API
 export const dashboardAPI = {
+  // 사용자, 통계, 최근 작업, 이번 달 캘린더 이벤트를 한 번의 요청으로 조회
+  getBootstrap: async (include?: string[]): Promise<DashboardBootstrap> => {
+    const params = new URLSearchParams();
+    if (include && include.length > 0) params.append('include', include.join(','));
+    const response = await api.get(`/dashboard/bootstrap?${params.toString()}`);
+    return response.data;
+  },
+
   getStatistics: async (): Promise<Statistics> => {
     const response = await api.get('/dashboard/statistics');
     return response.data;
@@ -83,20 +120,66 @@ export const dashboardAPI = {
     const response = await api.get('/dashboard/recent-tasks');
     return response.data;
   },
+
+  getHeatmap: async (from?: string, to?: string): Promise<Heatmap> => {
+    const params = new URLSearchParams();
+    if (from) params.append('from', from);
+    if (to) params.append('to', to);
+
+    const response = await api.get(`/dashboard/heatmap?${params.toString()}`);
+    return response.data;
+  },
+};
+
+// Analytics API
+export const analyticsAPI = {
+  getAnalytics: async (period: 'week' | 'month' = 'week', periods?: number): Promise<Analytics> => {
+    const params = new URLSearchParams({ period });
+    if (periods) params.append('periods', String(periods));
+    const response = await api.get(`/analytics?${params.toString()}`);
+    return response.data;
+  },
 };
 
 // Calendar API
 export const calendarAPI = {
-  getEvents: async (start?: string, end?: string): Promise<{ events: CalendarEvent[] }> => {
+  getEvents: async (start?: string, end?: string, compact?: boolean): Promise<{ events: CalendarEvent[] }> => {
     const params = new URLSearchParams();
     if (start) params.append('start', start);
     if (end) params.append('end', end);
+    if (compact) params.append('compact', '1');
     
     const response = await api.get(`/calendar/events?${params.toString()}`);
     return response.data;
   },
 };
 
+// 작업 변경 이벤트(SSE) 구독. 반환된 함수를 호출하면 연결을 닫는다.
+export const subscribeToTaskEvents = (handlers: {
+  onEvent: (event: TaskEvent) => void;
+  onResync: () => void;
+}): (() => void) => {
+  const source = new EventSource(`${API_BASE_URL}/stream`, { withCredentials: true });
+  const eventTypes: TaskEvent['type'][] = ['task.created', 'task.updated', 'task.toggled', 'task.deleted'];
+
+  eventTypes.forEach((type) => {
+    source.addEventListener(type, (message) => {
+      const data = JSON.parse((message as MessageEvent).data);
+      handlers.onEvent({ type, task: data.task, statistics_delta: data.statistics_delta });
+    });
+  });
+  // 일괄 변경, 이벤트 유실, 재연결 시에는 전체를 다시 불러옴
+  source.addEventListener('tasks.batch', handlers.onResync);
+  source.addEventListener('resync', handlers.onResync);
+  let connectedOnce = false;
+  source.onopen = () => {
+    if (connectedOnce) handlers.onResync();
+    connectedOnce = true;
+  };
+
+  return () => source.close();
+};
+
 // Request interceptor for error handling
 api.interceptors.response.use(
   (response) => response,
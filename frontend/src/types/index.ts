@@ -17,6 +17,27 @@ export interface Task {
   due_date: string | null;
 }
 
+export type TaskSort = 'created_at' | 'updated_at' | 'due_date' | 'priority';
+export type DueWindow = 'overdue' | 'today' | 'week' | 'none';
+
+export interface TaskListQuery {
+  category?: string[];
+  status?: string[];
+  priority?: Array<'low' | 'medium' | 'high'>;
+  due?: DueWindow[];
+  sort?: TaskSort;
+  order?: 'asc' | 'desc';
+  // 완료 후 오래 지나 보관된 작업도 포함 (보관된 작업은 수정/삭제할 수 없음)
+  includeArchived?: boolean;
+}
+
+export interface TaskChanges {
+  tasks: Task[];
+  deleted: number[];
+  sync_token: string;
+  reset: boolean;
+}
+
 export interface Statistics {
   total_tasks: number;
   completed_tasks: number;
@@ -24,6 +45,75 @@ export interface Statistics {
   today_completed: number;
 }
 
+export interface TaskSearchResult {
+  id: number;
+  title: string;
+  category: string;
+  priority: string;
+  status: string;
+  due_date: string | null;
+  created_at: string;
+  title_highlight: string;
+  snippet: string;
+}
+
+export interface TaskEvent {
+  type: 'task.created' | 'task.updated' | 'task.toggled' | 'task.deleted';
+  task: Partial<Task> & { id: number };
+  statistics_delta?: Statistics;
+}
+
+export interface DashboardBootstrap {
+  user?: User;
+  statistics?: Statistics;
+  recent_tasks?: Task[];
+  calendar?: {
+    start: string;
+    end: string;
+    events: CalendarEvent[];
+  };
+}
+
+export interface AnalyticsPeriod {
+  period_start: string;
+  total: number;
+  categories: Record<string, number>;
+}
+
+export interface Analytics {
+  period: 'week' | 'month';
+  trend: AnalyticsPeriod[];
+  lead_time: {
+    count: number;
+    mean_days: number | null;
+    median_days: number | null;
+    p90_days: number | null;
+  };
+  due_dates: {
+    completed_with_due_date: number;
+    on_time: number;
+    late: number;
+    on_time_rate: number | null;
+    open_overdue: number;
+  };
+  streak: {
+    current_days: number;
+    longest_days: number;
+  };
+}
+
+export interface HeatmapDay {
+  date: string;
+  count: number;
+  categories: Record<string, number>;
+}
+
+export interface Heatmap {
+  from: string;
+  to: string;
+  days: HeatmapDay[];
+}
+
 export interface CalendarEvent {
   id: number;
   title: string;
@@ -33,7 +123,7 @@ export interface CalendarEvent {
   category: string;
   status: string;
   priority: string;
-  description: string;
+  description?: string;
 }
 
 export interface LoginData {
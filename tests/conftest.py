@@ -0,0 +1,56 @@
+import pytest
+from app import create_app, db
+from app.analytics import analytics_cache
+from app.response_cache import response_cache
+from app.stats import statistics_cache
+
+PASSWORD = 'password123'
+
+
+@pytest.fixture
+def app(tmp_path):
+    # 프로세스 전역 캐시는 테스트 DB가 바뀌어도 남아 있으므로 테스트마다 비운다
+    statistics_cache.invalidate()
+    analytics_cache.clear()
+    response_cache.clear()
+    app = create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': f'sqlite:///{tmp_path / "test.db"}',
+        'SHARD_DATABASE_URLS': [],
+        'PASSWORD_HASH_METHOD': 'pbkdf2:sha256:1000',
+        'PASSWORD_HASH_WORKERS': 0,
+        'LOGIN_USER_BURST': 0,
+        'LOGIN_IP_BURST': 0,
+    })
+    yield app
+    with app.app_context():
+        db.engine.dispose()
+
+
+@pytest.fixture
+def make_client(app):
+    """회원가입 후 로그인한 테스트 클라이언트를 만드는 함수"""
+    def make(username='tester'):
+        client = app.test_client()
+        response = client.post('/api/auth/register', json={
+            'username': username, 'email': f'{username}@example.com', 'password': PASSWORD})
+        assert response.status_code == 201, response.get_json()
+        response = client.post('/api/auth/login', json={'username': username, 'password': PASSWORD})
+        assert response.status_code == 200, response.get_json()
+        return client
+    return make
+
+
+@pytest.fixture
+def client(make_client):
+    return make_client()
+
+
+@pytest.fixture
+def make_task(client):
+    """API로 작업을 만들고 응답의 작업 dict를 반환하는 함수"""
+    def make(title='작업', category='회사일', **fields):
+        response = client.post('/api/tasks', json={'title': title, 'category': category, **fields})
+        assert response.status_code == 201, response.get_json()
+        return response.get_json()['task']
+    return make
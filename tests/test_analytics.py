@@ -0,0 +1,62 @@
+from datetime import date, datetime, time, timedelta
+import pytest
+from app import db
+from app.models import Task
+
+
+def analytics(client, **params):
+    response = client.get('/api/analytics', query_string=params)
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()
+
+
+@pytest.fixture
+def history(app, client, make_task):
+    """(생성 며칠 전, 완료 며칠 전, 마감 며칠 전) 작업 3개와 마감이 지난 미완료 작업 1개"""
+    today = date.today()
+    spec = [(5, 3, 2), (4, 1, 3), (1, 0, None)]
+    tasks = [make_task(f'작업 {index}') for index in range(len(spec))]
+    for task in tasks:
+        assert client.post(f'/api/tasks/{task["id"]}/toggle').status_code == 200
+    overdue = make_task('지난 마감')
+    with app.app_context():
+        # ORM으로 바꿔야 일별 완료 집계도 함께 옮겨진다
+        for task, (created, completed, due) in zip(tasks, spec):
+            row = db.session.get(Task, task['id'])
+            row.created_at = datetime.combine(today - timedelta(days=created), time(12))
+            row.completed_at = datetime.combine(today - timedelta(days=completed), time(12))
+            row.due_date = today - timedelta(days=due) if due is not None else None
+        db.session.get(Task, overdue['id']).due_date = today - timedelta(days=1)
+        db.session.commit()
+    return tasks
+
+
+def test_analytics_summarize_completions(client, history):
+    data = analytics(client)
+    assert data['period'] == 'week'
+    assert len(data['trend']) == 12
+    assert sum(bucket['total'] for bucket in data['trend']) == 3
+    assert data['lead_time'] == {'count': 3, 'mean_days': 2.0, 'median_days': 2.0, 'p90_days': 2.8}
+    assert data['due_dates'] == {'completed_with_due_date': 2, 'on_time': 1, 'late': 1,
+                                 'on_time_rate': 0.5, 'open_overdue': 1}
+    assert data['streak'] == {'current_days': 2, 'longest_days': 2}
+
+
+def test_trend_buckets_by_period(client, history):
+    data = analytics(client, period='month', periods=3)
+    assert len(data['trend']) == 3
+    assert data['trend'][-1]['period_start'] == date.today().replace(day=1).isoformat()
+    assert len(analytics(client, periods=1000)['trend']) == 52
+
+
+def test_results_follow_writes(client, history):
+    assert analytics(client)['lead_time']['count'] == 3
+    assert client.post(f'/api/tasks/{history[0]["id"]}/toggle').status_code == 200
+    data = analytics(client)
+    assert data['lead_time']['count'] == 2
+    assert data['due_dates']['completed_with_due_date'] == 1
+
+
+@pytest.mark.parametrize('params', [{'period': 'year'}, {'periods': 'many'}])
+def test_invalid_parameters_are_rejected(client, params):
+    assert client.get('/api/analytics', query_string=params).status_code == 400
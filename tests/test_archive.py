@@ -0,0 +1,116 @@
+import json
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import text
+from app import db
+from app.archive import archive_completed_tasks
+from app.migrations import rebuild_daily_completions, upgrade
+from app.models import Task
+from app.response_cache import response_cache
+from app.singleflight import configure_single_flight
+
+
+@pytest.fixture
+def archived(app, client, make_task):
+    """완료된 지 오래된 작업 3개와 최근 작업 2개를 만들고 보관한 뒤 (보관 전 통계, 동기화 토큰, 보관된 id)"""
+    old = [make_task(f'지난 작업 {index}') for index in range(3)]
+    recent = [make_task(f'최근 작업 {index}') for index in range(2)]
+    for task in old + recent[:1]:
+        client.post(f'/api/tasks/{task["id"]}/toggle')
+    with app.app_context():
+        # ORM으로 바꿔야 일별 완료 집계도 함께 옮겨진다
+        for task in db.session.scalars(db.select(Task).where(Task.id.in_([task['id'] for task in old]))):
+            task.completed_at = datetime.utcnow() - timedelta(days=300)
+        db.session.commit()
+    before = client.get('/api/dashboard/statistics').get_json()
+    token = client.get('/api/tasks/changes').get_json()['sync_token']
+    with app.app_context():
+        moved = archive_completed_tasks(db.engine, after_days=180, batch_size=2, pause=0)
+    assert sum(moved.values()) == 3
+    return before, token, {task['id'] for task in old}, {task['id'] for task in recent}
+
+
+def list_ids(client, **params):
+    ids, cursor = [], None
+    while True:
+        query = dict(params, limit=2, **({'cursor': cursor} if cursor else {}))
+        data = client.get('/api/tasks', query_string=query).get_json()
+        ids.extend(task['id'] for task in data['tasks'])
+        cursor = data['next_cursor']
+        if cursor is None:
+            return ids
+
+
+def test_archived_tasks_leave_the_default_list(client, archived):
+    _, _, old_ids, recent_ids = archived
+    assert set(list_ids(client)) == recent_ids
+    ids = list_ids(client, include_archived=1)
+    assert len(ids) == len(set(ids)) == 5
+    assert set(ids) == old_ids | recent_ids
+
+
+def test_statistics_are_unchanged(client, archived):
+    before = archived[0]
+    assert client.get('/api/dashboard/statistics').get_json() == before
+
+
+def test_changes_feed_reports_archived_tasks_as_deleted(client, archived):
+    _, token, old_ids, _ = archived
+    data = client.get('/api/tasks/changes', query_string={'since': token}).get_json()
+    assert set(data['deleted']) == old_ids
+    assert data['tasks'] == [] and not data['reset']
+
+
+def test_export_can_include_archived_tasks(client, archived):
+    _, _, old_ids, recent_ids = archived
+    body = client.get('/api/tasks/export', query_string={'include_archived': 1}).get_data(as_text=True)
+    assert {json.loads(line)['id'] for line in body.splitlines()} == old_ids | recent_ids
+
+
+def test_new_tasks_do_not_reuse_archived_ids(archived, make_task):
+    _, _, old_ids, recent_ids = archived
+    assert make_task('새 작업')['id'] > max(old_ids | recent_ids)
+
+
+def test_upgrade_makes_legacy_task_ids_autoincrement(app, client, make_task):
+    first, second = make_task('첫 작업'), make_task('검색할 작업')
+    client.delete(f'/api/tasks/{second["id"]}')
+    with app.app_context(), db.engine.begin() as conn:
+        # 마이그레이션 9 이전의 task 테이블 (AUTOINCREMENT 없음)로 되돌린다
+        sql = conn.execute(text("SELECT sql FROM sqlite_master WHERE name = 'task'")).scalar()
+        dependents = conn.execute(text(
+            "SELECT sql FROM sqlite_master WHERE tbl_name = 'task' AND type IN ('index', 'trigger') "
+            'AND sql IS NOT NULL')).scalars().all()
+        conn.execute(text('ALTER TABLE task RENAME TO task_old'))
+        conn.execute(text(sql.replace(' AUTOINCREMENT', '')))
+        conn.execute(text('INSERT INTO task (id, title, description, category, priority, status, created_at, '
+                          'updated_at, completed_at, due_date, revision, user_id) '
+                          'SELECT id, title, description, category, priority, status, created_at, '
+                          'updated_at, completed_at, due_date, revision, user_id FROM task_old'))
+        conn.execute(text('DROP TABLE task_old'))
+        for statement in dependents:
+            conn.execute(text(statement))
+        conn.execute(text("DELETE FROM sqlite_sequence WHERE name = 'task'"))
+        conn.execute(text('DELETE FROM schema_migrations WHERE version >= 9'))
+
+    with app.app_context():
+        assert upgrade(db.engine) == [9, 10]
+        names = set(db.session.execute(text(
+            "SELECT name FROM sqlite_master WHERE tbl_name = 'task'")).scalars())
+    assert {'ix_task_user_created', 'ix_task_user_revision', 'task_fts_ai'} <= names
+    # 삭제된 작업의 id는 다시 쓰이지 않고, 새 작업도 전문 검색 색인에 들어간다
+    created = make_task('검색할 새 작업')
+    assert created['id'] > second['id'] > first['id']
+    found = client.get('/api/tasks/search', query_string={'q': '검색할'}).get_json()['tasks']
+    assert [task['id'] for task in found] == [created['id']]
+
+
+def test_rebuilt_daily_completions_keep_archived_history(app, client, archived):
+    heatmap = client.get('/api/dashboard/heatmap').get_json()
+    assert sum(day['count'] for day in heatmap['days']) == 4
+    with app.app_context():
+        rebuild_daily_completions(db.engine)
+    # 재계산은 data_version을 바꾸지 않으므로 캐시된 응답을 비우고 다시 조회
+    response_cache.clear()
+    configure_single_flight(app)
+    assert client.get('/api/dashboard/heatmap').get_json() == heatmap
@@ -0,0 +1,91 @@
+import asyncio
+import pytest
+from flask import Response
+from app.metrics import metrics
+from tests.conftest import PASSWORD
+
+pytest.importorskip('aiosqlite')
+httpx = pytest.importorskip('httpx')
+
+from app.asgi import create_asgi_app  # noqa: E402
+
+
+@pytest.fixture
+def asgi_app(tmp_path):
+    asgi_app = create_asgi_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': f'sqlite:///{tmp_path / "test.db"}',
+        'SHARD_DATABASE_URLS': [],
+        'PASSWORD_HASH_METHOD': 'pbkdf2:sha256:1000',
+        'PASSWORD_HASH_WORKERS': 0,
+        'LOGIN_USER_BURST': 0,
+        'LOGIN_IP_BURST': 0,
+    })
+    yield asgi_app
+    asyncio.run(asgi_app.engine.dispose())
+    asgi_app.executor.shutdown()
+
+
+def run(asgi_app, scenario):
+    """로그인한 httpx 클라이언트로 scenario(client)를 실행"""
+    async def main():
+        transport = httpx.ASGITransport(app=asgi_app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://testserver') as client:
+            response = await client.post('/api/auth/register', json={
+                'username': 'tester', 'email': 'tester@example.com', 'password': PASSWORD})
+            assert response.status_code == 201, response.json()
+            response = await client.post('/api/auth/login', json={'username': 'tester', 'password': PASSWORD})
+            assert response.status_code == 200, response.json()
+            return await scenario(client)
+    return asyncio.run(main())
+
+
+def test_native_list_matches_flask_view(asgi_app):
+    async def scenario(client):
+        for title in ('하나', '둘', '셋'):
+            response = await client.post('/api/tasks', json={'title': title, 'category': '회사일'})
+            assert response.status_code == 201
+        native = await client.get('/api/tasks', params={'limit': 2, 'fields': 'id,title'})
+        assert native.status_code == 200
+
+        # 같은 세션으로 Flask 앱을 직접 호출해 비교
+        flask_client = asgi_app.flask_app.test_client()
+        flask_client.set_cookie('session', client.cookies['session'])
+        expected = flask_client.get('/api/tasks', query_string={'limit': 2, 'fields': 'id,title'})
+        assert native.json() == expected.get_json()
+        assert native.headers['ETag'] == expected.headers['ETag']
+        assert native.headers['Content-Type'] == expected.headers['Content-Type']
+
+        response = await client.get('/api/tasks', params={'limit': 2, 'fields': 'id,title'},
+                                    headers={'If-None-Match': native.headers['ETag']})
+        assert response.status_code == 304
+        assert (await client.get('/api/tasks', params={'cursor': 'bad'})).json() == {'error': '잘못된 커서입니다.'}
+        response = await client.get('/api/tasks/export', params={'format': 'xml'})
+        assert response.status_code == 400
+    run(asgi_app, scenario)
+
+
+def test_fallback_closes_wsgi_response(asgi_app):
+    closed = []
+
+    def closing():
+        response = Response('ok')
+        response.call_on_close(lambda: closed.append(True))
+        return response
+    asgi_app.flask_app.add_url_rule('/closing', 'closing', closing)
+
+    async def scenario(client):
+        response = await client.get('/closing')
+        assert response.text == 'ok'
+    run(asgi_app, scenario)
+    assert closed == [True]
+
+
+def test_native_requests_are_labelled_with_route_rule(asgi_app):
+    async def scenario(client):
+        assert (await client.get('/api/calendar/events', params={'start': '2030-01-01'})).status_code == 200
+        assert (await client.get('/api/tasks/export', params={'format': 'csv'})).status_code == 200
+    run(asgi_app, scenario)
+    rendered = metrics.render()
+    assert 'route="/api/calendar/events",status="200"' in rendered
+    assert 'route="/api/tasks/export",status="200"' in rendered
@@ -0,0 +1,85 @@
+import pytest
+from app import batch
+
+
+def statistics(client):
+    response = client.get('/api/dashboard/statistics')
+    assert response.status_code == 200
+    return response.get_json()
+
+
+def task_titles(client):
+    return {task['id']: (task['title'], task['status'])
+            for task in client.get('/api/tasks').get_json()['tasks']}
+
+
+def test_batch_applies_every_operation(client, make_task):
+    edited, toggled, removed = (make_task(title) for title in ('수정', '완료', '삭제'))
+    response = client.post('/api/tasks/batch', json={'operations': [
+        {'op': 'create', 'data': {'title': '새 작업', 'category': '공부'}},
+        {'op': 'update', 'id': edited['id'], 'data': {'title': '수정됨'}},
+        {'op': 'toggle', 'id': toggled['id']},
+        {'op': 'delete', 'id': removed['id']},
+    ]})
+    assert response.status_code == 200, response.get_json()
+    results = response.get_json()['results']
+    assert [result['op'] for result in results] == ['create', 'update', 'toggle', 'delete']
+    assert results[2]['status'] == 'completed'
+
+    titles = task_titles(client)
+    assert titles == {
+        results[0]['id']: ('새 작업', 'pending'),
+        edited['id']: ('수정됨', 'pending'),
+        toggled['id']: ('완료', 'completed'),
+    }
+    stats = statistics(client)
+    assert (stats['total_tasks'], stats['completed_tasks'], stats['today_completed']) == (3, 1, 1)
+
+
+def test_invalid_operation_applies_nothing(client, make_task, make_client):
+    task = make_task()
+    foreign = make_client('other').post('/api/tasks', json={'title': '남의 작업', 'category': '회사일'})
+    before = task_titles(client)
+    etag = client.get('/api/tasks').headers['ETag']
+
+    response = client.post('/api/tasks/batch', json={'operations': [
+        {'op': 'update', 'id': task['id'], 'data': {'title': '수정됨'}},
+        {'op': 'create', 'data': {'title': ''}},
+        {'op': 'delete', 'id': foreign.get_json()['task']['id']},
+        {'op': 'toggle', 'id': task['id']},
+    ]})
+    assert response.status_code == 400
+    assert [error['index'] for error in response.get_json()['errors']] == [1, 2, 3]
+    assert task_titles(client) == before
+    assert client.get('/api/tasks', headers={'If-None-Match': etag}).status_code == 304
+
+
+def test_failure_while_applying_rolls_back(client, make_task, monkeypatch):
+    kept, toggled, removed = (make_task(title) for title in ('유지', '완료', '삭제'))
+    before = task_titles(client)
+    stats = statistics(client)
+
+    def fail(*args, **kwargs):
+        raise RuntimeError('tombstone write failed')
+    # 생성/수정/토글 UPDATE가 실행된 뒤 마지막 단계에서 실패
+    monkeypatch.setattr(batch, 'record_tombstones', fail)
+    response = client.post('/api/tasks/batch', json={'operations': [
+        {'op': 'create', 'data': {'title': '새 작업', 'category': '공부'}},
+        {'op': 'update', 'id': kept['id'], 'data': {'title': '수정됨'}},
+        {'op': 'toggle', 'id': toggled['id']},
+        {'op': 'delete', 'id': removed['id']},
+    ]})
+    assert response.status_code == 500
+
+    assert task_titles(client) == before
+    assert statistics(client) == stats
+    assert client.get('/api/tasks/changes').get_json()['deleted'] == []
+
+
+@pytest.mark.parametrize('operations', [None, [], [{'op': 'rename', 'id': 1}],
+                                        [{'op': 'toggle', 'id': 1}, {'op': 'delete', 'id': 1}]])
+def test_malformed_batches_are_rejected(client, make_task, operations):
+    make_task()
+    response = client.post('/api/tasks/batch', json={'operations': operations})
+    assert response.status_code == 400
+    assert response.get_json()['errors']
@@ -0,0 +1,28 @@
+def bootstrap(client, **params):
+    response = client.get('/api/dashboard/bootstrap', query_string=params)
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()
+
+
+def test_bootstrap_matches_individual_endpoints(client, make_task):
+    task = make_task(due_date='2030-01-15')
+    assert client.post(f'/api/tasks/{task["id"]}/toggle').status_code == 200
+    make_task('두 번째')
+
+    data = bootstrap(client, start='2030-01-01', end='2030-01-31')
+    assert set(data) == {'user', 'statistics', 'recent_tasks', 'calendar'}
+    assert data['user']['username'] == 'tester'
+    assert data['statistics'] == client.get('/api/dashboard/statistics').get_json()
+    assert data['recent_tasks'] == client.get('/api/dashboard/recent-tasks').get_json()['tasks']
+    assert data['calendar']['start'] == '2030-01-01'
+    assert [event['id'] for event in data['calendar']['events']] == [task['id']]
+    assert 'description' not in data['calendar']['events'][0]
+
+
+def test_include_selects_sections(client, make_task):
+    make_task()
+    assert set(bootstrap(client, include='statistics, user')) == {'statistics', 'user'}
+    response = client.get('/api/dashboard/bootstrap', query_string={'include': 'statistics,secret'})
+    assert response.status_code == 400
+    response = client.get('/api/dashboard/bootstrap', query_string={'start': '2030-01-01', 'end': 'x'})
+    assert response.status_code == 400
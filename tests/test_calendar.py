@@ -0,0 +1,37 @@
+from datetime import date
+
+
+def events(client, **params):
+    response = client.get('/api/calendar/events', query_string=params)
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()['events']
+
+
+def test_range_matches_due_date_or_creation_day(client, make_task):
+    today = date.today().isoformat()
+    due_today = make_task('오늘 마감', due_date=today)
+    undated = make_task('마감 없음')
+    future = make_task('먼 마감', due_date='2030-01-15')
+
+    listed = events(client, start='2030-01-01', end='2030-01-31')
+    assert [event['id'] for event in listed] == [future['id']]
+    assert listed[0]['start'] == '2030-01-15'
+
+    # 마감일과 생성일이 모두 범위에 들어도 한 번만 나온다
+    listed = events(client, start=today, end=today)
+    assert sorted(event['id'] for event in listed) == sorted(
+        task['id'] for task in (due_today, undated, future))
+    starts = {event['id']: event['start'] for event in listed}
+    assert starts[due_today['id']] == today
+    assert starts[undated['id']].startswith(today)
+
+
+def test_compact_events_omit_description(client, make_task):
+    make_task(description='긴 설명')
+    assert events(client)[0]['description'] == '긴 설명'
+    assert 'description' not in events(client, compact='1')[0]
+
+
+def test_invalid_range_lists_everything(client, make_task):
+    make_task(due_date='2030-01-15')
+    assert len(events(client, start='2030-13-01', end='2030-01-31')) == 1
@@ -0,0 +1,68 @@
+import gzip
+import json
+import pytest
+from app.compression import brotli
+from app.response_cache import response_cache
+from app.singleflight import single_flight
+
+
+@pytest.fixture
+def no_single_flight(monkeypatch):
+    # 완료 후 window 동안 재사용되는 single-flight 결과가 응답 캐시 조회를 가리지 않도록 끈다
+    monkeypatch.setattr(single_flight, 'max_entries', 0)
+
+
+@pytest.fixture
+def tasks(make_task):
+    # COMPRESS_MIN_SIZE보다 충분히 큰 목록
+    return [make_task(f'압축 테스트 작업 {index}', description='설명 ' * 20) for index in range(20)]
+
+
+def test_streamed_list_is_gzipped(client, tasks):
+    plain = client.get('/api/tasks', query_string={'limit': 50})
+    response = client.get('/api/tasks', query_string={'limit': 50}, headers={'Accept-Encoding': 'gzip'})
+    assert response.status_code == 200
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in response.headers['Vary']
+    assert 'Content-Encoding' not in plain.headers
+    body = gzip.decompress(response.get_data())
+    assert json.loads(body) == plain.get_json()
+    assert len(response.get_data()) < len(body)
+
+
+def test_preferred_encoding_falls_back_without_brotli(client, tasks):
+    response = client.get('/api/tasks', headers={'Accept-Encoding': 'br, gzip;q=0.8'})
+    assert response.headers['Content-Encoding'] == ('br' if brotli is not None else 'gzip')
+    response = client.get('/api/tasks', headers={'Accept-Encoding': 'identity'})
+    assert 'Content-Encoding' not in response.headers
+
+
+def test_small_response_is_not_compressed(client, make_task):
+    make_task()
+    response = client.get('/api/dashboard/statistics', headers={'Accept-Encoding': 'gzip'})
+    assert response.status_code == 200
+    assert 'Content-Encoding' not in response.headers
+    assert 'Accept-Encoding' in response.headers['Vary']
+
+
+def test_response_cache_serves_encoded_body(client, tasks, no_single_flight):
+    first = client.get('/api/tasks', headers={'Accept-Encoding': 'gzip'}).get_data()
+    hits = response_cache.stats()['hits']
+    second = client.get('/api/tasks', headers={'Accept-Encoding': 'gzip'})
+    assert response_cache.stats()['hits'] == hits + 1
+    assert second.headers['Content-Encoding'] == 'gzip'
+    assert second.get_data() == first
+
+    # 인코딩별로 따로 저장
+    plain = client.get('/api/tasks')
+    assert 'Content-Encoding' not in plain.headers
+    assert plain.get_json() == json.loads(gzip.decompress(first))
+
+
+def test_response_cache_misses_after_write(client, tasks, no_single_flight):
+    client.get('/api/tasks').get_data()
+    assert client.put(f'/api/tasks/{tasks[-1]["id"]}', json={'title': '수정됨'}).status_code == 200
+    hits = response_cache.stats()['hits']
+    data = client.get('/api/tasks').get_json()
+    assert response_cache.stats()['hits'] == hits
+    assert data['tasks'][0]['title'] == '수정됨'
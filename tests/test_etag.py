@@ -0,0 +1,51 @@
+from app import db
+from app.models import User
+
+
+def test_matching_etag_returns_304(client, make_task):
+    make_task()
+    response = client.get('/api/tasks')
+    assert response.status_code == 200
+    etag = response.headers['ETag']
+    assert etag.startswith('W/')
+    assert response.headers['Cache-Control'] == 'private, no-cache'
+
+    response = client.get('/api/tasks', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.get_data() == b''
+    assert response.headers['ETag'] == etag
+
+
+def test_write_changes_etag(client, make_task):
+    task = make_task()
+    etag = client.get('/api/tasks').headers['ETag']
+
+    assert client.put(f'/api/tasks/{task["id"]}', json={'title': '수정됨'}).status_code == 200
+    response = client.get('/api/tasks', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+    assert response.get_json()['tasks'][0]['title'] == '수정됨'
+
+
+def test_etag_depends_on_query_and_user(app, client, make_client):
+    etag = client.get('/api/tasks').headers['ETag']
+    filtered = client.get('/api/tasks', query_string={'category': '공부'})
+    assert filtered.get_json()['tasks'] == []
+    assert filtered.headers['ETag'] != etag
+    assert client.get('/api/tasks', query_string={'category': '공부'},
+                      headers={'If-None-Match': etag}).status_code == 200
+
+    other = make_client('other')
+    assert other.get('/api/tasks', headers={'If-None-Match': etag}).status_code == 200
+
+
+def test_external_write_changes_etag(app, client, make_task):
+    make_task()
+    etag = client.get('/api/dashboard/statistics').headers['ETag']
+    # 다른 워커가 데이터를 바꾼 경우처럼 data_version만 직접 올린다
+    with app.app_context():
+        user = db.session.execute(db.select(User)).scalar_one()
+        user.data_version += 1
+        db.session.commit()
+    response = client.get('/api/dashboard/statistics', headers={'If-None-Match': etag})
+    assert response.status_code == 200
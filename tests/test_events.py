@@ -0,0 +1,46 @@
+import json
+import pytest
+from werkzeug.test import EnvironBuilder
+from app.events import event_bus
+
+
+@pytest.fixture
+def open_stream(app, client):
+    """/api/stream을 WSGI로 직접 호출해 읽지 않은 본문을 반환 (테스트 클라이언트는 첫 청크를 미리 읽음)"""
+    def open_():
+        environ = EnvironBuilder(path='/api/stream', headers={
+            'Cookie': f"session={client.get_cookie('session').value}"}).get_environ()
+        statuses = []
+        body = app(environ, lambda status, headers, exc_info=None: statuses.append(status))
+        assert statuses == ['200 OK']
+        return body
+    return open_
+
+
+def connections():
+    return event_bus.broker.connection_count()
+
+
+def test_body_closed_unread_does_not_keep_subscription(open_stream):
+    before = connections()
+    body = open_stream()
+    # 본문을 한 번도 읽지 않고 닫으면(클라이언트 연결 종료) 구독도 남지 않아야 함
+    body.close()
+    assert connections() == before
+
+
+def test_stream_delivers_task_events(open_stream, make_task):
+    before = connections()
+    body = open_stream()
+    chunks = iter(body)
+    assert next(chunks).startswith(b'retry:')
+    assert connections() == before + 1
+
+    task = make_task('실시간 알림')
+    event = next(chunks).decode()
+    assert 'event: task.created' in event
+    data = json.loads(event.split('data: ', 1)[1])
+    assert data['task']['id'] == task['id']
+
+    body.close()
+    assert connections() == before
@@ -0,0 +1,45 @@
+from datetime import date, timedelta
+
+
+def heatmap(client, **params):
+    response = client.get('/api/dashboard/heatmap', query_string=params)
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()
+
+
+def test_completions_are_counted_per_day_and_category(client, make_task):
+    work = [make_task(f'업무 {index}') for index in range(2)]
+    study = make_task('공부', category='공부')
+    for task in work + [study]:
+        assert client.post(f'/api/tasks/{task["id"]}/toggle').status_code == 200
+
+    data = heatmap(client)
+    today = date.today()
+    assert data['from'] == (today - timedelta(days=364)).isoformat()
+    assert data['to'] == today.isoformat()
+    assert data['days'] == [{'date': today.isoformat(), 'count': 3,
+                             'categories': {'회사일': 2, '공부': 1}}]
+
+
+def test_rollup_follows_edits_and_deletes(client, make_task):
+    first, second = make_task('하나'), make_task('둘')
+    for task in (first, second):
+        assert client.post(f'/api/tasks/{task["id"]}/toggle').status_code == 200
+
+    assert client.put(f'/api/tasks/{first["id"]}', json={'category': '사이드프로젝트'}).status_code == 200
+    assert heatmap(client)['days'][0]['categories'] == {'회사일': 1, '사이드프로젝트': 1}
+
+    assert client.post(f'/api/tasks/{second["id"]}/toggle').status_code == 200
+    assert heatmap(client)['days'][0]['categories'] == {'사이드프로젝트': 1}
+
+    assert client.delete(f'/api/tasks/{first["id"]}').status_code == 200
+    assert heatmap(client)['days'] == []
+
+
+def test_range_is_validated(client):
+    today = date.today()
+    assert heatmap(client, **{'from': today.isoformat(), 'to': today.isoformat()})['days'] == []
+    for params in ({'from': 'yesterday'},
+                   {'from': today.isoformat(), 'to': (today - timedelta(days=1)).isoformat()},
+                   {'from': (today - timedelta(days=400)).isoformat(), 'to': today.isoformat()}):
+        assert client.get('/api/dashboard/heatmap', query_string=params).status_code == 400
@@ -0,0 +1,45 @@
+import re
+import pytest
+
+REMOTE = {'REMOTE_ADDR': '203.0.113.5'}
+
+
+def sample(body, name):
+    match = re.search(rf'^{name} (\S+)$', body, re.MULTILINE)
+    assert match, name
+    return float(match.group(1))
+
+
+def test_cumulative_values_are_counters(client):
+    body = client.get('/metrics').get_data(as_text=True)
+    hits = sample(body, 'todolist_user_cache_hits_total')
+    for name in ('user_cache_hits', 'user_cache_misses', 'response_cache_hits', 'response_cache_misses',
+                 'single_flight_leaders', 'single_flight_shared', 'single_flight_bypassed'):
+        assert f'# TYPE todolist_{name}_total counter' in body
+        assert f'todolist_{name} ' not in body
+    assert '# TYPE todolist_sse_connections gauge' in body
+    assert '# TYPE todolist_response_cache_bytes gauge' in body
+
+    for _ in range(2):
+        client.get('/api/tasks').get_json()
+    body = client.get('/metrics').get_data(as_text=True)
+    assert sample(body, 'todolist_user_cache_hits_total') > hits
+    assert 'todolist_requests_total{method="GET",route="/api/tasks",status="200"}' in body
+
+
+def test_without_token_only_localhost_can_read(app, client):
+    assert client.get('/metrics').status_code == 200
+    response = client.get('/metrics', environ_base=REMOTE)
+    assert response.status_code == 403
+    assert 'todolist' not in response.get_data(as_text=True)
+
+    app.config['METRICS_PUBLIC'] = True
+    assert client.get('/metrics', environ_base=REMOTE).status_code == 200
+
+
+@pytest.mark.parametrize('environ', [{}, REMOTE])
+def test_token_is_required_when_set(app, client, environ):
+    app.config['METRICS_TOKEN'] = 'secret'
+    assert client.get('/metrics', environ_base=environ).status_code == 401
+    response = client.get('/metrics', environ_base=environ, headers={'Authorization': 'Bearer secret'})
+    assert response.status_code == 200
@@ -0,0 +1,44 @@
+import multiprocessing
+from sqlalchemy import create_engine, text
+from app import db
+from app.migrations import MIGRATIONS, check_query_plans, current_version, upgrade
+
+WORKERS = 4
+
+
+def test_new_database_is_at_latest_version(app):
+    with app.app_context():
+        with db.engine.connect() as conn:
+            assert current_version(conn) == MIGRATIONS[-1][0]
+        assert upgrade(db.engine) == []
+
+
+def test_hot_queries_use_indexes(app):
+    with app.app_context():
+        assert check_query_plans(db.engine) == []
+
+
+
+def start_worker(url, barrier):
+    """워커 프로세스 시작처럼 앱을 만든다 (다른 워커와 동시에)"""
+    from app import create_app
+    barrier.wait(30)
+    create_app({'SQLALCHEMY_DATABASE_URI': url, 'SHARD_DATABASE_URLS': [], 'PASSWORD_HASH_WORKERS': 0})
+
+
+def test_concurrent_workers_upgrade_once(tmp_path):
+    context = multiprocessing.get_context('spawn')
+    url = f'sqlite:///{tmp_path / "shared.db"}'
+    barrier = context.Barrier(WORKERS)
+    processes = [context.Process(target=start_worker, args=(url, barrier)) for _ in range(WORKERS)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(120)
+    assert [process.exitcode for process in processes] == [0] * WORKERS
+
+    engine = create_engine(url)
+    with engine.connect() as conn:
+        versions = conn.execute(text('SELECT version FROM schema_migrations ORDER BY version')).scalars().all()
+    engine.dispose()
+    assert versions == [number for number, _, _ in MIGRATIONS]
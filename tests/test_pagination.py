@@ -0,0 +1,83 @@
+from datetime import date, datetime, timedelta
+import pytest
+from app import db
+from app.models import PRIORITY_RANKS, Task, User
+from app.queries import TASK_SORTS
+
+BASE = datetime(2026, 1, 1, 9, 0)
+
+
+@pytest.fixture
+def tasks(app, client):
+    """정렬 키가 겹치거나 NULL인 작업들 (같은 생성 시각, 마감일 없음, 같은 우선순위)"""
+    with app.app_context():
+        user_id = db.session.execute(db.select(User.id)).scalar_one()
+        rows = []
+        for index in range(13):
+            rows.append(Task(
+                title=f'작업 {index}', category=('회사일', '공부')[index % 2],
+                priority=('low', 'medium', 'high')[index % 3],
+                created_at=BASE + timedelta(hours=index // 3),
+                updated_at=BASE + timedelta(hours=index % 4),
+                due_date=date(2026, 2, 1 + index % 5) if index % 4 else None,
+                user_id=user_id,
+            ))
+        db.session.add_all(rows)
+        db.session.commit()
+        return [{'id': task.id, 'created_at': task.created_at, 'updated_at': task.updated_at,
+                 'due_date': task.due_date, 'priority_rank': PRIORITY_RANKS[task.priority],
+                 'category': task.category} for task in rows]
+
+
+def fetch_all(client, limit=4, **params):
+    """next_cursor를 따라가며 모든 페이지의 작업 id를 모은다"""
+    ids = []
+    cursor = None
+    while True:
+        query = dict(params, limit=limit, fields='id', **({'cursor': cursor} if cursor else {}))
+        response = client.get('/api/tasks', query_string=query)
+        assert response.status_code == 200, response.get_json()
+        data = response.get_json()
+        assert len(data['tasks']) <= limit
+        ids.extend(task['id'] for task in data['tasks'])
+        cursor = data['next_cursor']
+        if cursor is None:
+            return ids
+
+
+def expected_order(tasks, sort, descending):
+    """(정렬 키, id) 순서, NULL 정렬 키는 방향과 관계없이 마지막"""
+    key = TASK_SORTS[sort][0].key
+    present = sorted((task for task in tasks if task[key] is not None),
+                     key=lambda task: (task[key], task['id']), reverse=descending)
+    missing = sorted((task for task in tasks if task[key] is None),
+                     key=lambda task: task['id'], reverse=descending)
+    return [task['id'] for task in present + missing]
+
+
+@pytest.mark.parametrize('sort', list(TASK_SORTS))
+@pytest.mark.parametrize('order', ['asc', 'desc'])
+def test_cursor_pages_follow_sort_order(client, tasks, sort, order):
+    ids = fetch_all(client, sort=sort, order=order)
+    assert ids == expected_order(tasks, sort, order == 'desc')
+
+
+def test_default_order_is_newest_first(client, tasks):
+    assert fetch_all(client) == expected_order(tasks, 'created_at', True)
+
+
+def test_filters_apply_to_every_page(client, tasks):
+    ids = fetch_all(client, limit=2, sort='due_date', category='공부', due='none')
+    matching = [task for task in tasks if task['category'] == '공부' and task['due_date'] is None]
+    assert ids == expected_order(matching, 'due_date', False)
+
+
+def test_fields_limit_response_columns(client, tasks):
+    data = client.get('/api/tasks', query_string={'fields': 'title', 'limit': 1}).get_json()
+    assert set(data['tasks'][0]) == {'id', 'title'}
+    assert client.get('/api/tasks', query_string={'fields': 'secret'}).status_code == 400
+
+
+def test_invalid_cursor_is_rejected(client, tasks):
+    response = client.get('/api/tasks', query_string={'cursor': 'not-a-cursor'})
+    assert response.status_code == 400
@@ -0,0 +1,81 @@
+import threading
+import time
+import pytest
+from app.passwords import PasswordHasher, PasswordHasherBusy, password_hasher
+from app.ratelimit import login_user_limiter
+
+METHOD = 'pbkdf2:sha256:1000'
+
+
+@pytest.fixture
+def pooled():
+    hasher = PasswordHasher(METHOD, workers=1, queue_size=0, timeout=20)
+    yield hasher
+    hasher.shutdown()
+
+
+def wait_until(predicate, timeout=10):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, '시간 안에 조건이 만족되지 않았습니다.'
+        time.sleep(0.01)
+
+
+def test_hash_and_verify_in_worker_process(pooled):
+    password_hash = pooled.hash('password123')
+    assert password_hash.startswith(METHOD)
+    assert pooled.verify(password_hash, 'password123')
+    assert not pooled.verify(password_hash, 'wrong')
+    assert pooled.in_flight == 0
+
+
+def test_timed_out_job_keeps_its_slot_until_it_finishes(pooled):
+    pooled.hash('warm up')
+    pooled.timeout = 0.2
+    with pytest.raises(PasswordHasherBusy):
+        pooled._run(time.sleep, 1)
+    # 요청은 포기했지만 워커는 아직 계산 중이므로 자리가 남아 있지 않다
+    assert pooled.in_flight == 1
+    with pytest.raises(PasswordHasherBusy):
+        pooled.hash('password123')
+
+    wait_until(lambda: pooled.in_flight == 0)
+    pooled.timeout = 20
+    assert pooled.verify(pooled.hash('password123'), 'password123')
+
+
+def test_inline_hasher_limits_concurrency():
+    hasher = PasswordHasher(METHOD, workers=0, queue_size=1)
+    started, release = threading.Event(), threading.Event()
+
+    def slow():
+        started.set()
+        release.wait(5)
+    thread = threading.Thread(target=hasher._run, args=(slow,))
+    thread.start()
+    assert started.wait(5)
+    with pytest.raises(PasswordHasherBusy):
+        hasher.hash('password123')
+    release.set()
+    thread.join(5)
+    assert hasher.verify(hasher.hash('password123'), 'password123')
+
+
+def test_login_is_throttled_per_username(app, client):
+    login_user_limiter.configure(burst=2, refill_seconds=60)
+    other = app.test_client()
+    for _ in range(2):
+        response = other.post('/api/auth/login', json={'username': 'tester', 'password': 'wrong'})
+        assert response.status_code == 401
+    response = other.post('/api/auth/login', json={'username': 'TESTER ', 'password': 'password123'})
+    assert response.status_code == 429
+    assert int(response.headers['Retry-After']) > 0
+
+
+def test_busy_hasher_returns_503(app, client, monkeypatch):
+    def busy(*args):
+        raise PasswordHasherBusy(3)
+    monkeypatch.setattr(password_hasher, '_run', busy)
+    response = app.test_client().post('/api/auth/login', json={'username': 'tester', 'password': 'password123'})
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '3'
@@ -0,0 +1,110 @@
+import pytest
+from sqlalchemy import text
+from app import db
+from app import search as search_module
+from app.migrations import MIGRATIONS, upgrade
+
+
+def search(client, q, **params):
+    response = client.get('/api/tasks/search', query_string=dict(params, q=q))
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()
+
+
+def ids(data):
+    return [task['id'] for task in data['tasks']]
+
+
+@pytest.fixture
+def tasks(make_task):
+    return {
+        'meeting': make_task('주간 회의 준비', description='회의실 예약과 발표 자료'),
+        'report': make_task('분기 보고서 작성', description='매출 보고 정리'),
+        'study': make_task('알고리즘 공부', category='공부', description='그래프 탐색 문제 풀이'),
+    }
+
+
+def test_trigram_terms_use_fts_with_highlight(client, tasks):
+    data = search(client, '보고서')
+    assert ids(data) == [tasks['report']['id']]
+    assert data['tasks'][0]['title_highlight'] == '분기 <mark>보고서</mark> 작성'
+
+
+@pytest.mark.parametrize('q, expected', [
+    ('회의', ['meeting']),
+    ('보고', ['report']),
+    ('회의 자료', ['meeting']),
+    ('탐색 알고리즘', ['study']),
+    ('공부 보고', []),
+])
+def test_short_korean_terms_match(client, tasks, q, expected):
+    assert ids(search(client, q)) == [tasks[name]['id'] for name in expected]
+
+
+def test_short_terms_highlight_title_and_snippet(client, tasks):
+    result = search(client, '회의')['tasks'][0]
+    assert result['title_highlight'] == '주간 <mark>회의</mark> 준비'
+    assert '<mark>회의</mark>' in result['snippet']
+
+
+def test_search_only_returns_own_tasks(client, tasks, make_client):
+    other = make_client('other')
+    other.post('/api/tasks', json={'title': '다른 사람의 회의록', 'category': '회사일'})
+    assert search(other, '회의')['tasks'][0]['title'] == '다른 사람의 회의록'
+    assert ids(search(other, '회의록')) != []
+    assert ids(search(client, '회의록')) == []
+    assert ids(search(client, '회의')) == [tasks['meeting']['id']]
+
+
+def test_short_terms_only_scan_recent_tasks(client, make_task, monkeypatch):
+    created = [make_task(f'회의록 정리 {index}')['id'] for index in range(3)]
+    monkeypatch.setattr(search_module, 'SHORT_TERM_SCAN_LIMIT', 2)
+    assert sorted(ids(search(client, '회의'))) == created[1:]
+    # 세 글자 이상 검색어가 있으면 색인으로 전체를 찾는다
+    assert sorted(ids(search(client, '회의록'))) == created
+    assert sorted(ids(search(client, '회의록 정리'))) == created
+
+
+def test_upgrade_rebuilds_index_with_user_id(app, client, tasks, make_client):
+    other = make_client('other')
+    other.post('/api/tasks', json={'title': '다른 사람의 보고서', 'category': '회사일'})
+    legacy = dict((number, statements) for number, _, statements in MIGRATIONS)[4]
+    with app.app_context(), db.engine.begin() as conn:
+        # 마이그레이션 10 이전의 색인 (user_id 컬럼 없음)으로 되돌린다
+        for name in ('task_fts_ai', 'task_fts_ad', 'task_fts_au'):
+            conn.execute(text(f'DROP TRIGGER {name}'))
+        conn.execute(text('DROP TABLE task_fts'))
+        for step in legacy:
+            step(conn)
+        conn.execute(text('DELETE FROM schema_migrations WHERE version = 10'))
+
+    with app.app_context():
+        assert upgrade(db.engine) == [10]
+        owners = dict(db.session.execute(text('SELECT rowid, user_id FROM task_fts')).all())
+    assert owners[tasks['report']['id']] == client.get('/api/auth/me').get_json()['user']['id']
+    assert ids(search(client, '보고서')) == [tasks['report']['id']]
+    created = client.post('/api/tasks', json={'title': '새 보고서', 'category': '회사일'}).get_json()['task']
+    assert sorted(ids(search(client, '보고서'))) == [tasks['report']['id'], created['id']]
+
+
+def test_index_follows_updates_and_deletes(client, tasks):
+    task_id = tasks['report']['id']
+    assert client.put(f'/api/tasks/{task_id}', json={'title': '예산 검토'}).status_code == 200
+    assert ids(search(client, '보고서')) == []
+    assert ids(search(client, '예산 검토')) == [task_id]
+
+    assert client.delete(f'/api/tasks/{task_id}').status_code == 200
+    assert ids(search(client, '예산 검토')) == []
+
+
+def test_results_are_paged(client, make_task):
+    created = [make_task(f'회의록 정리 {index}')['id'] for index in range(5)]
+    first = search(client, '회의록', limit=2)
+    second = search(client, '회의록', limit=2, offset=first['next_offset'])
+    third = search(client, '회의록', limit=2, offset=second['next_offset'])
+    assert third['next_offset'] is None
+    assert sorted(ids(first) + ids(second) + ids(third)) == created
+
+
+def test_empty_query_is_rejected(client):
+    assert client.get('/api/tasks/search', query_string={'q': '  '}).status_code == 400
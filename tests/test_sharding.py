@@ -0,0 +1,104 @@
+import pytest
+from sqlalchemy import func, select
+from app import create_app, db
+from app.models import Task
+from app.sharding import jump_hash, rebalance, shard_router, shard_summary
+from app.user_cache import user_cache
+from tests.conftest import PASSWORD
+
+SHARD_COUNT = 2
+
+
+def make_app(tmp_path, shards):
+    return create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': f'sqlite:///{tmp_path / "directory.db"}',
+        'SHARD_DATABASE_URLS': [f'sqlite:///{tmp_path / f"shard{index}.db"}' for index in range(shards)],
+        'PASSWORD_HASH_METHOD': 'pbkdf2:sha256:1000',
+        'PASSWORD_HASH_WORKERS': 0,
+        'LOGIN_USER_BURST': 0,
+        'LOGIN_IP_BURST': 0,
+    })
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = make_app(tmp_path, SHARD_COUNT)
+    yield app
+    with app.app_context():
+        db.engine.dispose()
+    for engine in shard_router.engines:
+        engine.dispose()
+
+
+def task_counts(engine):
+    with engine.connect() as conn:
+        return dict(conn.execute(select(Task.user_id, func.count()).group_by(Task.user_id)).all())
+
+
+def test_jump_hash_moves_keys_only_to_new_bucket():
+    for buckets in range(1, 8):
+        for key in range(1, 500):
+            before, after = jump_hash(key, buckets), jump_hash(key, buckets + 1)
+            assert 0 <= before < buckets
+            assert after in (before, buckets)
+
+
+def test_tasks_are_stored_in_the_user_shard(app, make_client):
+    # 두 샤드에 모두 사용자가 생길 때까지 가입
+    clients = {}
+    for index in range(8):
+        client = make_client(f'user{index}')
+        user_id = client.get('/api/auth/me').get_json()['user']['id']
+        clients[user_id] = client
+        response = client.post('/api/tasks', json={'title': f'작업 {index}', 'category': '회사일'})
+        assert response.status_code == 201
+    assert {shard_router.shard_for(user_id) for user_id in clients} == set(range(SHARD_COUNT))
+
+    with app.app_context():
+        assert task_counts(db.engine) == {}
+        for index, engine in enumerate(shard_router.engines):
+            assert set(task_counts(engine)) == {
+                user_id for user_id in clients if shard_router.shard_for(user_id) == index}
+        assert sum(tasks for _, _, _, tasks in shard_summary()) == len(clients)
+    for client in clients.values():
+        assert len(client.get('/api/tasks').get_json()['tasks']) == 1
+
+
+def test_rebalance_moves_users_to_new_shards(tmp_path):
+    app = make_app(tmp_path, 1)
+    users, tokens = {}, {}
+    for index in range(6):
+        client = app.test_client()
+        username = f'user{index}'
+        client.post('/api/auth/register', json={
+            'username': username, 'email': f'{username}@example.com', 'password': PASSWORD})
+        client.post('/api/auth/login', json={'username': username, 'password': PASSWORD})
+        user_id = client.get('/api/auth/me').get_json()['user']['id']
+        for title in ('하나', '둘'):
+            client.post('/api/tasks', json={'title': title, 'category': '회사일'})
+        users[user_id] = username
+        tokens[user_id] = client.get('/api/tasks/changes').get_json()['sync_token']
+    for engine in shard_router.engines:
+        engine.dispose()
+
+    app = make_app(tmp_path, 2)
+    with app.app_context():
+        moved = rebalance(db.engine, 1)
+        user_cache.invalidate(moved)
+        assert moved and moved == sorted(
+            user_id for user_id in users if shard_router.shard_for(user_id) == 1)
+        for index, engine in enumerate(shard_router.engines):
+            assert task_counts(engine) == {
+                user_id: 2 for user_id in users if shard_router.shard_for(user_id) == index}
+
+    client = app.test_client()
+    user_id = moved[0]
+    client.post('/api/auth/login', json={'username': users[user_id], 'password': PASSWORD})
+    assert sorted(task['title'] for task in client.get('/api/tasks').get_json()['tasks']) == ['둘', '하나']
+    # 옮긴 사용자는 다음 증분 동기화에서 전체 목록을 다시 받는다
+    assert client.get('/api/tasks/changes', query_string={'since': tokens[user_id]}).get_json()['reset']
+    with app.app_context():
+        db.engine.dispose()
+    for engine in shard_router.engines:
+        engine.dispose()
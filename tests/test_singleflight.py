@@ -0,0 +1,80 @@
+import threading
+import time
+import pytest
+from werkzeug.test import EnvironBuilder
+from app.singleflight import single_flight
+from app.stats import statistics_cache
+from tests.conftest import PASSWORD
+
+
+@pytest.fixture
+def login(app, client):
+    """같은 사용자로 로그인한 클라이언트를 하나 더 만드는 함수"""
+    def make():
+        other = app.test_client()
+        response = other.post('/api/auth/login', json={'username': 'tester', 'password': PASSWORD})
+        assert response.status_code == 200, response.get_json()
+        return other
+    return make
+
+
+def wait_until(predicate, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, '시간 안에 조건이 만족되지 않았습니다.'
+        time.sleep(0.01)
+
+
+def test_concurrent_requests_share_leader_result(client, login, monkeypatch):
+    compute = statistics_cache.get
+    calls = []
+    release = threading.Event()
+
+    def slow_get(user_id, data_version):
+        calls.append(user_id)
+        assert release.wait(5)
+        return compute(user_id, data_version)
+    monkeypatch.setattr(statistics_cache, 'get', slow_get)
+
+    follower_client = login()
+    responses = {}
+
+    def request(name, c):
+        responses[name] = c.get('/api/dashboard/statistics')
+
+    leader = threading.Thread(target=request, args=('leader', client))
+    leader.start()
+    wait_until(lambda: len(calls) == 1)
+    shared_before = single_flight.stats()['shared']
+    follower = threading.Thread(target=request, args=('follower', follower_client))
+    follower.start()
+    wait_until(lambda: single_flight.stats()['shared'] == shared_before + 1)
+    release.set()
+    leader.join(5)
+    follower.join(5)
+
+    assert len(calls) == 1
+    assert responses['leader'].status_code == responses['follower'].status_code == 200
+    assert responses['leader'].get_data() == responses['follower'].get_data()
+
+
+def test_streamed_body_closed_unread_releases_call(app, client, make_task):
+    make_task()
+    # 테스트 클라이언트는 첫 chunk를 미리 읽으므로 WSGI 앱을 직접 호출한다
+    environ = EnvironBuilder(path='/api/tasks', headers={
+        'Cookie': f"session={client.get_cookie('session').value}"}).get_environ()
+    statuses = []
+    entries = single_flight.stats()['entries']
+    body = app(environ, lambda status, headers, exc_info=None: statuses.append(status))
+    assert statuses == ['200 OK']
+    assert single_flight.stats()['entries'] == entries + 1
+
+    # 본문을 한 번도 읽지 않고 닫아도(클라이언트 연결 종료) 호출이 정리되어야 함
+    body.close()
+    assert single_flight.stats()['entries'] == entries
+
+    started = time.monotonic()
+    response = client.get('/api/tasks')
+    assert response.status_code == 200
+    assert len(response.get_json()['tasks']) == 1
+    assert time.monotonic() - started < single_flight.timeout / 2
@@ -0,0 +1,42 @@
+from sqlalchemy import text
+from app import db
+
+
+def statistics(client):
+    response = client.get('/api/dashboard/statistics')
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()
+
+
+def test_statistics_follow_changes(client, make_task):
+    assert statistics(client) == {'total_tasks': 0, 'completed_tasks': 0,
+                                  'pending_tasks': 0, 'today_completed': 0}
+    first, second, _ = (make_task(title) for title in ('하나', '둘', '셋'))
+    assert client.post(f'/api/tasks/{first["id"]}/toggle').status_code == 200
+    assert client.post(f'/api/tasks/{second["id"]}/toggle').status_code == 200
+    assert statistics(client) == {'total_tasks': 3, 'completed_tasks': 2,
+                                  'pending_tasks': 1, 'today_completed': 2}
+
+    assert client.post(f'/api/tasks/{second["id"]}/toggle').status_code == 200
+    assert client.delete(f'/api/tasks/{first["id"]}').status_code == 200
+    assert statistics(client) == {'total_tasks': 2, 'completed_tasks': 0,
+                                  'pending_tasks': 2, 'today_completed': 0}
+
+
+def test_statistics_are_per_user(client, make_task, make_client):
+    make_task()
+    other = make_client('other')
+    assert statistics(other)['total_tasks'] == 0
+    assert statistics(client)['total_tasks'] == 1
+
+
+def test_cached_statistics_see_writes_from_other_workers(app, client, make_task):
+    task = make_task()
+    assert statistics(client)['completed_tasks'] == 0
+    # 다른 워커처럼 이 프로세스의 캐시를 거치지 않고 완료 처리하고 data_version을 올린다
+    with app.app_context():
+        with db.engine.begin() as conn:
+            conn.execute(text("UPDATE task SET status = 'completed', completed_at = CURRENT_TIMESTAMP "
+                              'WHERE id = :id'), {'id': task['id']})
+            conn.execute(text('UPDATE user SET data_version = data_version + 1'))
+    assert statistics(client)['completed_tasks'] == 1
@@ -0,0 +1,58 @@
+from datetime import datetime, timedelta
+from app import db
+from app.sync import compact_tombstones
+
+
+def changes(client, since=None):
+    response = client.get('/api/tasks/changes', query_string={'since': since} if since else {})
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()
+
+
+def test_full_sync_returns_every_task(client, make_task):
+    ids = {make_task(f'작업 {index}')['id'] for index in range(3)}
+    data = changes(client)
+    assert {task['id'] for task in data['tasks']} == ids
+    assert data['deleted'] == [] and not data['reset']
+
+
+def test_changes_since_token(client, make_task):
+    kept, edited, removed = (make_task(title) for title in ('유지', '수정', '삭제'))
+    token = changes(client)['sync_token']
+
+    created = make_task('새 작업')
+    assert client.put(f'/api/tasks/{edited["id"]}', json={'title': '수정됨'}).status_code == 200
+    assert client.delete(f'/api/tasks/{removed["id"]}').status_code == 200
+
+    data = changes(client, token)
+    assert {task['id'] for task in data['tasks']} == {created['id'], edited['id']}
+    assert data['deleted'] == [removed['id']]
+    assert kept['id'] not in {task['id'] for task in data['tasks']}
+    assert not data['reset']
+
+    # 같은 토큰 이후로 바뀐 것이 없으면 빈 변경
+    latest = changes(client, data['sync_token'])
+    assert latest['tasks'] == [] and latest['deleted'] == []
+    assert latest['sync_token'] == data['sync_token']
+
+
+def test_unknown_token_forces_reset(client, make_task):
+    task = make_task()
+    data = changes(client, 10 ** 6)
+    assert data['reset']
+    assert [row['id'] for row in data['tasks']] == [task['id']]
+    assert client.get('/api/tasks/changes', query_string={'since': 'abc'}).status_code == 400
+
+
+def test_compacted_tombstones_force_reset(app, client, make_task):
+    removed = make_task('삭제')
+    token = changes(client)['sync_token']
+    client.delete(f'/api/tasks/{removed["id"]}')
+    with app.app_context():
+        assert compact_tombstones(db.engine, retention_days=0,
+                                  now=datetime.utcnow() + timedelta(seconds=1)) == 1
+
+    # 삭제 기록이 정리된 뒤의 오래된 토큰은 전체 목록으로 다시 동기화
+    data = changes(client, token)
+    assert data['reset']
+    assert data['tasks'] == [] and data['deleted'] == []
@@ -0,0 +1,89 @@
+import json
+import pytest
+from app import transfer
+
+COMPARED = ('title', 'description', 'category', 'priority', 'status', 'created_at',
+            'completed_at', 'due_date')
+
+
+def exported(client, fmt):
+    response = client.get('/api/tasks/export', query_string={'format': fmt})
+    assert response.status_code == 200
+    return response.get_data()
+
+
+def import_body(client, body, fmt='ndjson', **params):
+    response = client.post('/api/tasks/import', query_string=dict(params, format=fmt), data=body,
+                           content_type=transfer.MIMETYPES[fmt])
+    return response.status_code, response.get_json()
+
+
+def snapshot(client):
+    tasks = client.get('/api/tasks', query_string={'sort': 'created_at', 'order': 'asc'}).get_json()['tasks']
+    return [{name: task[name] for name in COMPARED} for task in tasks]
+
+
+@pytest.fixture
+def source(client, make_task):
+    make_task('보고서 작성', description='분기 보고서', priority='high', due_date='2026-03-01')
+    done = make_task('알고리즘 공부', category='공부')
+    client.post(f'/api/tasks/{done["id"]}/toggle')
+    make_task('쉼표, "따옴표"\n줄바꿈', category='사이드프로젝트', priority='low')
+    return client
+
+
+@pytest.mark.parametrize('fmt', transfer.FORMATS)
+def test_export_import_round_trip(source, make_client, fmt):
+    body = exported(source, fmt)
+    target = make_client('target')
+    status, data = import_body(target, body, fmt)
+    assert status == 200, data
+    assert (data['imported'], data['skipped']) == (3, 0)
+    assert snapshot(target) == snapshot(source)
+    assert target.get('/api/dashboard/statistics').get_json() == \
+        source.get('/api/dashboard/statistics').get_json()
+
+
+def test_invalid_row_aborts_with_resume_point(client, monkeypatch):
+    monkeypatch.setattr(transfer, 'IMPORT_CHUNK_SIZE', 2)
+    rows = [json.dumps({'title': f'작업 {index}', 'category': '회사일'}) for index in range(5)]
+    body = '\n'.join(rows[:3] + ['{"title": ""}'] + rows[3:])
+
+    status, data = import_body(client, body)
+    assert status == 400
+    # 첫 청크(1~2번째 줄)만 커밋되고 오류가 난 청크는 롤백된다
+    assert (data['line'], data['imported'], data['resume_after']) == (4, 2, 2)
+    assert [task['title'] for task in snapshot(client)] == ['작업 0', '작업 1']
+
+    fixed = '\n'.join(rows[:3] + [json.dumps({'title': '고친 작업', 'category': '회사일'})] + rows[3:])
+    status, data = import_body(client, fixed, after_line=data['resume_after'])
+    assert status == 200, data
+    assert (data['imported'], data['resume_after']) == (4, 6)
+    assert len(snapshot(client)) == 6
+
+
+def test_skip_invalid_rows(client):
+    body = '\n'.join([
+        json.dumps({'title': '정상', 'category': '공부', 'status': 'completed'}),
+        json.dumps({'title': '카테고리 오류', 'category': '없음'}),
+        'not json',
+    ])
+    status, data = import_body(client, body, on_error='skip')
+    assert status == 200, data
+    assert (data['imported'], data['skipped']) == (1, 2)
+    assert [error['line'] for error in data['errors']] == [2, 3]
+    stats = client.get('/api/dashboard/statistics').get_json()
+    assert (stats['total_tasks'], stats['completed_tasks']) == (1, 1)
+
+
+def test_imported_tasks_are_searchable(client):
+    status, _ = import_body(client, json.dumps({'title': '가져온 회의록', 'category': '회사일'}))
+    assert status == 200
+    found = client.get('/api/tasks/search', query_string={'q': '회의록'}).get_json()['tasks']
+    assert [task['title'] for task in found] == ['가져온 회의록']
+
+
+def test_unknown_format_is_rejected(client):
+    assert client.get('/api/tasks/export', query_string={'format': 'xml'}).status_code == 400
+    response = client.post('/api/tasks/import', query_string={'format': 'xml'}, data='')
+    assert response.status_code == 400
@@ -0,0 +1,62 @@
+import os
+import uuid
+from types import SimpleNamespace
+import pytest
+from sqlalchemy import text
+from app import db
+from app.user_cache import RedisBackend, UserCache, user_cache
+
+
+def test_hits_skip_the_row_load_but_see_other_workers(app, client):
+    etag = client.get('/api/tasks').headers['ETag']
+    hits = user_cache.stats()['hits']
+    assert client.get('/api/tasks', headers={'If-None-Match': etag}).status_code == 304
+    assert user_cache.stats()['hits'] == hits + 1
+
+    # 로컬 캐시는 다른 워커의 커밋으로 무효화되지 않지만 적중할 때 data_version을 다시 읽는다
+    with app.app_context():
+        with db.engine.begin() as conn:
+            conn.execute(text('UPDATE user SET data_version = data_version + 1'))
+    response = client.get('/api/tasks', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+
+
+def test_commit_invalidates_cached_user(client, make_task):
+    before = client.get('/api/tasks').headers['ETag']
+    make_task()
+    assert client.get('/api/tasks', headers={'If-None-Match': before}).status_code == 200
+
+
+@pytest.fixture
+def redis_cache():
+    redis = pytest.importorskip('redis')
+    url = os.environ.get('TEST_REDIS_URL')
+    if not url:
+        pytest.skip('TEST_REDIS_URL이 설정되어 있지 않습니다.')
+    backend = RedisBackend(redis.Redis.from_url(url), prefix=f'test:{uuid.uuid4().hex}:')
+    yield UserCache(backend)
+    backend.clear()
+
+
+def row(data_version):
+    return SimpleNamespace(id=1, username='tester', email='tester@example.com', data_version=data_version)
+
+
+def test_redis_store_after_miss(redis_cache):
+    user, token = redis_cache.lookup(1)
+    assert user is None
+    redis_cache.store(row(1), token)
+    assert redis_cache.lookup(1)[0].data_version == 1
+
+
+def test_redis_store_is_dropped_after_concurrent_invalidation(redis_cache):
+    # 미스 후 DB에서 옛 버전을 읽는 사이 다른 워커가 커밋하고 무효화한 경우
+    _, token = redis_cache.lookup(1)
+    redis_cache.invalidate([1])
+    redis_cache.store(row(1), token)
+    user, token = redis_cache.lookup(1)
+    assert user is None
+
+    redis_cache.store(row(2), token)
+    assert redis_cache.lookup(1)[0].data_version == 2